@@ -10,10 +10,13 @@ Automatically generated ontology cord19research. Do not change manually.
 from dataclasses import dataclass
 from forte.data.data_pack import DataPack
 from forte.data.ontology.top import Annotation
+from typing import Optional
 
 __all__ = [
     "Abstract",
     "Body",
+    "Passage",
+    "AnalyzedQuery",
 ]
 
 
@@ -35,3 +38,54 @@ class Body(Annotation):
 
     def __init__(self, pack: DataPack, begin: int, end: int):
         super().__init__(pack, begin, end)
+
+
+@dataclass
+class Passage(Annotation):
+    """
+    A span based annotation `Passage`, used to represent a paragraph or a section of a research paper that is read on its own.
+    Attributes:
+        paper_id (Optional[str]):	The name of the pack of the whole paper.
+        section (Optional[str]):	The name of the section of the passage.
+        paper_begin (Optional[int]):	The begin offset of the passage in the text of the whole paper.
+        paper_end (Optional[int]):	The end offset of the passage in the text of the whole paper.
+    """
+
+    paper_id: Optional[str]
+    section: Optional[str]
+    paper_begin: Optional[int]
+    paper_end: Optional[int]
+
+    def __init__(self, pack: DataPack, begin: int, end: int):
+        super().__init__(pack, begin, end)
+        self.paper_id: Optional[str] = None
+        self.section: Optional[str] = None
+        self.paper_begin: Optional[int] = None
+        self.paper_end: Optional[int] = None
+
+
+@dataclass
+class AnalyzedQuery(Annotation):
+    """
+    A span based annotation `AnalyzedQuery`, used to represent the relation asked by a query sentence, as found by the query analysis.
+    Attributes:
+        arg0 (Optional[str]):	The text of the subject of the query.
+        arg1 (Optional[str]):	The text of the object of the query.
+        predicate (Optional[str]):	The text of the verb of the query.
+        verb_lemma (Optional[str]):	The lemma of the verb of the query.
+        is_answer_arg0 (Optional[bool]):	Whether the answer is the subject or the object of the query.
+    """
+
+    arg0: Optional[str]
+    arg1: Optional[str]
+    predicate: Optional[str]
+    verb_lemma: Optional[str]
+    is_answer_arg0: Optional[bool]
+
+    def __init__(self, pack: DataPack, begin: int, end: int):
+        super().__init__(pack, begin, end)
+        self.arg0: Optional[str] = None
+        self.arg1: Optional[str] = None
+        self.predicate: Optional[str] = None
+        self.verb_lemma: Optional[str] = None
+        self.is_answer_arg0: Optional[bool] = None
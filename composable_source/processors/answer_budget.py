@@ -0,0 +1,203 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A pipeline stage that annotates the retrieved papers in score order and
+stops once enough answers are found or a deadline has passed.
+"""
+# pylint: disable=attribute-defined-outside-init
+import re
+import time
+from typing import Any, Dict, List, Set
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.processors.base import MultiPackProcessor, PackProcessor
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+    initialize_processors,
+)
+from composable_source.processors.response_creator import (
+    ANSWER_STREAM_RESOURCE,
+    BUDGET_STATUS_RESOURCE,
+    extract_relations,
+    query_answer_target,
+)
+from composable_source.utils.query_cache import (
+    acquire_query_cache,
+    release_query_cache,
+)
+
+__all__ = ["AnswerBudgetProcessor"]
+
+
+class AnswerBudgetProcessor(MultiPackProcessor):
+    r"""Annotates the packs of a MultiPack whose names match
+    `pack_name_pattern` with `processors`, `chunk_size` packs at a time in
+    the order they were retrieved, which is the score order of the search
+    back end. After every chunk, the answers of the annotated packs are
+    found as in :class:`ResponseCreator`, and the remaining packs are left
+    unannotated once there are `max_answers` distinct answers or
+    `deadline` seconds have passed since the first chunk started. A chunk
+    that is started always finishes. The answers of every chunk are
+    streamed by an incremental :class:`ResponseCreator`, if any.
+
+    The status of every query is kept in the pipeline resources, for the
+    :class:`ResponseCreator` to mark partial results, as a dict with:
+        - partial: whether some packs are left unannotated
+        - stop_reason: "answers" or "deadline" when partial, else None
+        - papers: number of packs to annotate
+        - annotated_papers: number of annotated packs
+        - answers: number of distinct answers found
+        - relations: the output of `extract_relations` for every annotated
+            pack, by its pack_id, which the :class:`ResponseCreator` takes
+            instead of finding the answers again
+
+    Args:
+        processors: the processors to run, one after another, on every
+            chunk of packs. The :class:`ConcurrentPackProcessor` ones
+            process a chunk in one batch. They are called directly rather
+            than through the pipeline, so no selector applies: every
+            processor gets all the packs that match `pack_name_pattern`.
+    """
+
+    def __init__(self, processors: List[PackProcessor]):
+        super().__init__()
+        self.processors = processors
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        initialize_processors(
+            self.processors, resources, self.configs.processors
+        )
+        self.pattern = re.compile(self.configs.pack_name_pattern)
+        self.query_cache, self._owns_query_cache = acquire_query_cache(
+            resources, self.configs
+        )
+        if not resources.contains(BUDGET_STATUS_RESOURCE):
+            resources.update(**{BUDGET_STATUS_RESOURCE: {}})
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for AnswerBudgetProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_pack_name: the query datapack's name
+            - pack_name_pattern: regular expression of the names of the
+                packs to annotate
+            - max_answers: number of distinct answers after which the
+                remaining packs are skipped, no limit if None
+            - deadline: seconds after which the remaining packs are
+                skipped, no limit if None
+            - chunk_size: number of packs annotated between two checks of
+                the budget
+            - processors: list with the configs of every processor, in the
+                same order as the processors
+            - query_cache_path, query_cache_size: same as the
+                `ResponseCreator` configs
+        """
+        return {
+            "query_pack_name": "query",
+            "pack_name_pattern": r"passage_\d",
+            "max_answers": None,
+            "deadline": None,
+            "chunk_size": 4,
+            "processors": None,
+            "query_cache_path": None,
+            "query_cache_size": 10000,
+        }
+
+    def _process(self, input_pack: MultiPack):
+        start = time.monotonic()
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        ent, verb_lemma, is_answer_arg0 = query_answer_target(
+            query_pack, self.query_cache
+        )
+        ent = ent.lower().strip()
+
+        packs = [
+            pack
+            for name, pack in input_pack.iter_packs()
+            if self.pattern.match(name)
+        ]
+        answers: Set[str] = set()
+        relations: Dict[int, Dict[str, List[Any]]] = {}
+        # Set by an incremental ResponseCreator.
+        stream = (
+            self.resources.get(ANSWER_STREAM_RESOURCE)
+            if self.resources.contains(ANSWER_STREAM_RESOURCE)
+            else None
+        )
+        annotated, stop_reason = 0, None
+        while annotated < len(packs):
+            if self._answers_reached(answers):
+                stop_reason = "answers"
+                break
+            if (
+                self.configs.deadline is not None
+                and time.monotonic() - start >= self.configs.deadline
+            ):
+                stop_reason = "deadline"
+                break
+
+            chunk = packs[annotated:annotated + self.configs.chunk_size]
+            self._annotate(chunk)
+            annotated += len(chunk)
+            for pack in chunk:
+                result = extract_relations(
+                    pack.pack_name, pack, ent, verb_lemma, is_answer_arg0
+                )
+                relations[pack.pack_id] = result
+                answers.update(result.keys())
+                if stream is not None:
+                    stream(input_pack, pack, result)
+
+        self.resources.get(BUDGET_STATUS_RESOURCE)[input_pack.pack_id] = {
+            "partial": stop_reason is not None,
+            "stop_reason": stop_reason,
+            "papers": len(packs),
+            "annotated_papers": annotated,
+            "answers": len(answers),
+            "relations": relations,
+        }
+
+    def _answers_reached(self, answers: Set[str]) -> bool:
+        return (
+            self.configs.max_answers is not None
+            and len(answers) >= self.configs.max_answers
+        )
+
+    def _annotate(self, packs: List[DataPack]):
+        """
+        Run the processors over a chunk of packs.
+        :param packs: the packs
+        :return:
+        """
+        for processor in self.processors:
+            if isinstance(processor, ConcurrentPackProcessor):
+                results = processor.compute_batch(packs)
+                for pack, result in zip(packs, results):
+                    processor.write(pack, result)
+            else:
+                for pack in packs:
+                    processor.process(pack)
+            for pack in packs:
+                pack.add_all_remaining_entries()
+
+    def finish(self, resource: Resources):
+        for processor in self.processors:
+            processor.finish(resource)
+        release_query_cache(resource, self.query_cache, self._owns_query_cache)
@@ -0,0 +1,116 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A pipeline stage that runs the models of the retrieved papers in batches
+spanning all the papers of a query.
+"""
+# pylint: disable=attribute-defined-outside-init
+import re
+from typing import Any, Dict, List, Optional
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.multi_pack import MultiPack
+from forte.processors.base import MultiPackProcessor
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+    initialize_processors,
+)
+
+__all__ = [
+    "token_batches",
+    "BatchedProcessor",
+]
+
+
+def token_batches(
+    texts: List[str], max_tokens: Optional[int]
+) -> List[List[int]]:
+    """
+    Split texts into batches of consecutive texts with at most `max_tokens`
+    whitespace separated tokens. A text longer than that is a batch on its
+    own.
+    :param texts: the texts
+    :param max_tokens: the token budget of a batch, all the texts are in
+        one batch if None
+    :return: the indices of the texts of every batch
+    """
+    if not texts:
+        return []
+    if not max_tokens:
+        return [list(range(len(texts)))]
+
+    batches: List[List[int]] = [[]]
+    tokens = 0
+    for index, text in enumerate(texts):
+        length = len(text.split())
+        if batches[-1] and tokens + length > max_tokens:
+            batches.append([])
+            tokens = 0
+        batches[-1].append(index)
+        tokens += length
+    return batches
+
+
+class BatchedProcessor(MultiPackProcessor):
+    r"""Annotates the packs of a MultiPack whose names match
+    `pack_name_pattern` together: every processor computes the annotations
+    of all these packs with :meth:`ConcurrentPackProcessor.compute_batch`,
+    which lets its models run over batches mixing the sentences of several
+    packs, then writes them into every pack before the next processor runs.
+
+    Args:
+        processors: the processors to run, one after another.
+    """
+
+    def __init__(self, processors: List[ConcurrentPackProcessor]):
+        super().__init__()
+        self.processors = processors
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        initialize_processors(
+            self.processors, resources, self.configs.processors
+        )
+        self.pattern = re.compile(self.configs.pack_name_pattern)
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for BatchedProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - pack_name_pattern: regular expression of the names of the
+                packs to annotate
+            - processors: list with the configs of every processor, in the
+                same order as the processors
+        """
+        return {"pack_name_pattern": r"passage_\d", "processors": None}
+
+    def _process(self, input_pack: MultiPack):
+        packs = [
+            pack
+            for name, pack in input_pack.iter_packs()
+            if self.pattern.match(name)
+        ]
+        if not packs:
+            return
+        for processor in self.processors:
+            for pack, result in zip(packs, processor.compute_batch(packs)):
+                processor.write(pack, result)
+                pack.add_all_remaining_entries()
+
+    def finish(self, resource: Resources):
+        for processor in self.processors:
+            processor.finish(resource)
@@ -0,0 +1,312 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A processor that runs several scispacy NER models over a single
+tokenization of the pack and links their mentions to UMLS.
+"""
+# pylint: disable=attribute-defined-outside-init,unused-import
+from typing import Any, Dict, List, Set, Tuple
+
+import spacy
+from spacy.tokens import Doc
+from scispacy.abbreviation import AbbreviationDetector  # noqa: F401
+from scispacy.linking import EntityLinker  # noqa: F401
+from forte.common.configuration import Config
+from forte.common.exception import ProcessorConfigError
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from ft.onto.base_ontology import Sentence, Token
+from ftx.onto.clinical import MedicalEntityMention, UMLSConceptLink
+from composable_source.processors.batch_processor import token_batches
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+)
+from composable_source.processors.umls_link_processor import (
+    CachedCandidateGenerator,
+)
+from composable_source.utils.umls_link_cache import (
+    acquire_link_cache,
+    release_link_cache,
+)
+
+__all__ = ["BioMedicalEntityProcessor"]
+
+# (begin, end, ner_type, concepts) of a mention, every concept being
+# (cui, score, name, definition, tuis, aliases).
+Mention = Tuple[int, int, str, List[Tuple[Any, ...]]]
+EntityResult = Tuple[
+    List[Tuple[int, int]], List[Tuple[int, int, str, str]], List[Mention]
+]
+
+SUPPORTED_PROCESSORS = {"sentence", "tokenize", "pos", "lemma", "umls_link"}
+
+# The components of the additional models that are not needed for NER.
+HEAD_EXCLUDED = ["tagger", "attribute_ruler", "lemmatizer", "parser", "senter"]
+
+
+class BioMedicalEntityProcessor(ConcurrentPackProcessor):
+    r"""Runs the first model of `models` as a full spaCy pipeline, which
+    tokenizes and splits the sentences, and only the NER components of the
+    other models over the same tokens. The mentions of all the models are
+    linked to UMLS by a single entity linker. A span found by several
+    models gets one `MedicalEntityMention`, with the `ner_type` of the
+    first model and the UMLS concepts of all of them.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        processors = self.configs.processors
+        if isinstance(processors, str):
+            processors = processors.split(",")
+        self.processors: Set[str] = {p.strip() for p in processors}
+        unsupported = self.processors - SUPPORTED_PROCESSORS
+        if unsupported:
+            raise ProcessorConfigError(
+                f"Unsupported processors {sorted(unsupported)}, the "
+                f"supported ones are {sorted(SUPPORTED_PROCESSORS)}."
+            )
+        if not self.configs.models:
+            raise ProcessorConfigError("Please specify at least one model!")
+
+        self.nlp, self.heads, self.linker = self.load_models()
+        self.link_cache = None
+        self._owns_link_cache = False
+        if self.linker is not None:
+            self.link_cache, self._owns_link_cache = acquire_link_cache(
+                resources, self.configs
+            )
+            self.linker.candidate_generator = CachedCandidateGenerator(
+                self.linker.candidate_generator, self.link_cache
+            )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for BioMedicalEntityProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - processors: a list or a comma separated string of `sentence`,
+                `tokenize`, `pos`, `lemma` and `umls_link`
+            - models: names of the scispacy models, the first one also
+                tokenizes and splits the sentences
+            - prefer_gpu: whether to run the models on GPU if available
+            - max_batch_tokens: maximum number of tokens of the packs run
+                through the models at once by :meth:`compute_batch`, all
+                the packs are run at once if None
+            - umls_cache_path: path of the cache of the UMLS candidates,
+                the candidates are only kept in memory if it is None
+            - umls_cache_size: maximum number of mentions kept on disk
+            - umls_memory_size: maximum number of mentions kept in memory.
+                The first component of the pipeline opens the cache, the
+                others share it through the pipeline resources
+        """
+        return {
+            "processors": "sentence, umls_link",
+            "models": ["en_ner_bionlp13cg_md"],
+            "prefer_gpu": False,
+            "max_batch_tokens": None,
+            "umls_cache_path": None,
+            "umls_cache_size": 1000000,
+            "umls_memory_size": 100000,
+        }
+
+    def load_models(self) -> Tuple[Any, List[Any], Any]:
+        """
+        Load the spaCy pipelines of `models`.
+        :return: the full pipeline of the first model, the NER pipelines of
+            the other models, and the UMLS entity linker added to the first
+            pipeline, or None without `umls_link`
+        """
+        if self.configs.prefer_gpu:
+            spacy.prefer_gpu()
+        nlp = spacy.load(self.configs.models[0])
+        heads = [
+            spacy.load(model, exclude=HEAD_EXCLUDED)
+            for model in self.configs.models[1:]
+        ]
+        linker = None
+        if "umls_link" in self.processors:
+            nlp.add_pipe("abbreviation_detector")
+            linker = nlp.add_pipe(
+                "scispacy_linker",
+                config={"resolve_abbreviations": True, "linker_name": "umls"},
+            )
+        return nlp, heads, linker
+
+    def compute(self, input_pack: DataPack) -> EntityResult:
+        """
+        Run the models over the text of the pack.
+        :param input_pack: the pack
+        :return: the sentence spans, the tokens as (begin, end, pos, lemma)
+            and the mentions as (begin, end, ner_type, concepts), with the
+            concepts of all the models that found the span
+        """
+        return self.compute_batch([input_pack])[0]
+
+    def compute_batch(self, input_packs: List[DataPack]) -> List[EntityResult]:
+        """
+        Run the models over the texts of the packs, in batches of at most
+        `max_batch_tokens` tokens.
+        :param input_packs: the packs
+        :return: the output of :meth:`compute` for every pack
+        """
+        texts = [pack.text for pack in input_packs]
+        if texts:
+            self.nlp.max_length = max(
+                self.nlp.max_length, max(len(text) for text in texts) + 1
+            )
+        results = []
+        for batch in token_batches(texts, self.configs.max_batch_tokens):
+            docs = list(
+                self.nlp.pipe(
+                    [texts[index] for index in batch], batch_size=len(batch)
+                )
+            )
+            # The mentions of the other models are only needed to link them.
+            head_docs = (
+                [self._run_head(head, docs) for head in self.heads]
+                if self.linker is not None
+                else []
+            )
+            for index, doc in enumerate(docs):
+                results.append(
+                    self._result(
+                        doc, [model_docs[index] for model_docs in head_docs]
+                    )
+                )
+        return results
+
+    def _result(self, doc: Doc, head_docs: List[Doc]) -> EntityResult:
+        """
+        Collect the annotations of a document.
+        :param doc: the document made by the first model
+        :param head_docs: the documents made by the other models
+        :return: the output of :meth:`compute` for the document
+        """
+        sentences, tokens = [], []
+        if self.processors & {"sentence", "tokenize", "pos", "lemma"}:
+            for sentence in doc.sents:
+                sentences.append((sentence.start_char, sentence.end_char))
+                tokens.extend(
+                    (word.idx, word.idx + len(word), word.tag_, word.lemma_)
+                    for word in sentence
+                )
+
+        mentions: Dict[Tuple[int, int], Mention] = {}
+        if self.linker is not None:
+            self._collect_mentions(doc, mentions)
+            for head_doc in head_docs:
+                self._collect_mentions(head_doc, mentions)
+        return sentences, tokens, list(mentions.values())
+
+    def write(self, input_pack: DataPack, result: EntityResult):
+        sentences, tokens, mentions = result
+        if "sentence" in self.processors:
+            for begin, end in sentences:
+                Sentence(input_pack, begin, end)
+        if self.processors & {"tokenize", "pos", "lemma"}:
+            for begin, end, pos, lemma in tokens:
+                token = Token(input_pack, begin, end)
+                if "pos" in self.processors:
+                    token.pos = pos
+                if "lemma" in self.processors:
+                    token.lemma = lemma
+
+        for begin, end, ner_type, concepts in mentions:
+            mention = MedicalEntityMention(input_pack, begin, end)
+            mention.ner_type = ner_type
+            for cui, score, name, definition, tuis, aliases in concepts:
+                umls = UMLSConceptLink(input_pack)
+                umls.cui = cui
+                umls.score = score
+                umls.name = name
+                umls.definition = definition
+                umls.tuis = tuis
+                umls.aliases = aliases
+                mention.umls_entities.append(umls)
+
+    def after_fork(self):
+        if self.link_cache is not None:
+            self.link_cache.reopen()
+
+    def _run_head(self, head: Any, docs: List[Doc]) -> List[Doc]:
+        """
+        Run the NER components of another model over the tokens of `docs`,
+        and link the mentions it finds.
+        :param head: the spaCy pipeline of the model
+        :param docs: the documents made by the first model
+        :return: the documents of the model
+        """
+        head_docs = [
+            Doc(
+                head.vocab,
+                words=[token.text for token in doc],
+                spaces=[bool(token.whitespace_) for token in doc],
+            )
+            for doc in docs
+        ]
+        for _, component in head.pipeline:
+            if hasattr(component, "pipe"):
+                head_docs = list(
+                    component.pipe(head_docs, batch_size=len(head_docs))
+                )
+            else:
+                head_docs = [component(head_doc) for head_doc in head_docs]
+
+        # Reuse the abbreviations found in `docs` to link their long forms.
+        for doc, head_doc in zip(docs, head_docs):
+            abbreviations = []
+            for short in doc._.abbreviations:
+                span = head_doc[short.start:short.end]
+                long_form = short._.long_form
+                span._.long_form = head_doc[long_form.start:long_form.end]
+                abbreviations.append(span)
+            head_doc._.abbreviations = abbreviations
+        return [self.linker(head_doc) for head_doc in head_docs]
+
+    def _collect_mentions(
+        self, doc: Doc, mentions: Dict[Tuple[int, int], Mention]
+    ):
+        """
+        Collect the linked mentions of a model, merging the UMLS concepts of
+        the spans that are already found.
+        :param doc: the document of the model
+        :param mentions: mentions collected so far, keyed by their span
+        :return:
+        """
+        for ent in doc.ents:
+            span = (ent.start_char, ent.end_char)
+            if span not in mentions:
+                mentions[span] = (*span, ent.label_, [])
+            concepts = mentions[span][3]
+            cuis = {concept[0] for concept in concepts}
+            for cui, score in ent._.kb_ents:
+                if cui in cuis:
+                    continue
+                cuis.add(cui)
+                concept = self.linker.kb.cui_to_entity[cui]
+                concepts.append(
+                    (
+                        concept.concept_id,
+                        str(score),
+                        concept.canonical_name,
+                        concept.definition,
+                        list(concept.types),
+                        list(concept.aliases),
+                    )
+                )
+
+    def finish(self, resource: Resources):
+        if self.link_cache is not None:
+            release_link_cache(resource, self.link_cache, self._owns_link_cache)
@@ -0,0 +1,171 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Processors for the in-process BM25 index, drop-in replacements of the
+Elasticsearch index and search processors that need no search server.
+"""
+# pylint: disable=attribute-defined-outside-init
+import os
+from typing import Any, Dict, List
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.data.ontology.top import Query
+from forte.processors.base import IndexProcessor, MultiPackProcessor
+from fortex.elastic import (
+    ElasticSearchPackIndexProcessor,
+    ElasticSearchProcessor,
+)
+from composable_source.processors.pack_store_processor import (
+    add_hit_pack,
+    tiered_search,
+)
+from composable_source.utils.bm25_index import BM25Index, BM25IndexBuilder
+from composable_source.utils.pack_store import PackStore
+from composable_source.utils.passages import hit_passages
+
+__all__ = [
+    "BM25PackIndexProcessor",
+    "BM25SearchProcessor",
+]
+
+
+class BM25PackIndexProcessor(IndexProcessor):
+    r"""Indexes the data packs into a :class:`BM25Index`. It takes the
+    configs of `ElasticSearchPackIndexProcessor` and indexes the same
+    fields, the index is written to `index_dir/<index_name>`. Elasticsearch
+    specific configs such as the hosts are ignored.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.builder = BM25IndexBuilder(
+            os.path.join(
+                self.configs.index_dir, self.configs.indexer.hparams.index_name
+            ),
+            extra_fields=self._search_fields(),
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for BM25PackIndexProcessor.
+        :return: A dictionary with the default config for this processor.
+        On top of the ElasticSearchPackIndexProcessor configs:
+            - index_dir: the directory to write the indexes to
+        """
+        config = super().default_configs()
+        config.update(ElasticSearchPackIndexProcessor.default_configs())
+        config.update({"index_dir": "bm25_index"})
+        return config
+
+    def _field_names(self) -> List[str]:
+        return ["doc_id", "content", "pack_info"]
+
+    def _search_fields(self) -> List[str]:
+        """
+        The fields searchable on top of `content`.
+        :return: names of fields of :meth:`_field_names`
+        """
+        return []
+
+    def _content_for_index(self, input_pack: DataPack) -> List[str]:
+        return [
+            str(input_pack.pack_id),
+            input_pack.text,
+            input_pack.to_string(True),
+        ]
+
+    def _bulk_process(self):
+        self.builder.add(self.documents)
+
+    def finish(self, resource: Resources):
+        self.builder.build()
+
+
+class BM25SearchProcessor(MultiPackProcessor):
+    r"""Searches a :class:`BM25Index` with the query dict of
+    `ElasticSearchQueryCreator` and adds the hits as response packs. It
+    takes the configs of `ElasticSearchProcessor` and produces the same
+    outputs, so that it can replace it in the search pipeline.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.index = BM25Index(
+            os.path.join(
+                self.configs.index_dir, self.configs.index_config.index_name
+            ),
+            k1=self.configs.k1,
+            b=self.configs.b,
+        )
+        self.store = (
+            PackStore(self.configs.pack_store_path)
+            if self.configs.pack_store_path
+            else None
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for BM25SearchProcessor.
+        :return: A dictionary with the default config for this processor.
+        On top of the ElasticSearchProcessor configs:
+            - index_dir: the directory of the indexes
+            - k1, b: the BM25 parameters, the defaults are the ones of
+                Elasticsearch
+            - pack_store_path, stored_pack_name_prefix: same as the
+                PackStoreSearchProcessor configs, no store is used if the
+                path is None
+        """
+        config = ElasticSearchProcessor.default_configs()
+        config.update(
+            {
+                "index_dir": "bm25_index",
+                "k1": 1.2,
+                "b": 0.75,
+                "pack_store_path": None,
+                "stored_pack_name_prefix": "annotated",
+            }
+        )
+        return config
+
+    def _process(self, input_pack: MultiPack):
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        first_query: Query = query_pack.get_single(Query)
+        if not isinstance(first_query.value, dict):
+            raise ValueError(
+                "The query to the BM25 index need to be a dictionary."
+            )
+        results = tiered_search(self.index.search, first_query.value)
+        hits = results["hits"]["hits"]
+
+        for idx, hit in enumerate(hits):
+            document = hit["_source"]
+            first_query.add_result(document["doc_id"], hit["_score"])
+            add_hit_pack(
+                input_pack,
+                document,
+                idx,
+                self.configs,
+                self.store,
+                hit_passages(hit, self.configs.field),
+            )
+
+    def finish(self, resource: Resources):
+        self.index.close()
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,305 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Processors for dense passage retrieval with faiss, an alternative to the
+Elasticsearch back end.
+"""
+# pylint: disable=attribute-defined-outside-init
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.data.ontology.top import Query
+from forte.processors.base import IndexProcessor, MultiPackProcessor
+from onto.cord19research import Passage
+from composable_source.processors.elasticsearch_query_creator import (
+    ElasticSearchQueryCreator,
+)
+from composable_source.processors.pack_store_processor import add_hit_pack
+from composable_source.processors.passage_index_processor import (
+    passage_fields,
+)
+from composable_source.utils.dense_index import DenseIndex, DenseIndexBuilder
+from composable_source.utils.pack_store import PackStore
+from composable_source.utils.passages import (
+    PART_DELIMITER,
+    paper_title,
+    split_passages,
+)
+
+__all__ = [
+    "DensePackIndexProcessor",
+    "DenseQueryCreator",
+    "DenseSearchProcessor",
+]
+
+
+def _default_encoder_configs() -> Dict[str, Any]:
+    return {
+        "model_name": "bert-base-uncased",
+        "max_seq_length": 256,
+        "batch_size": 32,
+    }
+
+
+def _create_encoder(configs: Config):
+    # The encoder needs torch and texar, which the search side of the index
+    # does not.
+    # pylint: disable=import-outside-toplevel
+    from composable_source.utils.passage_encoder import PassageEncoder
+
+    return PassageEncoder(**configs.encoder.todict())
+
+
+class DensePackIndexProcessor(IndexProcessor):
+    r"""Splits the data packs into passages, encodes every passage with the
+    title of its paper, and builds a :class:`DenseIndex` of the passages.
+    A pack read with the `passage_unit` of `CORDReader` is one passage,
+    the other packs are split into passages of sentences. Every passage is
+    indexed with its `paper_id`, so that :class:`DenseSearchProcessor` can
+    map the passages it finds back to their papers.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.encoder = self._create_encoder()
+        self.builder = DenseIndexBuilder(
+            self.configs.index_dir, self.configs.index_factory
+        )
+        self._num_passages = 0
+
+    def _create_encoder(self):
+        return _create_encoder(self.configs)
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for DensePackIndexProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - batch_size: number of passages encoded and added together
+            - index_dir: the directory to write the index to
+            - index_factory: faiss index factory string, "HNSW32" works
+                without training, "IVF4096,Flat" needs a large corpus
+            - passage_size: maximum length of the passages the packs are
+                split into, in characters, which should fit in the
+                `max_seq_length` of the encoder with the title
+            - encoder: configs of the PassageEncoder
+        """
+        config = super().default_configs()
+        config.update(
+            {
+                "index_dir": "dense_index",
+                "index_factory": "HNSW32",
+                "passage_size": 1000,
+                "encoder": _default_encoder_configs(),
+            }
+        )
+        return config
+
+    def _passages(self, input_pack: DataPack) -> List[Dict[str, Any]]:
+        """
+        Split a pack into the passages to index.
+        :param input_pack: a pack read by `CORDReader`
+        :return: the documents of the passages, with the `doc_id` of the
+            pack, the passage as `content`, the `paper_id` and the `title`
+            of its paper, its `begin` offset in the paper, and the
+            `paper_row` of the first passage of the pack, which is the only
+            one with the `pack_info` of the pack
+        """
+        text = input_pack.text
+        title = paper_title(text)
+        paper_id, _, paper_begin, _ = passage_fields(input_pack)
+        passage: Optional[Passage] = next(iter(input_pack.get(Passage)), None)
+        if passage is not None:
+            spans = [(passage.begin, passage.end)]
+            offset = paper_begin - passage.begin
+        else:
+            spans = split_passages(text, len(title), self.configs.passage_size)
+            offset = 0
+
+        documents = []
+        for begin, end in spans:
+            documents.append(
+                {
+                    "doc_id": str(input_pack.pack_id),
+                    "content": text[begin:end],
+                    "pack_info": None,
+                    "paper_id": paper_id,
+                    "title": title,
+                    "begin": begin + offset,
+                    "paper_row": self._num_passages,
+                }
+            )
+        if documents:
+            documents[0]["pack_info"] = input_pack.to_string(True)
+        self._num_passages += len(documents)
+        return documents
+
+    def _process(self, input_pack: DataPack):
+        self.documents.extend(self._passages(input_pack))
+        if len(self.documents) >= self.configs.batch_size:
+            self._bulk_process()
+            self.documents = []
+
+    def _bulk_process(self):
+        vectors = self.encoder.encode(
+            [
+                (
+                    PART_DELIMITER.join(
+                        [document["title"], document["content"]]
+                    )
+                    if document["title"]
+                    else document["content"]
+                )
+                for document in self.documents
+            ]
+        )
+        self.builder.add(vectors, self.documents)
+
+    def finish(self, resource: Resources):
+        self.builder.build()
+
+
+class DenseQueryCreator(ElasticSearchQueryCreator):
+    r"""Encodes the processed query text of
+    :class:`ElasticSearchQueryCreator` into a query vector.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.encoder = self._create_encoder()
+
+    def _create_encoder(self):
+        return _create_encoder(self.configs)
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for DenseQueryCreator.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_pack_name: the query datapack's name
+            - encoder: configs of the PassageEncoder, should be the same
+                as the ones used to build the index
+            - query_cache_path, query_cache_size: same as the
+                ElasticSearchQueryCreator configs
+        """
+        return {
+            "query_pack_name": "query",
+            "encoder": _default_encoder_configs(),
+            "query_cache_path": None,
+            "query_cache_size": 10000,
+        }
+
+    def _process_query(
+        self, input_pack: MultiPack
+    ) -> Tuple[DataPack, np.ndarray]:
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        query_pack.pack_name = self.configs.query_pack_name
+        query = self.encoder.encode([self._build_query_text(query_pack)])
+        return query_pack, query
+
+
+class DenseSearchProcessor(MultiPackProcessor):
+    r"""Searches a :class:`DenseIndex` of passages for the query vector, and
+    adds the papers of the best passages as response packs in the same way
+    as `ElasticSearchProcessor`, so that it can replace it in the search
+    pipeline. A paper is ranked by its best passage. With
+    `indexed_text_only`, the pack of a paper holds its title and its
+    passages that were found, otherwise it is the indexed pack.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.index = DenseIndex(
+            self.configs.index_dir, self.configs.search_params
+        )
+        self.store = (
+            PackStore(self.configs.pack_store_path)
+            if self.configs.pack_store_path
+            else None
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for DenseSearchProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_pack_name: the query datapack's name
+            - index_dir: the directory of the dense index
+            - search_params: faiss search parameters, e.g. "efSearch=128"
+            - size: number of papers to retrieve
+            - num_passages: number of passages to search for, which are
+                grouped into at most `size` papers, 10 times `size` if None
+            - field, response_pack_name_prefix, indexed_text_only: same as
+                the ElasticSearchProcessor configs
+            - pack_store_path, stored_pack_name_prefix: same as the
+                PackStoreSearchProcessor configs, no store is used if the
+                path is None
+        """
+        return {
+            "query_pack_name": "query",
+            "index_dir": "dense_index",
+            "search_params": None,
+            "size": 1000,
+            "num_passages": None,
+            "field": "content",
+            "response_pack_name_prefix": "passage",
+            "indexed_text_only": True,
+            "pack_store_path": None,
+            "stored_pack_name_prefix": "annotated",
+        }
+
+    def _process(self, input_pack: MultiPack):
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        first_query: Query = query_pack.get_single(Query)
+        if not isinstance(first_query.value, np.ndarray):
+            raise ValueError(
+                "The query to the dense index need to be a vector."
+            )
+
+        num_passages = self.configs.num_passages or 10 * self.configs.size
+        papers: Dict[str, List[Tuple[Dict[str, Any], float]]] = {}
+        for document, score in self.index.search(
+            first_query.value, num_passages
+        ):
+            papers.setdefault(document["paper_id"], []).append(
+                (document, score)
+            )
+
+        for idx, hits in enumerate(list(papers.values())[:self.configs.size]):
+            document, score = hits[0]
+            first_query.add_result(document["doc_id"], score)
+            passages = None
+            if self.configs.indexed_text_only:
+                hits.sort(key=lambda hit: hit[0]["begin"])
+                passages = (
+                    document["title"],
+                    [hit[0]["content"] for hit in hits],
+                )
+            elif document["pack_info"] is None:
+                document = self.index.document(document["paper_row"])
+            add_hit_pack(
+                input_pack, document, idx, self.configs, self.store, passages
+            )
+
+    def finish(self, resource: Resources):
+        self.index.close()
+        if self.store is not None:
+            self.store.close()
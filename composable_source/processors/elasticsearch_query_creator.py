@@ -15,13 +15,27 @@
 # pylint: disable=attribute-defined-outside-init
 from typing import Any, Dict, Tuple
 
+from forte.common.configuration import Config
+from forte.common.resources import Resources
 from forte.data.data_pack import DataPack
 from forte.data.multi_pack import MultiPack
 from forte.processors.base import QueryProcessor
-from composable_source.utils.utils import query_preprocess
+from composable_source.utils.query_cache import (
+    acquire_query_cache,
+    cached_query_preprocess,
+    release_query_cache,
+)
 
 __all__ = ["ElasticSearchQueryCreator"]
 
+# Painless script of the title of a paper, the text before the first blank
+# line, see `paper_title`.
+TITLE_SCRIPT = (
+    "String text = params['_source'][params.field];"
+    " int end = text == null ? -1 : text.indexOf('\\n\\n');"
+    " return end < 0 ? '' : text.substring(0, end);"
+)
+
 
 class ElasticSearchQueryCreator(QueryProcessor):
     r"""This processor creates a Elasticsearch query and adds it as Query entry
@@ -32,17 +46,20 @@ class ElasticSearchQueryCreator(QueryProcessor):
     def __init__(self) -> None:
         super().__init__()
 
-    def _build_query_nlp(self, input_pack: DataPack) -> Dict[str, Any]:
-        """Constructs Elasticsearch query that will be consumed by
-        Elasticsearch processor with nlp analysis.
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.query_cache, self._owns_query_cache = acquire_query_cache(
+            resources, self.configs
+        )
+
+    def _build_query_text(self, input_pack: DataPack) -> str:
+        """Constructs the query text from the nlp analysis of the query,
+        which keeps the query entity and the verb.
         Args:
              input_pack: DataPack
         """
-        size = self.configs.size
-        field = self.configs.field
-
-        query, arg0, arg1, verb, _, is_answer_arg0 = query_preprocess(
-            input_pack
+        query, arg0, arg1, verb, _, is_answer_arg0 = cached_query_preprocess(
+            input_pack, self.query_cache
         )
 
         if not arg0 or not arg1:
@@ -55,21 +72,170 @@ class ElasticSearchQueryCreator(QueryProcessor):
         else:
             processed_query = f"{arg0} {verb}".lower()
 
+        return processed_query
+
+    def _build_query_nlp(self, input_pack: DataPack) -> Dict[str, Any]:
+        """Constructs Elasticsearch query that will be consumed by
+        Elasticsearch processor with nlp analysis.
+        Args:
+             input_pack: DataPack
+        """
+        processed_query = self._build_query_text(input_pack)
+        if not self.configs.tier_fields:
+            return self._build_field_query(processed_query, self.configs.field)
+
+        # The fields are searched one after another, until `size` documents
+        # are found.
+        return {
+            "tiers": [
+                self._build_field_query(processed_query, field)
+                for field in self.configs.tier_fields
+            ],
+            "size": self.configs.size,
+        }
+
+    def _build_field_query(
+        self, processed_query: str, field: str
+    ) -> Dict[str, Any]:
+        """Constructs the Elasticsearch query of a field.
+        Args:
+             processed_query: the query text
+             field: the field to search
+        """
+        phrase_query = {
+            "match_phrase": {
+                field: {
+                    "query": processed_query,
+                    "slop": self.configs.slop,  # how far the terms can be
+                }
+            }
+        }
+        if not self.configs.two_phase:
+            query: Dict[str, Any] = {
+                "query": phrase_query,
+                "size": self.configs.size,
+            }
+        else:
+            query = self._two_phase_query(processed_query, field, phrase_query)
+        if self.configs.passages:
+            query.update(self._passage_options())
+        return query
+
+    def _two_phase_query(
+        self, processed_query: str, field: str, phrase_query: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Match the terms first, which is much cheaper than the sloppy
+        phrase, and only rescore the top of the ranking with the phrase.
+        Args:
+             processed_query: the query text
+             field: the field to search
+             phrase_query: the phrase query of the text
+        """
         return {
             "query": {
-                "match_phrase": {
+                "match": {
                     field: {
                         "query": processed_query,
-                        "slop": 10,  # how far we allow the terms to be
+                        "minimum_should_match": (
+                            self.configs.minimum_should_match
+                        ),
+                    }
+                }
+            },
+            "rescore": {
+                "window_size": self.configs.rescore_window_size,
+                "query": {
+                    "rescore_query": phrase_query,
+                    "query_weight": self.configs.query_weight,
+                    "rescore_query_weight": self.configs.rescore_query_weight,
+                },
+            },
+            "size": self.configs.size,
+        }
+
+    def _passage_options(self) -> Dict[str, Any]:
+        """Returns the options that fetch only the title and the
+        highlighted passages of the papers instead of the whole papers."""
+        field = self.configs.field
+        return {
+            "_source": ["doc_id"],
+            "script_fields": {
+                "title": {
+                    "script": {
+                        "lang": "painless",
+                        "source": TITLE_SCRIPT,
+                        "params": {"field": field},
                     }
                 }
             },
-            "size": size,
+            "highlight": {
+                "type": "unified",
+                "boundary_scanner": "sentence",
+                "fragment_size": self.configs.fragment_size,
+                "number_of_fragments": self.configs.number_of_fragments,
+                "order": "score",
+                "pre_tags": [""],
+                "post_tags": [""],
+                # The searched field may be another one, see tier_fields.
+                "require_field_match": False,
+                "fields": {field: {}},
+            },
         }
 
     @classmethod
     def default_configs(cls) -> Dict[str, Any]:
-        return {"size": 1000, "field": "content", "query_pack_name": "query"}
+        """
+        This defines a basic config structure for ElasticSearchQueryCreator.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - size: number of documents to retrieve
+            - field: the document field to search
+            - query_pack_name: the query datapack's name
+            - slop: how far apart the terms of the phrase query can be
+            - two_phase: whether to run a `match` query of the terms, and
+                only rescore its top documents with the phrase query,
+                instead of running the phrase query over the whole index
+            - minimum_should_match: share of the terms that the documents
+                of the `match` query need, in the Elasticsearch syntax
+            - rescore_window_size: number of top documents rescored with the
+                phrase query, the other ones keep their `match` scores
+            - query_weight, rescore_query_weight: weights of the `match`
+                and the phrase scores of the rescored documents
+            - passages: whether to fetch only the title and the passages
+                around the matched terms of every paper, from the
+                Elasticsearch highlighter, instead of the whole paper
+            - fragment_size: length goal of a passage in characters, the
+                sentences of the match are grown with their neighbouring
+                sentences up to this length
+            - number_of_fragments: maximum number of passages of a paper
+            - tier_fields: fields searched one after another instead of
+                `field`, e.g. `title_abstract` then `body`, a field is only
+                searched if the previous ones found fewer than `size`
+                documents. The passages and the title are still taken from
+                `field`
+            - query_cache_path: path of the query analysis cache, the query
+                is analyzed from its annotations if it is None
+            - query_cache_size: maximum number of cached queries. The
+                first component of the pipeline opens the cache, the others
+                share it through the pipeline resources
+        """
+        return {
+            "size": 1000,
+            "field": "content",
+            "query_pack_name": "query",
+            "slop": 10,
+            "two_phase": False,
+            "minimum_should_match": "75%",
+            "rescore_window_size": 100,
+            "query_weight": 1.0,
+            "rescore_query_weight": 2.0,
+            "passages": False,
+            "fragment_size": 300,
+            "number_of_fragments": 5,
+            "tier_fields": None,
+            "query_cache_path": None,
+            "query_cache_size": 10000,
+        }
 
     def _process_query(
         self, input_pack: MultiPack
@@ -83,3 +249,6 @@ class ElasticSearchQueryCreator(QueryProcessor):
         query_pack.pack_name = self.configs.query_pack_name
         query = self._build_query_nlp(query_pack)
         return query_pack, query
+
+    def finish(self, resource: Resources):
+        release_query_cache(resource, self.query_cache, self._owns_query_cache)
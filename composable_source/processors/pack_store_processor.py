@@ -0,0 +1,232 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Processors that persist annotated papers at index time and swap them into
+the search results at query time.
+"""
+# pylint: disable=attribute-defined-outside-init
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.data.ontology.top import Query
+from forte.processors.base import PackProcessor
+from ft.onto.base_ontology import Document, Title
+from fortex.elastic import ElasticSearchProcessor
+from composable_source.utils.pack_store import PackStore
+from composable_source.utils.passages import PART_DELIMITER, hit_passages
+
+__all__ = [
+    "add_hit_pack",
+    "tiered_search",
+    "passage_pack",
+    "PackStoreWriter",
+    "PackStoreSearchProcessor",
+]
+
+
+def add_hit_pack(
+    input_pack: MultiPack,
+    document: Dict[str, Any],
+    idx: int,
+    configs: Config,
+    store: Optional[PackStore] = None,
+    passages: Optional[Tuple[str, List[str]]] = None,
+) -> DataPack:
+    """
+    Add the `idx`-th search hit to `input_pack` the same way as
+    `ElasticSearchProcessor`, unless the hit is found in `store`, in which
+    case the stored pack is added under `configs.stored_pack_name_prefix`,
+    or `passages` are given, in which case the pack only holds them.
+    :param input_pack: MultiPack containing the query
+    :param document: the hit, with `doc_id`, `configs.field` and
+        `pack_info` values
+    :param idx: rank of the hit
+    :param configs: configs of the search processor
+    :param store: the pack store, if any
+    :param passages: the title and the passages of the hit, see
+        `hit_passages`, if the query asked for passages
+    :return: the added DataPack
+    """
+    pack = store.get(document["doc_id"]) if store is not None else None
+    if pack is not None:
+        input_pack.add_pack_(pack, f"{configs.stored_pack_name_prefix}_{idx}")
+    elif passages is not None:
+        pack = passage_pack(*passages)
+        input_pack.add_pack_(pack, f"{configs.response_pack_name_prefix}_{idx}")
+    elif configs.indexed_text_only:
+        pack = input_pack.add_pack(f"{configs.response_pack_name_prefix}_{idx}")
+        content = document[configs.field]
+        pack.set_text(content)
+        Document(pack=pack, begin=0, end=len(content))
+    else:
+        pack = DataPack.from_string(document["pack_info"])
+        input_pack.add_pack_(pack, f"{configs.response_pack_name_prefix}_{idx}")
+    pack.pack_name = document["doc_id"]
+    return pack
+
+
+def tiered_search(
+    search: Callable[[Dict[str, Any]], Dict[str, Any]], query: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Run a query of `ElasticSearchQueryCreator`. The `tiers` of a query made
+    with `tier_fields` are searched in order: the hits of a tier that the
+    previous tiers did not find come after theirs, and the next tiers are
+    not searched once there are `size` hits.
+    :param search: the search function of the index, which takes a query
+        dict and returns the results of the Elasticsearch search API
+    :param query: the query dict
+    :return: the results in the format of the Elasticsearch search API
+    """
+    if "tiers" not in query:
+        return search(query)
+
+    size = query.get("size", 10)
+    hits: List[Dict[str, Any]] = []
+    found = set()
+    for tier in query["tiers"]:
+        if len(hits) >= size:
+            break
+        for hit in search(tier)["hits"]["hits"]:
+            if hit["_id"] not in found and len(hits) < size:
+                found.add(hit["_id"])
+                hits.append(hit)
+    return {
+        "hits": {
+            "total": {"value": len(hits), "relation": "gte"},
+            "max_score": hits[0]["_score"] if hits else None,
+            "hits": hits,
+        }
+    }
+
+
+def passage_pack(title: str, fragments: List[str]) -> DataPack:
+    """
+    Build the pack of a paper from its title and its passages, laid out as
+    the papers of `CORDReader`: the title and every passage are separated
+    by blank lines.
+    :param title: the title of the paper
+    :param fragments: the passages of the paper
+    :return: the pack, with a `Document` and a `Title`
+    """
+    text = PART_DELIMITER.join([title] + fragments)
+    pack = DataPack()
+    pack.set_text(text)
+    Document(pack, 0, len(text))
+    Title(pack, 0, len(title))
+    pack.add_all_remaining_entries()
+    return pack
+
+
+class PackStoreWriter(PackProcessor):
+    r"""Writes every pack into a :class:`PackStore`. The packs are keyed by
+    their pack id, which is the `doc_id` written by
+    `ElasticSearchPackIndexProcessor`, so this processor should run in the
+    same pipeline as the index processor.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.store = PackStore(self.configs.pack_store_path)
+        self._num_packs = 0
+
+    @classmethod
+    def default_configs(cls):
+        """
+        This defines a basic config structure for PackStoreWriter.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - pack_store_path: path of the pack store file, no store is
+                used if it is None
+            - commit_interval: number of packs between two commits
+        """
+        return {"pack_store_path": "pack_store.db", "commit_interval": 100}
+
+    def _process(self, input_pack: DataPack):
+        self.store.put(str(input_pack.pack_id), input_pack)
+
+        self._num_packs += 1
+        if self._num_packs % self.configs.commit_interval == 0:
+            self.store.commit()
+
+    def finish(self, resource: Resources):
+        self.store.close()
+
+
+class PackStoreSearchProcessor(ElasticSearchProcessor):
+    r"""An :class:`ElasticSearchProcessor` that looks up every hit in a
+    :class:`PackStore` first. Hits found in the store are added with their
+    stored annotations under `stored_pack_name_prefix`, so the selector of
+    the hit processors (which matches `response_pack_name_prefix`) skips
+    them. Other hits are added as usual, or as the packs of their passages
+    if the query asked for passages. The tiers of a query are searched with
+    :func:`tiered_search`.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.store = (
+            PackStore(self.configs.pack_store_path)
+            if self.configs.pack_store_path
+            else None
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for PackStoreSearchProcessor.
+        :return: A dictionary with the default config for this processor.
+        On top of the ElasticSearchProcessor configs:
+            - pack_store_path: path of the pack store file, no store is
+                used if it is None
+            - stored_pack_name_prefix: the pack name prefix of the hits
+                loaded from the store
+        """
+        config = super().default_configs()
+        config.update(
+            {
+                "pack_store_path": "pack_store.db",
+                "stored_pack_name_prefix": "annotated",
+            }
+        )
+        return config
+
+    def _process(self, input_pack: MultiPack):
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        first_query: Query = query_pack.get_single(Query)
+        if not isinstance(first_query.value, dict):
+            raise ValueError(
+                "The query to the elastic indexer need to be a dictionary."
+            )
+        results = tiered_search(self.index.search, first_query.value)
+        hits = results["hits"]["hits"]
+
+        for idx, hit in enumerate(hits):
+            document = hit["_source"]
+            first_query.add_result(document["doc_id"], hit["_score"])
+            add_hit_pack(
+                input_pack,
+                document,
+                idx,
+                self.configs,
+                self.store,
+                hit_passages(hit, self.configs.field),
+            )
+
+    def finish(self, resource: Resources):
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,290 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Pipeline stages that run the processors of the retrieved papers
+concurrently, on threads or on worker processes.
+"""
+# pylint: disable=attribute-defined-outside-init
+import multiprocessing
+import os
+import re
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from forte.common.configuration import Config
+from forte.common.exception import ProcessorConfigError
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.processors.base import MultiPackProcessor, PackProcessor
+
+__all__ = [
+    "ConcurrentPackProcessor",
+    "ParallelProcessor",
+    "ShardedProcessor",
+]
+
+# Thread pool sizes of the numerical libraries.
+THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+)
+
+
+class ConcurrentPackProcessor(PackProcessor, ABC):
+    r"""A :class:`PackProcessor` split into two steps: :meth:`compute` runs
+    the models and only reads the pack, and :meth:`write` adds the results
+    to the pack. The :meth:`compute` steps of several processors can then
+    run at the same time in a :class:`ParallelProcessor`.
+    """
+
+    def _process(self, input_pack: DataPack):
+        self.write(input_pack, self.compute(input_pack))
+
+    def after_fork(self):
+        """
+        Called in a worker process forked after the processor is
+        initialized, e.g. to reopen the files it uses.
+        :return:
+        """
+
+    @abstractmethod
+    def compute(self, input_pack: DataPack) -> Any:
+        """
+        Compute the annotations of a pack without changing it. This may be
+        called from another thread.
+        :param input_pack: the pack
+        :return: the results to be added by :meth:`write`
+        """
+        raise NotImplementedError
+
+    def compute_batch(self, input_packs: List[DataPack]) -> List[Any]:
+        """
+        Compute the annotations of several packs, which processors running
+        their models in batches override.
+        :param input_packs: the packs
+        :return: the output of :meth:`compute` for every pack
+        """
+        return [self.compute(input_pack) for input_pack in input_packs]
+
+    @abstractmethod
+    def write(self, input_pack: DataPack, result: Any):
+        """
+        Add the results of :meth:`compute` to the pack.
+        :param input_pack: the pack
+        :param result: the output of :meth:`compute` for this pack
+        :return:
+        """
+        raise NotImplementedError
+
+
+def initialize_processors(
+    processors: List[PackProcessor],
+    resources: Resources,
+    processor_configs: Optional[List[Dict[str, Any]]],
+):
+    """
+    Initialize the processors of a stage with their configs.
+    :param processors: the processors
+    :param resources: the pipeline resources
+    :param processor_configs: the configs of every processor, in the same
+        order, or None to use the default configs
+    :return:
+    """
+    processor_configs = processor_configs or [{}] * len(processors)
+    if len(processor_configs) != len(processors):
+        raise ProcessorConfigError(
+            f"Got {len(processor_configs)} processor configs for "
+            f"{len(processors)} processors."
+        )
+    for processor, processor_config in zip(processors, processor_configs):
+        processor.initialize(
+            resources, processor.make_configs(processor_config)
+        )
+
+
+class ParallelProcessor(ConcurrentPackProcessor):
+    r"""Runs the :meth:`ConcurrentPackProcessor.compute` step of every
+    processor on a thread pool, then writes their results into the pack one
+    after another in the order of `processors`, so the pack is the same as
+    when they run in sequence. The processors must not read what the others
+    write. The models release the GIL during inference, so a pack takes
+    about as long as the slowest processor.
+
+    Args:
+        processors: the processors to run at the same time.
+    """
+
+    def __init__(self, processors: List[ConcurrentPackProcessor]):
+        super().__init__()
+        self.processors = processors
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        initialize_processors(
+            self.processors, resources, self.configs.processors
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for ParallelProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - max_workers: number of threads, one per processor if None
+            - processors: list with the configs of every processor, in the
+                same order as the processors
+        """
+        return {"max_workers": None, "processors": None}
+
+    def after_fork(self):
+        # The threads of the parent process do not exist in the child.
+        self._executor = None
+        for processor in self.processors:
+            processor.after_fork()
+
+    def compute(self, input_pack: DataPack) -> List[Any]:
+        return self.compute_batch([input_pack])[0]
+
+    def compute_batch(self, input_packs: List[DataPack]) -> List[List[Any]]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.configs.max_workers or len(self.processors)
+            )
+        futures = [
+            self._executor.submit(processor.compute_batch, input_packs)
+            for processor in self.processors
+        ]
+        processor_results = [future.result() for future in futures]
+        return [list(results) for results in zip(*processor_results)]
+
+    def write(self, input_pack: DataPack, result: List[Any]):
+        for processor, processor_result in zip(self.processors, result):
+            processor.write(input_pack, processor_result)
+
+    def finish(self, resource: Resources):
+        if self._executor is not None:
+            self._executor.shutdown()
+        for processor in self.processors:
+            processor.finish(resource)
+
+
+# The processors of the ShardedProcessor being run by a worker process.
+_worker_processors: List[ConcurrentPackProcessor] = []
+
+
+def _initialize_worker(threads: Optional[int]):
+    if threads:
+        for variable in THREAD_VARIABLES:
+            os.environ[variable] = str(threads)
+        # The models are loaded before the fork, so the environment comes
+        # too late for torch.
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(threads)
+    for processor in _worker_processors:
+        processor.after_fork()
+
+
+def _annotate(serialized_pack: str) -> List[Any]:
+    pack = DataPack.from_string(serialized_pack)
+    results = []
+    for processor in _worker_processors:
+        result = processor.compute(pack)
+        processor.write(pack, result)
+        pack.add_all_remaining_entries()
+        results.append(result)
+    return results
+
+
+class ShardedProcessor(MultiPackProcessor):
+    r"""Annotates the packs of a MultiPack whose names match
+    `pack_name_pattern` on a pool of worker processes. The processors are
+    initialized, and their models loaded, before the workers are forked, so
+    the workers share the model weights copy-on-write. Every worker runs the
+    processors over a copy of a pack and sends back the outputs of their
+    :meth:`ConcurrentPackProcessor.compute` steps, which are written into
+    the pack of the MultiPack in the main process. Forking is not supported
+    with CUDA, so this is meant for models running on CPU.
+
+    Args:
+        processors: the processors to run, one after another, on every
+            pack.
+    """
+
+    def __init__(self, processors: List[ConcurrentPackProcessor]):
+        super().__init__()
+        self.processors = processors
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        initialize_processors(
+            self.processors, resources, self.configs.processors
+        )
+        self.pattern = re.compile(self.configs.pack_name_pattern)
+
+        # The workers get the processors from the module when forked.
+        _worker_processors[:] = self.processors
+        self.pool = multiprocessing.get_context("fork").Pool(
+            self.configs.num_workers,
+            initializer=_initialize_worker,
+            initargs=(self.configs.threads_per_worker,),
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for ShardedProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - num_workers: number of worker processes, the number of CPUs
+                if None
+            - threads_per_worker: number of threads used by the models of
+                every worker, the library defaults are kept if None
+            - pack_name_pattern: regular expression of the names of the
+                packs to annotate
+            - processors: list with the configs of every processor, in the
+                same order as the processors
+        """
+        return {
+            "num_workers": None,
+            "threads_per_worker": 1,
+            "pack_name_pattern": r"passage_\d",
+            "processors": None,
+        }
+
+    def _process(self, input_pack: MultiPack):
+        packs = [
+            pack
+            for name, pack in input_pack.iter_packs()
+            if self.pattern.match(name)
+        ]
+        # One pack at a time, so that long papers do not hold up a shard.
+        all_results = self.pool.map(
+            _annotate, [pack.to_string(True) for pack in packs], chunksize=1
+        )
+        for pack, results in zip(packs, all_results):
+            for processor, result in zip(self.processors, results):
+                processor.write(pack, result)
+            pack.add_all_remaining_entries()
+
+    def finish(self, resource: Resources):
+        self.pool.close()
+        self.pool.join()
+        for processor in self.processors:
+            processor.finish(resource)
@@ -0,0 +1,148 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Processors that index the passages read by `CORDReader` with their paper,
+section and offsets, and optionally the parts of the papers as separate
+fields.
+"""
+from typing import Any, Dict, List, Optional
+
+from forte.common.configuration import Config
+from forte.data.data_pack import DataPack
+from fortex.elastic import ElasticSearchPackIndexProcessor
+from ft.onto.base_ontology import Title
+from onto.cord19research import Abstract, Body, Passage
+from composable_source.processors.bm25_processors import (
+    BM25PackIndexProcessor,
+)
+
+__all__ = [
+    "PASSAGE_FIELDS",
+    "passage_fields",
+    "SECTION_FIELDS",
+    "section_fields",
+    "ElasticSearchPassageIndexProcessor",
+    "BM25PassageIndexProcessor",
+]
+
+# The fields indexed on top of the ones of the papers.
+PASSAGE_FIELDS = ["paper_id", "section", "begin", "end"]
+
+
+def passage_fields(input_pack: DataPack) -> List[Any]:
+    """
+    Get the values of the `PASSAGE_FIELDS` of a pack.
+    :param input_pack: a pack read by `CORDReader`, a whole paper is a
+        passage of itself
+    :return: the paper id, the section name, and the begin and end offsets
+        of the passage in the paper
+    """
+    passage: Optional[Passage] = next(iter(input_pack.get(Passage)), None)
+    if passage is None:
+        return [input_pack.pack_name, "", 0, len(input_pack.text)]
+    return [
+        passage.paper_id,
+        passage.section,
+        passage.paper_begin,
+        passage.paper_end,
+    ]
+
+
+# The parts of a paper indexed as separate fields.
+SECTION_FIELDS = ["title", "abstract", "body", "title_abstract"]
+
+
+def section_fields(input_pack: DataPack) -> List[str]:
+    """
+    Get the values of the `SECTION_FIELDS` of a pack.
+    :param input_pack: a pack read by `CORDReader`
+    :return: the texts of the `Title`, the `Abstract` and the `Body` of the
+        pack, and the title and the abstract separated by a blank line, as
+        in the text of the paper
+    """
+    title, abstract, body = (
+        " ".join(entry.text for entry in input_pack.get(entry_type))
+        for entry_type in (Title, Abstract, Body)
+    )
+    return [title, abstract, body, f"{title}\n\n{abstract}"]
+
+
+def _index_fields(configs: Config) -> List[str]:
+    return PASSAGE_FIELDS + (SECTION_FIELDS if configs.section_fields else [])
+
+
+def _index_content(configs: Config, input_pack: DataPack) -> List[Any]:
+    content = passage_fields(input_pack)
+    if configs.section_fields:
+        content += section_fields(input_pack)
+    return content
+
+
+class ElasticSearchPassageIndexProcessor(ElasticSearchPackIndexProcessor):
+    r"""Indexes the passages into an `Elasticsearch` index like
+    `ElasticSearchPackIndexProcessor`, with the `PASSAGE_FIELDS` too, and
+    the `SECTION_FIELDS` if `section_fields` is True.
+    """
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for
+        ElasticSearchPassageIndexProcessor.
+        :return: A dictionary with the default config for this processor.
+        On top of the ElasticSearchPackIndexProcessor configs:
+            - section_fields: whether to index the `SECTION_FIELDS`
+        """
+        config = super().default_configs()
+        config.update({"section_fields": False})
+        return config
+
+    def _field_names(self) -> List[str]:
+        return super()._field_names() + _index_fields(self.configs)
+
+    def _content_for_index(self, input_pack: DataPack) -> List[Any]:
+        return super()._content_for_index(input_pack) + _index_content(
+            self.configs, input_pack
+        )
+
+
+class BM25PassageIndexProcessor(BM25PackIndexProcessor):
+    r"""Indexes the passages into a :class:`BM25Index` like
+    `BM25PackIndexProcessor`, with the `PASSAGE_FIELDS` too, and the
+    `SECTION_FIELDS` if `section_fields` is True. The `SECTION_FIELDS` can
+    be searched.
+    """
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for BM25PassageIndexProcessor.
+        :return: A dictionary with the default config for this processor.
+        On top of the BM25PackIndexProcessor configs:
+            - section_fields: whether to index the `SECTION_FIELDS`
+        """
+        config = super().default_configs()
+        config.update({"section_fields": False})
+        return config
+
+    def _field_names(self) -> List[str]:
+        return super()._field_names() + _index_fields(self.configs)
+
+    def _search_fields(self) -> List[str]:
+        return SECTION_FIELDS if self.configs.section_fields else []
+
+    def _content_for_index(self, input_pack: DataPack) -> List[Any]:
+        return super()._content_for_index(input_pack) + _index_content(
+            self.configs, input_pack
+        )
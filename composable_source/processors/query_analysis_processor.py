@@ -0,0 +1,75 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A processor that analyzes the query once and stores the analysis in the
+query pack for the processors after it.
+"""
+# pylint: disable=attribute-defined-outside-init
+from typing import Any, Dict
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.processors.base import PackProcessor
+from composable_source.utils.query_cache import (
+    acquire_query_cache,
+    add_analyzed_query,
+    analyzed_query,
+    cached_query_preprocess,
+    release_query_cache,
+)
+
+__all__ = ["QueryAnalysisProcessor"]
+
+
+class QueryAnalysisProcessor(PackProcessor):
+    r"""Finds the arguments, the predicate, the verb lemma and the answer
+    side of the query with :func:`cached_query_preprocess`, right after the
+    SRL processor of the query, and stores them in an `AnalyzedQuery` of
+    the query pack. The query creator, the reranker, the sentence filter,
+    the answer budget and the response creator then read this entry
+    instead of walking the annotations of the query again. Queries found
+    in the query analysis cache are not analyzed, and the analysis of the
+    new ones is added to the cache.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.query_cache, self._owns_query_cache = acquire_query_cache(
+            resources, self.configs
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for QueryAnalysisProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_cache_path: path of the query analysis cache, the query
+                is always analyzed from its annotations if it is None
+            - query_cache_size: maximum number of cached queries. The
+                first component of the pipeline opens the cache, the others
+                share it through the pipeline resources
+        """
+        return {"query_cache_path": None, "query_cache_size": 10000}
+
+    def _process(self, input_pack: DataPack):
+        if analyzed_query(input_pack) is not None:
+            return
+        add_analyzed_query(
+            input_pack, cached_query_preprocess(input_pack, self.query_cache)
+        )
+
+    def finish(self, resource: Resources):
+        release_query_cache(resource, self.query_cache, self._owns_query_cache)
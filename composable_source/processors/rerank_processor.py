@@ -0,0 +1,221 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A processor that reranks the retrieved papers with cheap lexical features
+of the query, so that only the most promising ones are annotated.
+"""
+# pylint: disable=attribute-defined-outside-init
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.processors.base import MultiPackProcessor
+from ft.onto.base_ontology import Title
+from onto.cord19research import Abstract
+from composable_source.processors.response_creator import (
+    query_answer_target,
+)
+from composable_source.processors.sentence_filter import verb_pattern
+from composable_source.utils.passages import split_sentences
+from composable_source.utils.query_cache import (
+    acquire_query_cache,
+    release_query_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "lexical_features",
+    "LexicalRerankProcessor",
+]
+
+
+def lexical_features(
+    text: str,
+    ent: str,
+    verb_lemma: Optional[str],
+    title: str = "",
+    abstract: str = "",
+) -> Dict[str, float]:
+    """
+    Compute the lexical features of a paper for a query.
+    :param text: the paper text
+    :param ent: the entity in the query
+    :param verb_lemma: the verb lemma in the query, or None
+    :param title: the title of the paper
+    :param abstract: the abstract of the paper
+    :return: dict with the features, each between 0 and 1:
+        - sentence: number of sentences with both the entity and a form
+            of the verb, up to 10, divided by 10
+        - proximity: 1 / (1 + the fewest words between the entity and the
+            verb in such a sentence)
+        - title: 1 if the title mentions the entity and a form of the
+            verb, 0.5 if it only mentions the entity
+        - abstract: same as `title` for the abstract
+    """
+    ent = ent.lower().strip()
+    verb = verb_pattern(verb_lemma) if verb_lemma else None
+
+    def mentions(part: str) -> float:
+        part = part.lower()
+        if not ent or ent not in part:
+            return 0.0
+        return 1.0 if verb is None or verb.search(part) else 0.5
+
+    sentences, distance = 0, None
+    if ent:
+        for begin, end in split_sentences(text):
+            sentence = text[begin:end].lower()
+            if ent not in sentence:
+                continue
+            if verb is None:
+                sentences += 1
+                continue
+            verbs = [match.span() for match in verb.finditer(sentence)]
+            if not verbs:
+                continue
+            sentences += 1
+            for ent_begin in _find_all(sentence, ent):
+                ent_end = ent_begin + len(ent)
+                for verb_begin, verb_end in verbs:
+                    gap = sentence[
+                        min(ent_end, verb_end):max(ent_begin, verb_begin)
+                    ]
+                    words = len(gap.split())
+                    if distance is None or words < distance:
+                        distance = words
+
+    return {
+        "sentence": min(sentences, 10) / 10,
+        "proximity": 1 / (1 + distance) if distance is not None else 0.0,
+        "title": mentions(title),
+        "abstract": mentions(abstract),
+    }
+
+
+def _find_all(text: str, sub: str) -> List[int]:
+    positions = []
+    position = text.find(sub)
+    while position != -1:
+        positions.append(position)
+        position = text.find(sub, position + 1)
+    return positions
+
+
+class LexicalRerankProcessor(MultiPackProcessor):
+    r"""Scores every retrieved paper with a weighted sum of its
+    :func:`lexical_features` and of its retrieval rank, which is its
+    position among the retrieved packs, and renames the `top_n` best ones
+    by the order of their scores under `ranked_pack_name_prefix`: the best
+    paper is `ranked_0`. The processors annotating the hits then select the
+    ranked packs, and the other retrieved packs are left unannotated under
+    their names. Give the same prefix to the `ResponseCreator` to rank the
+    answers by the reranked order, see :func:`paper_ranks`.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.hit_pattern = re.compile(
+            rf"{self.configs.response_pack_name_prefix}_\d+$"
+        )
+        self.weights: Dict[str, float] = self.configs.weights.todict()
+        self.query_cache, self._owns_query_cache = acquire_query_cache(
+            resources, self.configs
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for LexicalRerankProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_pack_name: the query datapack's name
+            - response_pack_name_prefix: name prefix of the retrieved
+                papers, as in the search processor configs
+            - ranked_pack_name_prefix: name prefix of the reranked packs
+            - top_n: number of papers kept
+            - weights: weight of every lexical feature, and of `retrieval`,
+                which is 1 / (1 + the retrieval rank)
+            - query_cache_path: path of the query analysis cache, the query
+                is analyzed from its annotations if it is None
+            - query_cache_size: maximum number of cached queries. The
+                first component of the pipeline opens the cache, the others
+                share it through the pipeline resources
+        """
+        return {
+            "query_pack_name": "query",
+            "response_pack_name_prefix": "passage",
+            "ranked_pack_name_prefix": "ranked",
+            "top_n": 50,
+            "weights": {
+                "sentence": 1.0,
+                "proximity": 1.0,
+                "title": 0.5,
+                "abstract": 0.5,
+                "retrieval": 0.2,
+            },
+            "query_cache_path": None,
+            "query_cache_size": 10000,
+        }
+
+    def _process(self, input_pack: MultiPack):
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        ent, verb_lemma, _ = query_answer_target(query_pack, self.query_cache)
+
+        hits = [
+            (name, pack)
+            for name, pack in input_pack.iter_packs()
+            if self.hit_pattern.match(name)
+        ]
+        scored: List[Tuple[float, int, str]] = []
+        for rank, (name, pack) in enumerate(hits):
+            features = lexical_features(
+                pack.text,
+                ent,
+                verb_lemma,
+                _annotation_text(pack, Title),
+                _annotation_text(pack, Abstract),
+            )
+            features["retrieval"] = 1 / (1 + rank)
+            score = sum(
+                self.weights.get(feature, 0.0) * value
+                for feature, value in features.items()
+            )
+            scored.append((score, rank, name))
+
+        # Ties keep the retrieval order.
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        kept = scored[:self.configs.top_n]
+        for new_rank, (_, _, name) in enumerate(kept):
+            input_pack.rename_pack(
+                name, f"{self.configs.ranked_pack_name_prefix}_{new_rank}"
+            )
+
+        logger.debug(
+            "Kept %d of %d papers, retrieval ranks %s.",
+            len(kept),
+            len(scored),
+            [rank for _, rank, _ in kept],
+        )
+
+    def finish(self, resource: Resources):
+        release_query_cache(resource, self.query_cache, self._owns_query_cache)
+
+
+def _annotation_text(pack: DataPack, entry_type: Any) -> str:
+    return " ".join(entry.text for entry in pack.get(entry_type))
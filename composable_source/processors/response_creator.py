@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# pylint: disable=attribute-defined-outside-init
 import logging
+import re
+from bisect import bisect_right
 from collections import defaultdict
-from typing import Tuple, Dict, Set, List, DefaultDict, Any
+from typing import Tuple, Dict, Set, List, DefaultDict, Any, Optional, Callable
 from forte.common.configuration import Config
 from forte.common.resources import Resources
 from forte.data.data_pack import DataPack
@@ -22,21 +25,415 @@ from forte.data.multi_pack import MultiPack
 from forte.processors.base import PackProcessor
 from ft.onto.base_ontology import Token, Sentence, PredicateLink, Title
 from ftx.onto.clinical import MedicalEntityMention
-from composable_source.utils.utils import query_preprocess, get_arg_text
+from composable_source.utils.query_cache import (
+    QueryAnalysisCache,
+    acquire_query_cache,
+    cached_query_preprocess,
+    release_query_cache,
+)
+from composable_source.utils.utils import get_arg_text
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
+    "query_answer_target",
+    "paper_ranks",
+    "PackMatchIndex",
+    "extract_relations",
+    "build_relation_records",
+    "print_records",
+    "RecordingResponseCreator",
     "ResponseCreator",
 ]
 
 URL_PREFIX = "https://www.ncbi.nlm.nih.gov/search/all/?term="
 
+# Resource with the answer budget status of the MultiPacks, keyed by their
+# pack_id, see `AnswerBudgetProcessor`.
+BUDGET_STATUS_RESOURCE = "answer_budget_status"
+
+# Resource with the function that streams the answers of a paper as soon as
+# it is annotated, called with the MultiPack of the query, the paper and
+# the output of `extract_relations`. It is set by an incremental
+# `ResponseCreator`, see `AnswerBudgetProcessor`.
+ANSWER_STREAM_RESOURCE = "answer_stream"
+
+# A function taking the MultiPack of a query and one of its records.
+RecordSink = Callable[[MultiPack, Dict[str, Any]], None]
+
+
+def format_umls_concept(name: str, cui: str) -> str:
+    """
+    Format a UMLS concept for the output.
+    :param name: concept name
+    :param cui: concept unique identifier
+    :return: formatted concept line
+    """
+    return f"Name: {name}\tCUI: {cui}\tLearn more at: {URL_PREFIX}{cui}"
+
+
+def paper_ranks(
+    input_pack: MultiPack,
+    query_pack_name: str,
+    ranked_pack_name_prefix: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Rank the papers of a query in the order they were retrieved, or
+    reranked.
+    :param input_pack: the MultiPack of the query
+    :param query_pack_name: the query datapack's name
+    :param ranked_pack_name_prefix: name prefix of the packs renamed by
+        `LexicalRerankProcessor`, which come first in the order of their
+        names, e.g. `ranked_0` then `ranked_1`
+    :return: doc_id -> rank of the first pack of the paper, the other
+        papers follow in the order of their packs in the MultiPack, in
+        which the filtered packs of a paper come after the retrieved one
+    """
+    ranked: List[Tuple[int, DataPack]] = []
+    if ranked_pack_name_prefix:
+        pattern = re.compile(rf"{re.escape(ranked_pack_name_prefix)}_(\d+)$")
+        for name, pack in input_pack.iter_packs():
+            match = pattern.match(name)
+            if match is not None:
+                ranked.append((int(match.group(1)), pack))
+        ranked.sort(key=lambda x: x[0])
+
+    ranks: Dict[str, int] = {}
+    for pack in [pack for _, pack in ranked] + input_pack.packs:
+        if pack.pack_name != query_pack_name:
+            ranks.setdefault(pack.pack_name, len(ranks))
+    return ranks
+
+
+def build_relation_records(
+    output_relations: Dict[str, List[Any]],
+    output_titles: Dict[str, Dict[str, Tuple[str, str]]],
+    output_concepts: Dict[str, Dict[str, Dict[str, Set[str]]]],
+    ranks: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Turn the relations collected for a query into records, in output order.
+    :param output_relations: triplet key -> [triplet, doc_id]
+    :param output_titles: doc_id -> triplet key -> (sentence, title)
+    :param output_concepts: doc_id -> triplet key -> UMLS concepts
+    :param ranks: doc_id -> retrieval rank, made by `paper_ranks`
+    :return: list of dicts with `arg0`, `predicate`, `arg1`, `doc_id`,
+        `sentence`, `title`, `concepts` and `score` values, the score is
+        1 / (1 + the retrieval rank of the paper), or None if the rank is
+        unknown
+    """
+    relations = list({x[0] for x in output_relations.values()})
+    relations.sort(key=lambda x: (x[3], x[4]))
+
+    records = []
+    for r in relations:
+        triplet = "\t".join(r[0:3])
+        doc_id = output_relations[triplet][1]
+        sentence, title = output_titles[doc_id][triplet]
+        rank = ranks.get(doc_id) if ranks else None
+        records.append(
+            {
+                "arg0": r[0],
+                "predicate": r[1],
+                "arg1": r[2],
+                "doc_id": doc_id,
+                "sentence": sentence,
+                "title": title,
+                "concepts": {
+                    umls_ent: sorted(desc)
+                    for umls_ent, desc in output_concepts[doc_id][
+                        triplet
+                    ].items()
+                },
+                "score": 1 / (1 + rank) if rank is not None else None,
+            }
+        )
+    return records
+
+
+def print_records(records: List[Dict[str, Any]]):
+    """
+    Print the records of a query in human readable format.
+    :param records: the records made by `build_relation_records`
+    :return:
+    """
+    intro_relation = "\u2022Relation:"
+    intro_source = "\u2022Source Sentence:"
+    intro_concepts = "\u2022UMLS Concepts:"
+
+    for record in records:
+        triplet = "\t".join(
+            (record["arg0"], record["predicate"], record["arg1"])
+        )
+
+        line_seperator = "=" * 80
+        print(
+            f"{line_seperator}\n{intro_relation}\n"
+            f"{triplet}\n{intro_source}\n"
+            f"{record['sentence']}(From Paper: , {record['title']})\n"
+            f"{intro_concepts}"
+        )
+
+        leading = " - "
+        sep = "\n\t"
+        for umls_ent, desc in record["concepts"].items():
+            info = sep.join(desc)
+            print(f"{leading}{umls_ent}{sep}{info}")
+
+
+def query_answer_target(
+    query_pack: DataPack, query_cache: Optional[QueryAnalysisCache] = None
+) -> Tuple[str, str, bool]:
+    """
+    Find what the answers of a query are about.
+    :param query_pack: the analyzed query pack
+    :param query_cache: the query analysis cache, if any
+    :return: the entity of the query that the answers contain, the verb
+        lemma and whether the answer is arg0
+    """
+    _, arg0, arg1, _, verb_lemma, is_answer_arg0 = cached_query_preprocess(
+        query_pack, query_cache
+    )
+    ent = arg1 if is_answer_arg0 else arg0
+    return ent, verb_lemma, is_answer_arg0
+
+
+class PackMatchIndex:
+    r"""Lookup structures of an annotated paper, built with a single pass
+    over each entry type, so that the relations of a query are matched
+    without rescanning the tokens and the entity mentions of a sentence for
+    every predicate. Every sentence keeps the forms of its tokens by lemma,
+    its `PredicateLink` by predicate text and its `MedicalEntityMention`,
+    in the order of the pack. The sentences are expected not to overlap, as
+    the sentence splitters make them.
+
+    Args:
+        pack: the annotated paper.
+    """
+
+    def __init__(self, pack: DataPack):
+        self.sentences: List[Sentence] = list(pack.get(Sentence))
+        self._begins = [sentence.begin for sentence in self.sentences]
+        self._ends = [sentence.end for sentence in self.sentences]
+
+        # The offsets of the lower cased text only match the ones of the
+        # pack if lower casing keeps the length of every character.
+        text = pack.text.lower()
+        self._text = text if len(text) == len(pack.text) else None
+
+        self.lemma_forms: List[DefaultDict[Optional[str], Set[str]]] = [
+            defaultdict(set) for _ in self.sentences
+        ]
+        for token in pack.get(Token):
+            index = self._locate(token.begin, token.end)
+            if index is not None:
+                self.lemma_forms[index][token.lemma].add(token.text)
+
+        self.predicate_links: List[Dict[str, List[PredicateLink]]] = [
+            {} for _ in self.sentences
+        ]
+        for link in pack.get(PredicateLink):
+            parent, child = link.get_parent(), link.get_child()
+            index = self._locate(
+                min(parent.begin, child.begin), max(parent.end, child.end)
+            )
+            if index is not None:
+                self.predicate_links[index].setdefault(parent.text, []).append(
+                    link
+                )
+
+        # The lower cased text and the formatted UMLS concepts of every
+        # mention.
+        self.mentions: List[List[Tuple[str, List[str]]]] = [
+            [] for _ in self.sentences
+        ]
+        for mention in pack.get(MedicalEntityMention):
+            index = self._locate(mention.begin, mention.end)
+            if index is not None:
+                self.mentions[index].append(
+                    (
+                        mention.text.lower(),
+                        [
+                            format_umls_concept(umls.name, umls.cui)
+                            for umls in mention.umls_entities
+                        ],
+                    )
+                )
+
+    def _locate(self, begin: int, end: int) -> Optional[int]:
+        """
+        Find the sentence of a span.
+        :param begin: begin offset of the span
+        :param end: end offset of the span
+        :return: index of the sentence containing the span, None if no
+            sentence contains it
+        """
+        index = bisect_right(self._begins, begin) - 1
+        if index >= 0 and end <= self._ends[index]:
+            return index
+        return None
+
+    def sentences_with(self, ent: str) -> List[int]:
+        """
+        Find the sentences mentioning an entity with one scan of the text
+        of the paper, which skips to the next sentence once a sentence
+        matches.
+        :param ent: the entity, lower cased and stripped
+        :return: indices of the sentences whose lower cased text contains
+            the entity, in order
+        """
+        if not ent:
+            return list(range(len(self.sentences)))
+        if self._text is None:
+            return [
+                index
+                for index, sentence in enumerate(self.sentences)
+                if ent in sentence.text.lower()
+            ]
+
+        found = []
+        position = self._text.find(ent)
+        while position != -1:
+            index = self._locate(position, position + len(ent))
+            if index is None:
+                position = self._text.find(ent, position + 1)
+            else:
+                found.append(index)
+                position = self._text.find(ent, self._ends[index])
+        return found
+
+    def relations(
+        self, index: int, verb_lemma: str
+    ) -> DefaultDict[str, Dict[str, str]]:
+        """
+        Get the arguments of the predicates of a sentence that are a form
+        of the verb.
+        :param index: index of the sentence
+        :param verb_lemma: verb lemma in user's query
+        :return: predicate text -> argument type -> argument text
+        """
+        forms = self.lemma_forms[index].get(verb_lemma, set())
+        relations: DefaultDict[str, Dict[str, str]] = defaultdict(dict)
+        for pred, links in self.predicate_links[index].items():
+            if pred not in forms:
+                continue
+            for link in links:
+                relations[pred][link.arg_type] = link.get_child().text
+        return relations
+
+
+def extract_relations(
+    p: str,
+    pack: DataPack,
+    ent: str,
+    verb_lemma: str,
+    is_answer_arg0: bool,
+) -> DefaultDict[str, List[Any]]:
+    """
+    Find the relations of a paper that answer the query.
+    :param p: doc_id of the paper
+    :param pack: the annotated paper
+    :param ent: entity in user's query, lower cased and stripped
+    :param verb_lemma: verb lemma in user's query
+    :param is_answer_arg0: if the answer is arg0 or arg1, bool
+    :return: triplet key -> [[triplet, doc_id], (sentence, title), UMLS
+        concepts]
+    """
+    title = pack.get_single(entry_type=Title).text
+    result: DefaultDict[str, List[Any]] = defaultdict(list)
+    match_index = PackMatchIndex(pack)
+
+    for index in match_index.sentences_with(ent):
+        sent_text = match_index.sentences[index].text.strip()
+        relations = match_index.relations(index, verb_lemma)
+
+        for pred, entity in relations.items():
+            triplets: List[Tuple[str, str, str, int, int]] = []
+            arg0, arg1 = get_arg_text(entity)
+
+            if not arg0 or not arg1:
+                continue
+
+            # check the logic of triplet to filter answers
+            if ent in arg0.lower() and not is_answer_arg0:
+                triplets.append((arg0, pred, arg1, len(arg0), len(arg1)))
+            if ent in arg1.lower() and is_answer_arg0:
+                triplets.append((arg0, pred, arg1, len(arg1), len(arg0)))
+
+            result = _collect_triplet_info(
+                triplets,
+                result,
+                match_index.mentions[index],
+                p,
+                sent_text,
+                title,
+                arg0,
+                arg1,
+            )
+
+    return result
+
+
+def _collect_triplet_info(
+    triplets: List[Tuple[str, str, str, int, int]],
+    result: DefaultDict[str, List[Any]],
+    mentions: List[Tuple[str, List[str]]],
+    p: str,
+    sent_text: str,
+    title: str,
+    arg0: str,
+    arg1: str,
+):
+    if not triplets:
+        return result
+
+    for triplet in triplets:
+        key = "\t".join(triplet[0:3])
+        result[key].append([triplet, p])
+        result[key].append((sent_text, title))
+
+        entity_dict = defaultdict(set)
+
+        for text, concepts in mentions:
+            if text not in (arg0.lower() or arg1.lower()):
+                continue
+            for concept in concepts:
+                entity_dict[text].add(concept)
+
+        result[key].append(entity_dict)
+    return result
+
 
 class ResponseCreator(PackProcessor):
-    # pylint: disable=useless-super-delegation
+    r"""Outputs the relations of the retrieved papers that answer the query
+    as the records of :func:`build_relation_records`. The records are
+    printed, or passed one at a time to `sink` if it is given.
+
+    With `incremental`, the records of a paper are output as soon as the
+    paper is processed, and an :class:`AnswerBudgetProcessor` before it
+    streams them after every chunk of annotated papers, while the next
+    chunks are still being annotated. Every answer is output once, from
+    the first paper that has it, and the other records follow when the
+    query is done.
+
+    Args:
+        sink: function called with the MultiPack of the query and each of
+            its records, instead of printing them.
+    """
+
+    def __init__(self, sink: Optional[RecordSink] = None):
+        super().__init__()
+        self.sink = sink
+
     def initialize(self, resources: Resources, configs: Config):
         super().initialize(resources, configs)
+        # The triplet keys output so far for every query, by pack_id.
+        self._streamed: Dict[int, Set[str]] = {}
+        if self.configs.incremental:
+            resources.update(**{ANSWER_STREAM_RESOURCE: self.stream_answers})
+        self.query_cache, self._owns_query_cache = acquire_query_cache(
+            resources, self.configs
+        )
 
     @classmethod
     def default_configs(cls):
@@ -45,8 +442,25 @@ class ResponseCreator(PackProcessor):
         :return: A dictionary with the default config for this processor.
         Following are the keys for this dictionary:
             - query_pack_name: the query datapack's name
+            - query_cache_path: path of the query analysis cache, the query
+                is analyzed from its annotations if it is None
+            - query_cache_size: maximum number of cached queries. The
+                first component of the pipeline opens the cache, the others
+                share it through the pipeline resources
+            - incremental: whether to output the records of every paper
+                as soon as it is processed
+            - ranked_pack_name_prefix: name prefix of the packs reranked by
+                `LexicalRerankProcessor`, to score the papers by their
+                reranked order, or None to score them by the retrieval
+                order
         """
-        return {"query_pack_name": "query"}
+        return {
+            "query_pack_name": "query",
+            "query_cache_path": None,
+            "query_cache_size": 10000,
+            "incremental": False,
+            "ranked_pack_name_prefix": None,
+        }
 
     def _process(self, input_pack: MultiPack):
         """
@@ -55,12 +469,9 @@ class ResponseCreator(PackProcessor):
         :return:
         """
         query_pack = input_pack.get_pack(self.configs.query_pack_name)
-
-        _, arg0, arg1, _, verb_lemma, is_answer_arg0 = query_preprocess(
-            query_pack
+        ent, verb_lemma, is_answer_arg0 = query_answer_target(
+            query_pack, self.query_cache
         )
-
-        ent = arg1 if is_answer_arg0 else arg0
         self._process_results(input_pack, ent, verb_lemma, is_answer_arg0)
 
     def _process_results(
@@ -81,139 +492,220 @@ class ResponseCreator(PackProcessor):
         ent = ent.lower().strip()
 
         output_relations: DefaultDict[str, List[Any]] = defaultdict(list)
-        output_concepts: DefaultDict[
-            int, Dict[str, Dict[str, Set[str]]]
-        ] = defaultdict(dict)
-        output_titles: DefaultDict[
-            int, Dict[str, Tuple[str, str]]
-        ] = defaultdict(dict)
-
-        for p, pack in enumerate(input_pack.packs):
+        output_concepts: DefaultDict[str, Dict[str, Dict[str, Set[str]]]] = (
+            defaultdict(dict)
+        )
+        output_titles: DefaultDict[str, Dict[str, Tuple[str, str]]] = (
+            defaultdict(dict)
+        )
+
+        ranks = paper_ranks(
+            input_pack,
+            self.configs.query_pack_name,
+            self.configs.ranked_pack_name_prefix,
+        )
+        budget_relations = self._pop_budget_relations(input_pack)
+        for pack in input_pack.packs:
             if pack.pack_name == self.configs.query_pack_name:
                 continue
 
-            result = self._process_datapack(
-                p, pack, ent, verb_lemma, is_answer_arg0
-            )
+            # Papers are keyed by their doc_id, which is the pack name.
+            p = pack.pack_name
+            result = budget_relations.get(pack.pack_id)
+            if result is None:
+                result = self._process_datapack(
+                    p, pack, ent, verb_lemma, is_answer_arg0
+                )
+            if self.configs.incremental:
+                self._stream_records(input_pack, p, result, ranks)
             for key, r in result.items():
                 output_relations[key] = r[0]
                 output_titles[p][key] = r[1]
                 output_concepts[p][key] = r[2]
 
-        intro_relation = "\u2022Relation:"
-        intro_source = "\u2022Source Sentence:"
-        intro_concepts = "\u2022UMLS Concepts:"
+        self._output_records(
+            input_pack,
+            build_relation_records(
+                output_relations, output_titles, output_concepts, ranks
+            ),
+        )
 
-        relations = list({x[0] for x in output_relations.values()})
-        relations.sort(key=lambda x: (x[3], x[4]))
+    def stream_answers(
+        self, input_pack: MultiPack, pack: DataPack, result: Dict[str, Any]
+    ):
+        """
+        Output the records of a paper whose answers are not output yet, as
+        the `ANSWER_STREAM_RESOURCE`.
+        :param input_pack: the MultiPack of the query
+        :param pack: the paper
+        :param result: the output of `extract_relations` for the paper
+        :return:
+        """
+        self._stream_records(
+            input_pack,
+            pack.pack_name,
+            result,
+            paper_ranks(
+                input_pack,
+                self.configs.query_pack_name,
+                self.configs.ranked_pack_name_prefix,
+            ),
+        )
 
-        for r in relations:
-            triplet = "\t".join(r[0:3])
-            paper_number = output_relations[triplet][1]
-            sentence, paper_title = output_titles[paper_number][triplet]
+    def _stream_records(
+        self,
+        input_pack: MultiPack,
+        p: str,
+        result: Dict[str, Any],
+        ranks: Dict[str, int],
+    ):
+        streamed = self._streamed.setdefault(input_pack.pack_id, set())
+        new_keys = [key for key in result if key not in streamed]
+        if not new_keys:
+            return
+        streamed.update(new_keys)
+        self._emit_records(
+            input_pack,
+            build_relation_records(
+                {key: result[key][0] for key in new_keys},
+                {p: {key: result[key][1] for key in new_keys}},
+                {p: {key: result[key][2] for key in new_keys}},
+                ranks,
+            ),
+        )
 
-            line_seperator = "=" * 80
+    def _emit_records(
+        self, input_pack: MultiPack, records: List[Dict[str, Any]]
+    ):
+        """
+        Pass records to the sink, or print them if there is no sink.
+        :param input_pack: the MultiPack of the query
+        :param records: the records made by `build_relation_records`
+        :return:
+        """
+        if self.sink is None:
+            print_records(records)
+            return
+        for record in records:
+            self.sink(input_pack, record)
+
+    def _output_records(
+        self, input_pack: MultiPack, records: List[Dict[str, Any]]
+    ):
+        """
+        Output the records of a query that are not streamed yet, they are
+        printed by default.
+        :param input_pack: the MultiPack of the query
+        :param records: the records made by `build_relation_records`
+        :return:
+        """
+        streamed = self._streamed.pop(input_pack.pack_id, set())
+        self._emit_records(
+            input_pack,
+            [
+                record
+                for record in records
+                if _record_key(record) not in streamed
+            ],
+        )
+        status = self._pop_budget_status(input_pack)
+        if status is not None and status["partial"]:
             print(
-                f"{line_seperator}\n{intro_relation}\n"
-                f"{triplet}\n{intro_source}\n"
-                f"{sentence}(From Paper: , {paper_title})\n"
-                f"{intro_concepts}"
+                f"Partial results: the {status['stop_reason']} budget was "
+                f"reached after {status['annotated_papers']} of "
+                f"{status['papers']} papers."
             )
 
-            leading = " - "
-            sep = "\n\t"
-            for umls_ent, desc in output_concepts[paper_number][
-                triplet
-            ].items():
-                info = sep.join(desc)
-                print(f"{leading}{umls_ent}{sep}{info}")
+    def _pop_budget_relations(
+        self, input_pack: MultiPack
+    ) -> Dict[int, Dict[str, List[Any]]]:
+        """
+        Take the relations of the papers that `AnswerBudgetProcessor` found
+        while annotating them.
+        :param input_pack: the MultiPack of the query
+        :return: the output of `extract_relations` for every paper, by its
+            pack_id, empty if the papers are annotated without a budget
+        """
+        if not self.resources.contains(BUDGET_STATUS_RESOURCE):
+            return {}
+        status = self.resources.get(BUDGET_STATUS_RESOURCE).get(
+            input_pack.pack_id
+        )
+        return status.pop("relations", {}) if status is not None else {}
+
+    def _pop_budget_status(
+        self, input_pack: MultiPack
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Take the answer budget status of a query.
+        :param input_pack: the MultiPack of the query
+        :return: the status set by `AnswerBudgetProcessor`, or None if the
+            papers are annotated without a budget
+        """
+        if not self.resources.contains(BUDGET_STATUS_RESOURCE):
+            return None
+        return self.resources.get(BUDGET_STATUS_RESOURCE).pop(
+            input_pack.pack_id, None
+        )
+
+    def finish(self, resource: Resources):
+        release_query_cache(resource, self.query_cache, self._owns_query_cache)
 
     def _process_datapack(
         self,
-        p: int,
+        p: str,
         pack: DataPack,
         ent: str,
         verb_lemma: str,
         is_answer_arg0: bool,
     ):
-        title = pack.get_single(entry_type=Title).text
-        result: DefaultDict[str, List[Any]] = defaultdict(list)
+        return extract_relations(p, pack, ent, verb_lemma, is_answer_arg0)
 
-        for sentence in pack.get(Sentence):
-            sent_text = sentence.text.strip()
-            if ent not in sent_text.lower():
-                continue
 
-            relations: DefaultDict[str, Dict[str, str]] = defaultdict(dict)
-            for link in pack.get(PredicateLink, sentence):
-                pred = link.get_parent().text
-
-                for token in pack.get(
-                    entry_type=Token, range_annotation=sentence
-                ):
-                    if token.text == pred and verb_lemma == token.lemma:
-                        argument = link.get_child().text
-                        relations[pred][link.arg_type] = argument
-
-            for pred, entity in relations.items():
-                triplets: List[Tuple[str, str, str, int, int]] = []
-                arg0, arg1 = get_arg_text(entity)
-
-                if not arg0 or not arg1:
-                    continue
-
-                # check the logic of triplet to filter answers
-                if ent in arg0.lower() and not is_answer_arg0:
-                    triplets.append((arg0, pred, arg1, len(arg0), len(arg1)))
-                if ent in arg1.lower() and is_answer_arg0:
-                    triplets.append((arg0, pred, arg1, len(arg1), len(arg0)))
-
-                result = self._collect_triplet_info(
-                    triplets,
-                    result,
-                    pack,
-                    sentence,
-                    p,
-                    sent_text,
-                    title,
-                    arg0,
-                    arg1,
-                )
+def _record_key(record: Dict[str, Any]) -> str:
+    return "\t".join((record["arg0"], record["predicate"], record["arg1"]))
 
-        return result
 
-    def _collect_triplet_info(
-        self,
-        triplets: List[Tuple[str, str, str, int, int]],
-        result: DefaultDict[str, List[Any]],
-        pack: DataPack,
-        sentence: Sentence,
-        p: int,
-        sent_text: str,
-        title: str,
-        arg0: str,
-        arg1: str,
+class RecordingResponseCreator(ResponseCreator):
+    r"""A :class:`ResponseCreator` that keeps the records of every query
+    instead of printing them, e.g. to answer them as JSON from a service.
+    The records are taken with :meth:`pop_records`, and the answer budget
+    status with :meth:`pop_status`, once the MultiPack has gone through the
+    pipeline. With `incremental`, the records are also streamed to `sink`
+    while the query is processed.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self._records: Dict[int, List[Dict[str, Any]]] = {}
+        self._statuses: Dict[int, Optional[Dict[str, Any]]] = {}
+
+    def _emit_records(
+        self, input_pack: MultiPack, records: List[Dict[str, Any]]
     ):
-        if not triplets:
-            return result
-
-        for triplet in triplets:
-            key = "\t".join(triplet[0:3])
-            result[key].append([triplet, p])
-            result[key].append((sent_text, title))
-
-            entity_dict = defaultdict(set)
-
-            for med_ent in pack.get(MedicalEntityMention, sentence):
-                if med_ent.text.lower() not in (arg0.lower() or arg1.lower()):
-                    continue
-                for umls in med_ent.umls_entities:
-                    sent = (
-                        f"Name: {umls.name}\t"
-                        f"CUI: {umls.cui}\t"
-                        f"Learn more at: {URL_PREFIX}{umls.cui}"
-                    )
-                    entity_dict[med_ent.text.lower()].add(sent)
+        if self.sink is not None:
+            super()._emit_records(input_pack, records)
 
-            result[key].append(entity_dict)
-        return result
+    def _output_records(
+        self, input_pack: MultiPack, records: List[Dict[str, Any]]
+    ):
+        self._streamed.pop(input_pack.pack_id, None)
+        self._records[input_pack.pack_id] = records
+        self._statuses[input_pack.pack_id] = self._pop_budget_status(input_pack)
+
+    def pop_records(self, input_pack: MultiPack) -> List[Dict[str, Any]]:
+        """
+        Take the records of a processed query.
+        :param input_pack: the MultiPack of the query
+        :return: the records made by `build_relation_records`
+        """
+        return self._records.pop(input_pack.pack_id, [])
+
+    def pop_status(self, input_pack: MultiPack) -> Optional[Dict[str, Any]]:
+        """
+        Take the answer budget status of a processed query.
+        :param input_pack: the MultiPack of the query
+        :return: the status set by `AnswerBudgetProcessor`, or None if the
+            papers are annotated without a budget
+        """
+        return self._statuses.pop(input_pack.pack_id, None)
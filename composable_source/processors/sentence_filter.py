@@ -0,0 +1,261 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A processor that reduces the retrieved papers to the sentences that can
+answer the query, before the heavy NLP models annotate them.
+"""
+# pylint: disable=attribute-defined-outside-init
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from nltk import download
+from nltk.stem import WordNetLemmatizer
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.processors.base import MultiPackProcessor
+from ft.onto.base_ontology import Document, Sentence, Title
+from composable_source.utils.passages import split_sentences
+from composable_source.utils.query_cache import (
+    acquire_query_cache,
+    cached_query_preprocess,
+    release_query_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "split_sentences",
+    "verb_pattern",
+    "verb_lemmatizer",
+    "candidate_sentences",
+    "SentenceFilterProcessor",
+]
+
+SENTENCE_DELIMITER = "\n\n"
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def verb_pattern(verb_lemma: str) -> Pattern:
+    """
+    Build a regular expression that matches the forms of a verb.
+    :param verb_lemma: the verb lemma
+    :return: the compiled expression, to search lower cased text
+    """
+    # "cause" matches "causes", "caused" and "causing", "modify" matches
+    # "modified". Irregular forms, e.g. "bound" for "bind", are left to
+    # the lemmatizer of `candidate_sentences`.
+    stem = verb_lemma.lower()
+    if len(stem) > 3 and stem[-1] in "ey":
+        stem = stem[:-1]
+    return re.compile(rf"\b{re.escape(stem)}\w*")
+
+
+def verb_lemmatizer(cache_size: int = 100000) -> Callable[[str], str]:
+    """
+    Build a function that gives the verb lemma of a word with the WordNet
+    lemmatizer, which `NLTKLemmatizer` uses for the token lemmas that
+    `ResponseCreator` compares with the query verb. The WordNet data must
+    have been downloaded.
+    :param cache_size: maximum number of cached words
+    :return: the function, from a lower cased word to its lemma
+    """
+    lemmatizer = WordNetLemmatizer()
+
+    @lru_cache(maxsize=cache_size)
+    def lemmatize(word: str) -> str:
+        return lemmatizer.lemmatize(word, "v")
+
+    return lemmatize
+
+
+def candidate_sentences(
+    text: str,
+    ent: str,
+    verb_lemma: Optional[str] = None,
+    begin: int = 0,
+    lemmatize: Optional[Callable[[str], str]] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Find the sentences that mention the query entity and, if `verb_lemma`
+    is given, a form of the query verb. Only these sentences can produce a
+    relation in `ResponseCreator`.
+    :param text: the paper text
+    :param ent: the entity in the query
+    :param verb_lemma: the verb lemma in the query, the verb is not matched
+        if it is None
+    :param begin: offset where the search starts
+    :param lemmatize: function from a lower cased word to its verb lemma,
+        e.g. :func:`verb_lemmatizer`, to match the verb forms that do not
+        share the stem of the lemma. Only the stem is matched if it is None
+    :return: list of (begin, end) offsets of the candidate sentences
+    """
+    ent = ent.lower().strip()
+    verb = verb_pattern(verb_lemma) if verb_lemma else None
+    lemma = verb_lemma.lower() if verb_lemma else None
+
+    candidates = []
+    for start, end in split_sentences(text, begin):
+        sentence = text[start:end].lower()
+        if ent not in sentence:
+            continue
+        if verb is not None and not verb.search(sentence):
+            if lemmatize is None or all(
+                lemmatize(word) != lemma
+                for word in WORD_PATTERN.findall(sentence)
+            ):
+                continue
+        candidates.append((start, end))
+    return candidates
+
+
+class SentenceFilterProcessor(MultiPackProcessor):
+    r"""Adds a reduced pack for every retrieved paper, which only holds its
+    title and the sentences that mention the query entity. The processors
+    annotating the hits then select the reduced packs, by their
+    `candidate_pack_name_prefix`, instead of the full papers. No pack is
+    added for the papers without such sentences. The reduced pack has the
+    `pack_name` of the paper, and `Title` and `Document` annotations, and
+    `Sentence` annotations with `add_sentences`.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.hit_pattern = re.compile(
+            rf"{self.configs.response_pack_name_prefix}_(\d+)$"
+        )
+        self.query_cache, self._owns_query_cache = acquire_query_cache(
+            resources, self.configs
+        )
+        self.lemmatize: Optional[Callable[[str], str]] = None
+        if self.configs.match_verb and self.configs.lemmatize_verb:
+            download("wordnet")
+            self.lemmatize = verb_lemmatizer(self.configs.lemma_cache_size)
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for SentenceFilterProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_pack_name: the query datapack's name
+            - response_pack_name_prefix: name prefix of the retrieved
+                papers, as in the search processor configs
+            - candidate_pack_name_prefix: name prefix of the reduced packs,
+                the reduced pack of `passage_3` is named `candidate_3`
+            - match_verb: whether the candidate sentences also need a form
+                of the query verb
+            - lemmatize_verb: whether to also match the verb forms that do
+                not share the stem of the query verb, e.g. "bound" for
+                "bind", with the WordNet lemmatizer. The WordNet data is
+                downloaded when the processor is initialized
+            - lemma_cache_size: maximum number of words whose lemma is
+                cached
+            - add_sentences: whether to add a `Sentence` for the title and
+                every candidate sentence, so that no later processor needs
+                to split the sentences
+            - query_cache_path: path of the query analysis cache, the query
+                is analyzed from its annotations if it is None
+            - query_cache_size: maximum number of cached queries. The
+                first component of the pipeline opens the cache, the others
+                share it through the pipeline resources
+        """
+        return {
+            "query_pack_name": "query",
+            "response_pack_name_prefix": "passage",
+            "candidate_pack_name_prefix": "candidate",
+            "match_verb": True,
+            "lemmatize_verb": True,
+            "lemma_cache_size": 100000,
+            "add_sentences": False,
+            "query_cache_path": None,
+            "query_cache_size": 10000,
+        }
+
+    def _process(self, input_pack: MultiPack):
+        query_pack = input_pack.get_pack(self.configs.query_pack_name)
+        _, arg0, arg1, _, verb_lemma, is_answer_arg0 = cached_query_preprocess(
+            query_pack, self.query_cache
+        )
+        ent = arg1 if is_answer_arg0 else arg0
+        if not self.configs.match_verb:
+            verb_lemma = None
+
+        hits = []
+        for name, pack in input_pack.iter_packs():
+            match = self.hit_pattern.match(name)
+            if match is not None:
+                hits.append((match.group(1), pack))
+
+        total_length, reduced_length = 0, 0
+        for idx, pack in hits:
+            total_length += len(pack.text)
+            reduced = self._reduce_pack(pack, ent, verb_lemma)
+            if reduced is not None:
+                input_pack.add_pack_(
+                    reduced, f"{self.configs.candidate_pack_name_prefix}_{idx}"
+                )
+                reduced_length += len(reduced.text)
+
+        logger.debug(
+            "Kept %d of %d characters of %d papers.",
+            reduced_length,
+            total_length,
+            len(hits),
+        )
+
+    def _reduce_pack(
+        self, pack: DataPack, ent: str, verb_lemma: Optional[str]
+    ) -> Optional[DataPack]:
+        """
+        Build the reduced pack of a paper.
+        :param pack: the retrieved paper
+        :param ent: entity in user's query
+        :param verb_lemma: verb lemma in user's query, or None
+        :return: the reduced pack, or None if no sentence is a candidate
+        """
+        title: Optional[Title] = next(iter(pack.get(Title)), None)
+        title_end = title.end if title is not None else 0
+        sentences = candidate_sentences(
+            pack.text, ent, verb_lemma, title_end, self.lemmatize
+        )
+        if not sentences:
+            return None
+
+        title_text = title.text if title is not None else ""
+        texts = [title_text] + [
+            pack.text[begin:end] for begin, end in sentences
+        ]
+        text = SENTENCE_DELIMITER.join(texts)
+        reduced = DataPack()
+        reduced.set_text(text)
+        reduced.pack_name = pack.pack_name
+        Document(reduced, 0, len(text))
+        if title is not None:
+            Title(reduced, 0, len(title_text))
+        if self.configs.add_sentences:
+            begin = 0
+            for sentence_text in texts:
+                if sentence_text:
+                    Sentence(reduced, begin, begin + len(sentence_text))
+                begin += len(sentence_text) + len(SENTENCE_DELIMITER)
+        reduced.add_all_remaining_entries()
+        return reduced
+
+    def finish(self, resource: Resources):
+        release_query_cache(resource, self.query_cache, self._owns_query_cache)
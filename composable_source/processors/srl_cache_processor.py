@@ -0,0 +1,275 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A wrapper processor that caches the semantic role labels of every sentence
+on disk, so that sentences seen by earlier queries skip the SRL model.
+"""
+# pylint: disable=attribute-defined-outside-init
+import hashlib
+import json
+from typing import Any, Dict, List, Tuple
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.processors.base import PackProcessor
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Token,
+)
+from composable_source.processors.batch_processor import token_batches
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+)
+from composable_source.utils.lru_cache import SQLiteLRUCache
+
+__all__ = [
+    "extract_sentence_labels",
+    "add_sentence_labels",
+    "SRLCacheProcessor",
+]
+
+# The tokens and predicate links of a sentence.
+Labels = Dict[str, List[Any]]
+
+# Configs of the wrapped processor that do not change its outputs.
+RUNTIME_CONFIG_KEYS = ("cuda_devices",)
+
+
+def extract_sentence_labels(pack: DataPack, sentence: Sentence) -> Labels:
+    """
+    Collect the tokens and predicate links of a sentence, with offsets
+    relative to the sentence.
+    :param pack: the pack of the sentence
+    :param sentence: the sentence
+    :return: dict with the `tokens` as [begin, end, pos] and the `links` as
+        [predicate begin, predicate end, argument begin, argument end,
+        arg_type]
+    """
+    offset = sentence.begin
+    tokens = [
+        [token.begin - offset, token.end - offset, token.pos]
+        for token in pack.get(Token, sentence)
+    ]
+    links = []
+    for link in pack.get(PredicateLink, sentence):
+        predicate, argument = link.get_parent(), link.get_child()
+        links.append(
+            [
+                predicate.begin - offset,
+                predicate.end - offset,
+                argument.begin - offset,
+                argument.end - offset,
+                link.arg_type,
+            ]
+        )
+    return {"tokens": tokens, "links": links}
+
+
+def add_sentence_labels(pack: DataPack, sentence: Sentence, labels: Labels):
+    """
+    Add the tokens and predicate links collected by
+    :func:`extract_sentence_labels` to a sentence.
+    :param pack: the pack of the sentence
+    :param sentence: the sentence
+    :param labels: the labels of a sentence with the same text
+    :return:
+    """
+    offset = sentence.begin
+    for begin, end, pos in labels["tokens"]:
+        token = Token(pack, offset + begin, offset + end)
+        if pos is not None:
+            token.pos = pos
+
+    predicates: Dict[int, PredicateMention] = {}
+    for pred_begin, pred_end, arg_begin, arg_end, arg_type in labels["links"]:
+        if pred_begin not in predicates:
+            predicates[pred_begin] = PredicateMention(
+                pack, offset + pred_begin, offset + pred_end
+            )
+        argument = PredicateArgument(pack, offset + arg_begin, offset + arg_end)
+        link = PredicateLink(pack, predicates[pred_begin], argument)
+        link.arg_type = arg_type
+
+
+class SRLCacheProcessor(ConcurrentPackProcessor):
+    r"""Wraps an SRL processor, e.g. the OpenIE `AllenNLPProcessor`, and
+    caches the tokens and predicate links it creates for every sentence.
+    The cache is keyed by a hash of the sentence text, the wrapped
+    processor and its configs, which include the model URL. Only the
+    sentences missing from the cache are copied into a scratch pack for the
+    wrapped processor, then the labels of every sentence are added to the
+    pack from the cache. Without a cache path every sentence is labeled,
+    which still allows the wrapped processor to run in a
+    :class:`ParallelProcessor`. In a :class:`BatchedProcessor`, a scratch
+    pack holds the sentences of several packs.
+
+    Args:
+        processor: the wrapped processor, it annotates the `Sentence`
+            entries of a pack.
+    """
+
+    def __init__(self, processor: PackProcessor):
+        super().__init__()
+        self.processor = processor
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        processor_configs = self.processor.make_configs(
+            self.configs.processor.todict() if self.configs.processor else {}
+        )
+        self.processor.initialize(resources, processor_configs)
+
+        fingerprint = {
+            key: value
+            for key, value in processor_configs.todict().items()
+            if key not in RUNTIME_CONFIG_KEYS
+        }
+        processor_class = type(self.processor)
+        fingerprint["processor"] = (
+            f"{processor_class.__module__}.{processor_class.__qualname__}"
+        )
+        self.fingerprint = json.dumps(fingerprint, sort_keys=True)
+        self.cache = (
+            SQLiteLRUCache(
+                self.configs.srl_cache_path,
+                self.configs.srl_cache_size,
+                table="srl",
+            )
+            if self.configs.srl_cache_path
+            else None
+        )
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for SRLCacheProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - srl_cache_path: path of the cache file, nothing is cached if
+                it is None
+            - srl_cache_size: maximum number of cached sentences
+            - max_batch_tokens: maximum number of tokens of the sentences
+                labeled by one run of the wrapped processor, all the
+                uncached sentences are labeled at once if None
+            - processor: configs of the wrapped processor
+        """
+        return {
+            "srl_cache_path": None,
+            "srl_cache_size": 1000000,
+            "max_batch_tokens": None,
+            "processor": None,
+        }
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{self.fingerprint}\n{text}".encode("utf-8")
+        ).hexdigest()
+
+    def compute(
+        self, input_pack: DataPack
+    ) -> List[Tuple[Tuple[int, int], Labels]]:
+        """
+        Look up or compute the labels of every sentence of the pack.
+        :param input_pack: the pack
+        :return: the span and the labels of every sentence
+        """
+        return self.compute_batch([input_pack])[0]
+
+    def compute_batch(
+        self, input_packs: List[DataPack]
+    ) -> List[List[Tuple[Tuple[int, int], Labels]]]:
+        """
+        Look up the labels of the sentences of all the packs, and compute
+        the missing ones in batches of at most `max_batch_tokens` tokens.
+        :param input_packs: the packs
+        :return: the span and the labels of every sentence of every pack
+        """
+        pack_sentences = [list(pack.get(Sentence)) for pack in input_packs]
+        pack_keys = [
+            [self._key(sentence.text) for sentence in sentences]
+            for sentences in pack_sentences
+        ]
+        labels = (
+            self.cache.get_many({key for keys in pack_keys for key in keys})
+            if self.cache is not None
+            else {}
+        )
+
+        missing: Dict[str, str] = {}
+        for sentences, keys in zip(pack_sentences, pack_keys):
+            for sentence, key in zip(sentences, keys):
+                if key not in labels:
+                    missing[key] = sentence.text
+        missing_keys, texts = list(missing.keys()), list(missing.values())
+        for batch in token_batches(texts, self.configs.max_batch_tokens):
+            keys = [missing_keys[index] for index in batch]
+            new_labels = self._label([texts[index] for index in batch])
+            labels.update(zip(keys, new_labels))
+            if self.cache is not None:
+                self.cache.put_many(zip(keys, new_labels))
+        return [
+            [
+                ((sentence.begin, sentence.end), labels[key])
+                for sentence, key in zip(sentences, keys)
+            ]
+            for sentences, keys in zip(pack_sentences, pack_keys)
+        ]
+
+    def write(
+        self,
+        input_pack: DataPack,
+        result: List[Tuple[Tuple[int, int], Labels]],
+    ):
+        # The sentences are found by their span, since the result may have
+        # been computed on a copy of the pack in a worker process.
+        sentences = {
+            (sentence.begin, sentence.end): sentence
+            for sentence in input_pack.get(Sentence)
+        }
+        for span, labels in result:
+            add_sentence_labels(input_pack, sentences[tuple(span)], labels)
+
+    def after_fork(self):
+        if self.cache is not None:
+            self.cache.reopen()
+
+    def _label(self, texts: List[str]) -> List[Labels]:
+        """
+        Run the wrapped processor on a scratch pack with the sentences.
+        :param texts: the sentence texts
+        :return: the labels of every sentence
+        """
+        scratch = DataPack()
+        scratch.set_text("\n".join(texts))
+        begin = 0
+        for text in texts:
+            Sentence(scratch, begin, begin + len(text))
+            begin += len(text) + 1
+        scratch.add_all_remaining_entries()
+
+        self.processor.process(scratch)
+        scratch.add_all_remaining_entries()
+        return [
+            extract_sentence_labels(scratch, sentence)
+            for sentence in scratch.get(Sentence)
+        ]
+
+    def finish(self, resource: Resources):
+        self.processor.finish(resource)
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,212 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Processors that build and query an offline triplet index, so that queries
+can be answered without running SRL over the retrieved papers.
+"""
+# pylint: disable=attribute-defined-outside-init
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, List, Set, Tuple
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.processors.base import PackProcessor
+from ft.onto.base_ontology import Token, Sentence, PredicateLink, Title
+from ftx.onto.clinical import MedicalEntityMention
+from composable_source.processors.response_creator import (
+    ResponseCreator,
+    build_relation_records,
+    format_umls_concept,
+)
+from composable_source.utils.triplet_index import TripletIndex
+from composable_source.utils.utils import get_arg_text
+
+__all__ = [
+    "TripletIndexProcessor",
+    "TripletSearchResponseCreator",
+]
+
+
+class TripletIndexProcessor(PackProcessor):
+    r"""Extracts every (arg0, predicate, arg1) triplet of an annotated paper
+    and adds it to a :class:`TripletIndex`. The pack is expected to carry the
+    same annotations as the hit packs of the search pipeline: sentences,
+    tokens with lemmas, SRL `PredicateLink` and `MedicalEntityMention`.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.index = TripletIndex(self.configs.index_path)
+        self._num_packs = 0
+
+    @classmethod
+    def default_configs(cls):
+        """
+        This defines a basic config structure for TripletIndexProcessor.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - index_path: path of the triplet index file
+            - commit_interval: number of packs between two commits
+        """
+        return {"index_path": "triplet_index.db", "commit_interval": 100}
+
+    def _process(self, input_pack: DataPack):
+        title = input_pack.get_single(entry_type=Title).text
+
+        for sentence in input_pack.get(Sentence):
+            lemmas = {
+                token.text: token.lemma
+                for token in input_pack.get(
+                    entry_type=Token, range_annotation=sentence
+                )
+            }
+
+            relations: DefaultDict[str, Dict[str, str]] = defaultdict(dict)
+            for link in input_pack.get(PredicateLink, sentence):
+                pred = link.get_parent().text
+                relations[pred][link.arg_type] = link.get_child().text
+
+            for pred, entity in relations.items():
+                arg0, arg1 = get_arg_text(entity)
+                if not arg0 or not arg1:
+                    continue
+
+                self.index.add(
+                    doc_id=input_pack.pack_name,
+                    title=title,
+                    sentence=sentence.text.strip(),
+                    sent_span=(sentence.begin, sentence.end),
+                    triplet=(arg0, pred, arg1),
+                    verb_lemma=lemmas.get(pred),
+                    concepts=self._collect_concepts(
+                        input_pack, sentence, arg0, arg1
+                    ),
+                )
+
+        self._num_packs += 1
+        if self._num_packs % self.configs.commit_interval == 0:
+            self.index.commit()
+
+    @staticmethod
+    def _collect_concepts(
+        pack: DataPack, sentence: Sentence, arg0: str, arg1: str
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        concepts: Dict[str, List[Tuple[str, str]]] = {}
+        arguments = (arg0.lower(), arg1.lower())
+        for med_ent in pack.get(MedicalEntityMention, sentence):
+            text = med_ent.text.lower()
+            if not any(text in argument for argument in arguments):
+                continue
+            for umls in med_ent.umls_entities:
+                concept = (umls.name, umls.cui)
+                if concept not in concepts.setdefault(text, []):
+                    concepts[text].append(concept)
+        return concepts
+
+    def finish(self, resource: Resources):
+        self.index.close()
+
+
+class TripletSearchResponseCreator(ResponseCreator):
+    r"""A :class:`ResponseCreator` that answers the query by looking up a
+    :class:`TripletIndex` built offline by :class:`TripletIndexProcessor`,
+    instead of matching the SRL output of the retrieved papers.
+    """
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.index = TripletIndex(self.configs.index_path)
+
+    @classmethod
+    def default_configs(cls):
+        """
+        This defines a basic config structure for TripletSearchResponseCreator.
+        :return: A dictionary with the default config for this processor.
+        Following are the keys for this dictionary:
+            - query_pack_name: the query datapack's name
+            - index_path: path of the triplet index file
+            - size: maximum number of triplets returned for a query, the
+                ones stated by the most papers are kept
+        """
+        config = super().default_configs()
+        config.update({"index_path": "triplet_index.db", "size": 1000})
+        return config
+
+    def _process_results(
+        self,
+        input_pack: MultiPack,
+        ent: str,
+        verb_lemma: str,
+        is_answer_arg0=True,
+    ):
+        """
+        Output relations found in the triplet index
+        :param input_pack: MultiPack
+        :param ent: entity in user's query
+        :param verb_lemma: verb lemma in user's query
+        :param is_answer_arg0: if the answer is arg0 or arg1, bool
+        :return:
+        """
+        if is_answer_arg0 is None or not verb_lemma:
+            return
+
+        ent = ent.lower().strip()
+        ent_field = "arg1" if is_answer_arg0 else "arg0"
+        answer_field = "arg0" if is_answer_arg0 else "arg1"
+
+        output_relations: Dict[str, List[Any]] = {}
+        output_titles: DefaultDict[str, Dict[str, Tuple[str, str]]] = (
+            defaultdict(dict)
+        )
+        output_concepts: DefaultDict[str, Dict[str, Dict[str, Set[str]]]] = (
+            defaultdict(dict)
+        )
+
+        for record in self.index.search(
+            verb_lemma, ent, ent_field, limit=self.configs.size
+        ):
+            if ent not in record["sentence"].lower():
+                continue
+
+            triplet = (
+                record["arg0"],
+                record["predicate"],
+                record["arg1"],
+                len(record[ent_field]),
+                len(record[answer_field]),
+            )
+            key = "\t".join(triplet[0:3])
+            doc_id = record["doc_id"]
+
+            output_relations[key] = [triplet, doc_id]
+            output_titles[doc_id][key] = (record["sentence"], record["title"])
+            # Same as ResponseCreator, only concepts of arg0 are shown.
+            output_concepts[doc_id][key] = {
+                text: {format_umls_concept(name, cui) for name, cui in umls}
+                for text, umls in record["concepts"].items()
+                if text in record["arg0"].lower()
+            }
+
+        self._output_records(
+            input_pack,
+            build_relation_records(
+                output_relations, output_titles, output_concepts
+            ),
+        )
+
+    def finish(self, resource: Resources):
+        super().finish(resource)
+        self.index.close()
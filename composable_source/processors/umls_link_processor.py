@@ -0,0 +1,69 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A candidate generator for the scispacy UMLS entity linker that looks up the
+candidates of every mention text in a :class:`UMLSLinkCache` before
+searching them.
+"""
+from typing import Any, List
+
+from scispacy.candidate_generation import MentionCandidate
+from composable_source.utils.umls_link_cache import UMLSLinkCache
+
+__all__ = ["CachedCandidateGenerator"]
+
+
+class CachedCandidateGenerator:
+    r"""Wraps the candidate generator of a scispacy `EntityLinker`, which
+    searches the UMLS concepts of the mentions with a TF-IDF character
+    n-gram ANN index. Only the mentions missing from `cache` are searched.
+
+    Args:
+        generator: the candidate generator of the linker.
+        cache: the cache of the candidates.
+    """
+
+    def __init__(self, generator: Any, cache: UMLSLinkCache):
+        self.generator = generator
+        self.cache = cache
+
+    def __call__(
+        self, mention_texts: List[str], k: int
+    ) -> List[List[MentionCandidate]]:
+        found = self.cache.get_many(mention_texts, k)
+        missing = list(
+            dict.fromkeys(text for text in mention_texts if text not in found)
+        )
+        if missing:
+            searched = [
+                (
+                    text,
+                    [
+                        [
+                            candidate.concept_id,
+                            list(candidate.aliases),
+                            [float(x) for x in candidate.similarities],
+                        ]
+                        for candidate in candidates
+                    ],
+                )
+                for text, candidates in zip(missing, self.generator(missing, k))
+            ]
+            self.cache.put_many(searched, k)
+            found.update(searched)
+
+        return [
+            [MentionCandidate(*candidate) for candidate in found[text]]
+            for text in mention_texts
+        ]
@@ -16,3 +16,4 @@ from composable_source.readers.financial_news_reader import *
 from composable_source.readers.med_mentions_reader import *
 from composable_source.readers.conll03_reader import *
 from composable_source.readers.conll03_aida_reader import *
+from composable_source.readers.multi_pack_list_reader import *
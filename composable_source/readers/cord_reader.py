@@ -17,14 +17,15 @@ The reader that reads CORD_NERD data into Datapacks.
 import os
 import logging
 import json
-from typing import Any, Iterator
+from typing import Any, Dict, Iterator, List
 
+from forte.common.exception import ProcessorConfigError
 from forte.data.data_pack import DataPack
 from forte.data.data_utils_io import dataset_path_iterator
 from forte.data.base_reader import PackReader
 from ft.onto.base_ontology import Document, Title
 from ftx.onto.clinical import MedicalEntityMention
-from onto.cord19research import Abstract, Body
+from onto.cord19research import Abstract, Body, Passage
 
 __all__ = ["CORDNERDReader", "CORDReader"]
 
@@ -131,10 +132,15 @@ class CORDReader(PackReader):
     def _parse_pack(self, file_path: str) -> Iterator[DataPack]:
         logging.info("Start Processing %s.", file_path)
 
-        pack = DataPack()
         with open(file_path) as file:
             json_text = json.load(file)
 
+            paper_name = os.path.splitext(os.path.basename(file_path))[0]
+            if self.configs.passage_unit:
+                yield from self._parse_passages(json_text, paper_name)
+                return
+
+            pack = DataPack()
             title = json_text["metadata"]["title"]
             abstract = ""
             for entry in json_text["abstract"]:
@@ -159,7 +165,65 @@ class CORDReader(PackReader):
                 pack, len(title) + 2 * len(delimiter) + len(abstract), len(text)
             )
 
-            pack.pack_name = os.path.splitext(os.path.basename(file_path))[0]
+            pack.pack_name = paper_name
+            yield pack
+
+    def _parse_passages(
+        self, json_text: Dict[str, Any], paper_name: str
+    ) -> Iterator[DataPack]:
+        """
+        Split a paper into a pack per paragraph, or per section with
+        `passage_unit` set to `section`. The text of a pack is the title and
+        the passage, separated by a blank line as in the packs of whole
+        papers, the passage is annotated as `Abstract` or `Body`, and as a
+        `Passage` with its paper, its section and its offsets in the text of
+        the whole paper.
+        :param json_text: the paper
+        :param paper_name: the pack name of the whole paper
+        :return: iterator over the packs of the passages
+        """
+        if self.configs.passage_unit not in ("paragraph", "section"):
+            raise ProcessorConfigError(
+                f"Unknown passage unit {self.configs.passage_unit}, it "
+                f"should be paragraph or section."
+            )
+        title = json_text["metadata"]["title"]
+        delimiter = "\n\n"
+
+        # [part, section, begin, text] of every passage, the offsets are the
+        # ones of the text of the whole paper.
+        passages: List[List[Any]] = []
+        begin = len(title) + len(delimiter)
+        for part, key in ((Abstract, "abstract"), (Body, "body_text")):
+            for entry in json_text[key]:
+                section = entry.get("section") or ""
+                if (
+                    self.configs.passage_unit == "section"
+                    and passages
+                    and passages[-1][:2] == [part, section]
+                ):
+                    passages[-1][3] += entry["text"]
+                else:
+                    passages.append([part, section, begin, entry["text"]])
+                begin += len(entry["text"])
+            begin += len(delimiter)
+
+        for index, (part, section, begin, passage) in enumerate(passages):
+            if not passage.strip():
+                continue
+            pack = DataPack()
+            text = title + delimiter + passage
+            pack.set_text(text)
+            Document(pack, 0, len(text))
+            Title(pack, 0, len(title))
+            part(pack, len(title) + len(delimiter), len(text))
+            annotation = Passage(pack, len(title) + len(delimiter), len(text))
+            annotation.paper_id = paper_name
+            annotation.section = section
+            annotation.paper_begin = begin
+            annotation.paper_end = begin + len(passage)
+
+            pack.pack_name = f"{paper_name}_{index}"
             yield pack
 
     @classmethod
@@ -173,5 +237,8 @@ class CORDReader(PackReader):
 
             - file_ext: define the file extension that the processor
             should process.
+            - passage_unit: None to read every paper into a pack, or
+            `paragraph` or `section` to read every paragraph or section
+            of the papers into a pack.
         """
-        return {"file_ext": ".json"}
+        return {"file_ext": ".json", "passage_unit": None}
@@ -0,0 +1,45 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The reader that passes MultiPacks already in memory to a pipeline.
+"""
+from typing import Iterable, Iterator
+
+from forte.data.base_reader import MultiPackReader
+from forte.data.multi_pack import MultiPack
+
+__all__ = ["MultiPackListReader"]
+
+
+class MultiPackListReader(MultiPackReader):
+    r""":class:`MultiPackListReader` reads MultiPacks that are already in
+    memory, e.g. to run a second pipeline over the outputs of a first one.
+    The MultiPacks are passed as they are, so the processors of the
+    pipeline annotate them in place.
+    """
+
+    def _collect(  # type: ignore
+        self, m_packs: Iterable[MultiPack]
+    ) -> Iterator[MultiPack]:
+        r"""Should be called with an iterable of MultiPacks.
+
+        Args:
+            m_packs: the MultiPacks.
+
+        Returns: Iterator over the MultiPacks.
+        """
+        yield from m_packs
+
+    def _parse_pack(self, m_pack: MultiPack) -> Iterator[MultiPack]:
+        yield m_pack
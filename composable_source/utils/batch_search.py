@@ -0,0 +1,192 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Batches of queries: the papers retrieved by a batch, so that every paper is
+annotated once however many queries retrieve it, and the processing of the
+queries with long-lived pipelines, so that a failing query only fails
+itself.
+"""
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Tuple
+
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.pipeline import Pipeline
+from composable_source.utils.utils import QueryAnalysisError
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "read_queries",
+    "process_all",
+    "process_queries",
+    "SharedPapers",
+    "annotate_batch",
+]
+
+
+def read_queries(path: str) -> Iterator[str]:
+    """
+    Read the queries of a file.
+    :param path: the file, with one query per line
+    :return: iterator over the queries, without the blank lines
+    """
+    with open(path, "r", encoding="utf8") as file:
+        for line in file:
+            query = line.strip()
+            if query:
+                yield query
+
+
+def process_all(nlp: Pipeline, inputs: List[Any]) -> List[Any]:
+    """
+    Process inputs with a long-lived pipeline. Forte keeps the job of a
+    pack that fails queued, so every later `process_dataset` call of the
+    pipeline would raise the same exception. The jobs of the inputs are
+    dropped when they fail, the components, and their models, are kept.
+    :param nlp: an initialized pipeline, which processes nothing else
+        meanwhile
+    :param inputs: the inputs of the reader of the pipeline
+    :return: the packs of the inputs, in the order of the inputs
+    """
+    try:
+        return list(nlp.process_dataset(inputs))
+    except Exception:
+        # pylint: disable=protected-access
+        nlp._proc_mgr.reset()
+        raise
+
+
+def process_queries(
+    nlp: Pipeline, queries: List[str]
+) -> Tuple[List[Any], Dict[int, str]]:
+    """
+    Process queries with a pipeline that analyzes them first. The queries
+    are processed one at a time, so that a query that cannot be analyzed
+    fails before the processors after the analysis run, and only its job
+    is dropped. Forte runs the packs through the pipeline one after the
+    other anyway, as long as no batch processor waits for several.
+    :param nlp: an initialized pipeline that reads the queries
+    :param queries: the queries
+    :return: the packs of the queries that are analyzed, in the order of
+        the queries, and the error of every other query by its index in
+        `queries`
+    """
+    packs: List[Any] = []
+    errors: Dict[int, str] = {}
+    for idx, query in enumerate(queries):
+        try:
+            packs.extend(process_all(nlp, [query]))
+        except QueryAnalysisError as e:
+            logger.warning("Cannot analyze %r: %s", query, e)
+            errors[idx] = str(e)
+    return packs, errors
+
+
+class SharedPapers:
+    r"""The unique papers among the hits of a batch of queries. The hits
+    are the packs of the query MultiPacks whose names match
+    `pack_name_pattern`. Two hits with the same `pack_name` and the same
+    text are the same paper, so the candidate sentences that the sentence
+    filter keeps for different queries are different papers. The first hit
+    of every paper is kept, to be annotated in :meth:`multi_pack`, and the
+    queries are then answered from the kept hits, see
+    :meth:`query_multi_pack`.
+
+    Args:
+        pack_name_pattern: regular expression of the names of the hits.
+    """
+
+    def __init__(self, pack_name_pattern: str):
+        self.pattern = re.compile(pack_name_pattern)
+        self._papers: Dict[Tuple[str, str], DataPack] = {}
+        self.num_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._papers)
+
+    def add(self, input_pack: MultiPack):
+        """
+        Add the hits of a query.
+        :param input_pack: the MultiPack of the query
+        :return:
+        """
+        for name, pack in input_pack.iter_packs():
+            if self.pattern.match(name):
+                self._papers.setdefault((pack.pack_name, pack.text), pack)
+                self.num_hits += 1
+
+    def multi_pack(self, pack_name_prefix: str) -> MultiPack:
+        """
+        Put the unique papers together, e.g. for a pipeline annotating
+        them to read with `MultiPackListReader`.
+        :param pack_name_prefix: the papers are named with this prefix
+            and their index, so that they match `pack_name_pattern`
+        :return: a MultiPack with the unique papers, the annotations of
+            which are shared with the query MultiPacks
+        """
+        m_pack = MultiPack()
+        for idx, pack in enumerate(self._papers.values()):
+            m_pack.add_pack_(pack, f"{pack_name_prefix}_{idx}")
+        return m_pack
+
+    def query_multi_pack(self, input_pack: MultiPack) -> MultiPack:
+        """
+        Get the MultiPack of a query with its hits replaced by the kept
+        ones, e.g. for a pipeline answering the query to read with
+        `MultiPackListReader`.
+        :param input_pack: the MultiPack of the query
+        :return: a MultiPack with the packs of the query MultiPack, under
+            the same names
+        """
+        m_pack = MultiPack()
+        for name, pack in input_pack.iter_packs():
+            if self.pattern.match(name):
+                pack = self._papers.get((pack.pack_name, pack.text), pack)
+            m_pack.add_pack_(pack, name)
+        return m_pack
+
+
+def annotate_batch(
+    retrieval: Pipeline,
+    annotation: Pipeline,
+    queries: List[str],
+    hit_prefix: str,
+) -> Tuple[List[MultiPack], Dict[int, str]]:
+    """
+    Retrieve the papers of a batch of queries, and annotate the unique
+    papers of all of them together, so that every model runs once over the
+    papers of the batch. The queries that cannot be analyzed retrieve
+    nothing, see :func:`process_queries`.
+    :param retrieval: a pipeline that reads a query, analyzes it and
+        yields its MultiPack, with the hits named by `hit_prefix` and their
+        index
+    :param annotation: a pipeline that reads a MultiPack with
+        `MultiPackListReader` and annotates its hits
+    :param queries: the queries
+    :param hit_prefix: the name prefix of the hits
+    :return: the MultiPack of every query that is analyzed, with its
+        annotated papers, in the order of the queries, and the error of
+        every other query by its index in `queries`
+    """
+    m_packs, errors = process_queries(retrieval, queries)
+    papers = SharedPapers(rf"{hit_prefix}_\d")
+    for m_pack in m_packs:
+        papers.add(m_pack)
+    logger.info(
+        "Annotating %d unique papers of %d hits.", len(papers), papers.num_hits
+    )
+    process_all(annotation, [papers.multi_pack(hit_prefix)])
+    return [papers.query_multi_pack(m_pack) for m_pack in m_packs], errors
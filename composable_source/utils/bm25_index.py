@@ -0,0 +1,497 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+An in-process BM25 index, a stand-in for Elasticsearch when no search server
+is available. Postings and term positions are kept as sparse (CSR) NumPy
+arrays on disk and memory-mapped at search time.
+"""
+import heapq
+import json
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from composable_source.utils.document_store import DocumentStore
+from composable_source.utils.passages import highlight_fragments
+
+__all__ = ["analyze", "BM25Index", "BM25IndexBuilder"]
+
+META_FILE = "meta.json"
+DOCUMENT_FILE = "documents.db"
+
+_TOKEN = re.compile(r"\w+")
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Split text into lower cased word tokens, close to what the standard
+    analyzer of Elasticsearch does.
+    :param text: text to analyze
+    :return: list of tokens in text order
+    """
+    return _TOKEN.findall(text.lower())
+
+
+class BM25IndexBuilder:
+    r"""Collects the documents of a corpus and writes them as a
+    :class:`BM25Index` into `index_dir`. Documents go to disk as they come,
+    the postings are kept in memory and written by :meth:`build`, so the
+    builder is meant for test and small corpora.
+
+    Args:
+        index_dir: the directory of the index.
+        field: the document field to index, searched by default.
+        extra_fields: other document fields to index. They can be searched
+            but are not stored with the documents, to save space.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        field: str = "content",
+        extra_fields: Sequence[str] = (),
+    ):
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_dir = index_dir
+        self.field = field
+        self.extra_fields = list(extra_fields)
+        self._documents = DocumentStore(os.path.join(index_dir, DOCUMENT_FILE))
+        self._documents.clear()
+        self._num_docs = 0
+        self._postings: Dict[str, Dict[str, List[Tuple[int, List[int]]]]] = {
+            name: defaultdict(list) for name in [field] + self.extra_fields
+        }
+        self._doc_lens: Dict[str, List[int]] = {
+            name: [] for name in self._postings
+        }
+
+    def add(self, documents: List[Dict[str, str]]):
+        """
+        Add documents to the index.
+        :param documents: list of dicts with `doc_id`, the indexed fields
+            and optionally `pack_info` values
+        :return:
+        """
+        self._documents.add(
+            self._num_docs,
+            [
+                {
+                    key: value
+                    for key, value in document.items()
+                    if key not in self.extra_fields
+                }
+                for document in documents
+            ],
+        )
+        for document in documents:
+            row = self._num_docs
+            for field, postings in self._postings.items():
+                tokens = analyze(document.get(field) or "")
+                term_positions: Dict[str, List[int]] = defaultdict(list)
+                for position, token in enumerate(tokens):
+                    term_positions[token].append(position)
+                for term, positions in term_positions.items():
+                    postings[term].append((row, positions))
+                self._doc_lens[field].append(len(tokens))
+            self._num_docs += 1
+
+    def build(self):
+        """
+        Write the postings of all documents as CSR arrays.
+        """
+        self._documents.close()
+
+        vocabs = {field: self._build_field(field) for field in self._postings}
+        with open(os.path.join(self.index_dir, META_FILE), "w") as f:
+            json.dump(
+                {
+                    "field": self.field,
+                    "vocab": vocabs[self.field],
+                    "extra_fields": {
+                        field: vocabs[field] for field in self.extra_fields
+                    },
+                },
+                f,
+            )
+
+    def _build_field(self, field: str) -> Dict[str, int]:
+        """
+        Write the postings of a field.
+        :param field: the field
+        :return: the vocabulary of the field, the id of every term
+        """
+        postings = self._postings[field]
+        terms = sorted(postings)
+        term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        post_docs: List[int] = []
+        post_tfs: List[int] = []
+        pos_ptr: List[int] = [0]
+        positions: List[int] = []
+        for term_id, term in enumerate(terms):
+            for row, term_positions in postings[term]:
+                post_docs.append(row)
+                post_tfs.append(len(term_positions))
+                positions.extend(term_positions)
+                pos_ptr.append(len(positions))
+            term_ptr[term_id + 1] = len(post_docs)
+
+        arrays = {
+            "term_ptr": term_ptr,
+            "post_docs": np.asarray(post_docs, dtype=np.int32),
+            "post_tfs": np.asarray(post_tfs, dtype=np.int32),
+            "pos_ptr": np.asarray(pos_ptr, dtype=np.int64),
+            "positions": np.asarray(positions, dtype=np.int32),
+            "doc_lens": np.asarray(self._doc_lens[field], dtype=np.int32),
+        }
+        prefix = _array_prefix(field, self.field)
+        for name, array in arrays.items():
+            np.save(os.path.join(self.index_dir, f"{prefix}{name}.npy"), array)
+        return {term: i for i, term in enumerate(terms)}
+
+
+def _array_prefix(field: str, default_field: str) -> str:
+    # The arrays of the default field have no prefix, as in the indexes of
+    # a single field.
+    return "" if field == default_field else f"{field}."
+
+
+def _sloppy_frequency(offsets: Sequence[np.ndarray], slop: int) -> float:
+    r"""Phrase frequency in the way of Lucene's sloppy phrase matching.
+    `offsets[i]` are the positions of the i-th query term minus i, a match
+    is one offset from each term whose spread is at most `slop`, and counts
+    `1 / (1 + spread)`."""
+    heap = [(int(values[0]), i, 0) for i, values in enumerate(offsets)]
+    heapq.heapify(heap)
+    high = max(value for value, _, _ in heap)
+    frequency = 0.0
+    while True:
+        low, i, j = heapq.heappop(heap)
+        spread = high - low
+        if spread <= slop:
+            frequency += 1.0 / (1.0 + spread)
+        if j + 1 == len(offsets[i]):
+            return frequency
+        value = int(offsets[i][j + 1])
+        high = max(high, value)
+        heapq.heappush(heap, (value, i, j + 1))
+
+
+def _required_matches(num_terms: int, minimum_should_match: Any) -> int:
+    """
+    Number of query terms a document needs to match, following the
+    Elasticsearch `minimum_should_match` syntax for integers and
+    percentages, e.g. `2`, `-1`, `"75%"` or `"-25%"`.
+    :param num_terms: number of distinct query terms
+    :param minimum_should_match: the option of the query, or None
+    :return: the number of terms
+    """
+    if minimum_should_match is None:
+        return 1
+    value = str(minimum_should_match).strip()
+    if value.endswith("%"):
+        count = int(num_terms * abs(float(value[:-1])) / 100)
+    else:
+        count = abs(int(value))
+    required = num_terms - count if value.startswith("-") else count
+    return min(max(required, 1), num_terms)
+
+
+class _FieldIndex:
+    r"""The postings of a field of a :class:`BM25Index`, memory-mapped from
+    the arrays written by :class:`BM25IndexBuilder`."""
+
+    def __init__(
+        self,
+        index_dir: str,
+        prefix: str,
+        vocab: Dict[str, int],
+        k1: float,
+        b: float,
+    ):
+        self.vocab = vocab
+        self.k1 = k1
+        self.b = b
+
+        def load(name: str) -> np.ndarray:
+            return np.load(
+                os.path.join(index_dir, f"{prefix}{name}.npy"), mmap_mode="r"
+            )
+
+        self.term_ptr = load("term_ptr")
+        self.post_docs = load("post_docs")
+        self.post_tfs = load("post_tfs")
+        self.pos_ptr = load("pos_ptr")
+        self.positions = load("positions")
+        self.doc_lens = load("doc_lens")
+        self.avg_doc_len = (
+            float(self.doc_lens.mean()) if len(self.doc_lens) else 0.0
+        )
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray, slice]:
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            empty = np.zeros(0, dtype=np.int32)
+            return empty, empty, slice(0, 0)
+        span = slice(self.term_ptr[term_id], self.term_ptr[term_id + 1])
+        return self.post_docs[span], self.post_tfs[span], span
+
+    def tf_norm(self, tfs: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        norm = self.k1 * (
+            1.0 - self.b + self.b * self.doc_lens[rows] / self.avg_doc_len
+        )
+        return tfs / (tfs + norm)
+
+
+class BM25Index:
+    r"""A BM25 index built by :class:`BM25IndexBuilder`. It answers the
+    query dicts of `ElasticSearchQueryCreator` and returns results in the
+    format of the Elasticsearch search API, so it can stand in for the
+    Elasticsearch indexer. Supported queries are `match_phrase` with `slop`
+    and `match` with `minimum_should_match` over any indexed field,
+    optionally rescored by a `match_phrase` query, and the hits can be
+    highlighted.
+
+    Args:
+        index_dir: the directory of the index.
+        k1: BM25 term frequency saturation.
+        b: BM25 document length normalization.
+    """
+
+    def __init__(self, index_dir: str, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        with open(os.path.join(index_dir, META_FILE)) as f:
+            meta = json.load(f)
+        self.field: str = meta["field"]
+        vocabs = {self.field: meta["vocab"], **meta.get("extra_fields", {})}
+        self._fields = {
+            field: _FieldIndex(
+                index_dir, _array_prefix(field, self.field), vocab, k1, b
+            )
+            for field, vocab in vocabs.items()
+        }
+        self._documents = DocumentStore(os.path.join(index_dir, DOCUMENT_FILE))
+
+    def __len__(self) -> int:
+        return len(self._fields[self.field].doc_lens)
+
+    @property
+    def fields(self) -> List[str]:
+        """The indexed fields, the default one first."""
+        return list(self._fields)
+
+    def _idf(self, doc_freq: int) -> float:
+        return float(
+            np.log(1.0 + (len(self) - doc_freq + 0.5) / (doc_freq + 0.5))
+        )
+
+    def _match_scores(
+        self,
+        field: str,
+        terms: List[str],
+        minimum_should_match: Any = None,
+    ) -> Dict[int, float]:
+        index = self._fields[field]
+        unique_terms = set(terms)
+        required = _required_matches(len(unique_terms), minimum_should_match)
+        scores = np.zeros(len(self), dtype=np.float64)
+        matched = np.zeros(len(self), dtype=np.int32)
+        for term in unique_terms:
+            rows, tfs, _ = index.postings(term)
+            if len(rows) == 0:
+                continue
+            scores[rows] += self._idf(len(rows)) * index.tf_norm(tfs, rows)
+            matched[rows] += 1
+        return {
+            int(row): float(scores[row])
+            for row in np.flatnonzero(matched >= max(required, 1))
+        }
+
+    def _phrase_scores(
+        self,
+        field: str,
+        terms: List[str],
+        slop: int,
+        within: Optional[Sequence[int]] = None,
+    ) -> Dict[int, float]:
+        index = self._fields[field]
+        postings = [index.postings(term) for term in terms]
+        if not terms or any(len(rows) == 0 for rows, _, _ in postings):
+            return {}
+
+        candidates = postings[0][0]
+        if within is not None:
+            candidates = np.intersect1d(
+                candidates, np.asarray(within, dtype=candidates.dtype)
+            )
+        for rows, _, _ in sorted(postings[1:], key=lambda p: len(p[0])):
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+            if len(candidates) == 0:
+                return {}
+
+        idf = sum(self._idf(len(rows)) for rows, _, _ in postings)
+        frequencies = {}
+        for row in candidates:
+            offsets = []
+            for i, (rows, _, span) in enumerate(postings):
+                posting = span.start + int(np.searchsorted(rows, row))
+                positions = index.positions[
+                    index.pos_ptr[posting]:index.pos_ptr[posting + 1]
+                ]
+                offsets.append(positions - i)
+            frequency = _sloppy_frequency(offsets, slop)
+            if frequency > 0:
+                frequencies[int(row)] = frequency
+
+        if not frequencies:
+            return {}
+        rows = np.fromiter(frequencies, dtype=np.int64)
+        norms = index.tf_norm(
+            np.fromiter(frequencies.values(), dtype=np.float64), rows
+        )
+        return {int(row): idf * float(n) for row, n in zip(rows, norms)}
+
+    def _parse_clause(self, clause: Dict[str, Any]) -> Tuple[str, Dict]:
+        if len(clause) != 1:
+            raise ValueError(f"Expected one field in the query, got {clause}")
+        field, value = next(iter(clause.items()))
+        if field not in self._fields:
+            raise ValueError(
+                f"Field {field} is not indexed, the index has {self.fields}."
+            )
+        return field, value if isinstance(value, dict) else {"query": value}
+
+    def _clause_scores(
+        self, clause: Dict[str, Any], within: Optional[Sequence[int]] = None
+    ) -> Dict[int, float]:
+        if "match_phrase" in clause:
+            field, options = self._parse_clause(clause["match_phrase"])
+            return self._phrase_scores(
+                field, analyze(options["query"]), options.get("slop", 0), within
+            )
+        if "match" in clause and within is None:
+            field, options = self._parse_clause(clause["match"])
+            return self._match_scores(
+                field,
+                analyze(options["query"]),
+                options.get("minimum_should_match"),
+            )
+        raise ValueError(f"Unsupported query {clause}")
+
+    def _highlight(
+        self,
+        document: Dict[str, Any],
+        clause: Dict[str, Any],
+        highlight: Dict[str, Any],
+    ) -> Dict[str, List[str]]:
+        """
+        Find the passages of a document as the Elasticsearch `highlight` of
+        a query does, for the terms of the query. Only the fields stored
+        with the document can be highlighted.
+        :param document: the document
+        :param clause: the `query` of the query
+        :param highlight: the `highlight` of the query
+        :return: the passages of every highlighted field that has some
+        """
+        field, options = self._parse_clause(next(iter(clause.values())))
+        terms = analyze(options["query"])
+        passages = {}
+        for name, field_options in highlight.get("fields", {}).items():
+            if name not in self._fields or name not in document:
+                continue
+            if name != field and highlight.get("require_field_match", True):
+                continue
+            # The options of the field override the global ones.
+            options = {**highlight, **(field_options or {})}
+            fragments = highlight_fragments(
+                document[name] or "",
+                terms,
+                options.get("fragment_size", 100),
+                options.get("number_of_fragments", 5),
+            )
+            if fragments:
+                passages[name] = fragments
+        return passages
+
+    def _rescore(
+        self, ranked: List[Tuple[int, float]], rescore: Dict[str, Any]
+    ) -> List[Tuple[int, float]]:
+        """
+        Rescore the top of the ranking as the Elasticsearch `rescore` of a
+        query does, with the default `total` score mode.
+        :param ranked: (row, score) of the matches, best first
+        :param rescore: the `rescore` of the query
+        :return: the new ranking
+        """
+        window = ranked[:rescore.get("window_size", 10)]
+        options = rescore["query"]
+        rescore_scores = self._clause_scores(
+            options["rescore_query"], [row for row, _ in window]
+        )
+        query_weight = options.get("query_weight", 1.0)
+        rescore_weight = options.get("rescore_query_weight", 1.0)
+        window = [
+            (
+                row,
+                query_weight * score
+                + rescore_weight * rescore_scores.get(row, 0.0),
+            )
+            for row, score in window
+        ]
+        window.sort(key=lambda item: (-item[1], item[0]))
+        return window + ranked[len(window):]
+
+    def search(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Search the index with an Elasticsearch style query dict.
+        :param query: dict with a `query` of type `match_phrase` or `match`,
+            which may have a `minimum_should_match`, and optionally `size`,
+            a `rescore` with a `match_phrase` rescore query and a
+            `highlight` of the indexed field, see `highlight_fragments`.
+            The documents are local, so `_source` filtering and
+            `script_fields` are ignored and the hits have all the fields
+        :return: the results in the format of the Elasticsearch search API
+        """
+        size = query.get("size", 10)
+        scores = self._clause_scores(query.get("query", {}))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if "rescore" in query:
+            ranked = self._rescore(ranked, query["rescore"])
+        hits = []
+        for row, score in ranked[:size]:
+            document = self._documents.get(row)
+            hit = {
+                "_id": document["doc_id"],
+                "_score": score,
+                "_source": document,
+            }
+            if "highlight" in query:
+                hit["highlight"] = self._highlight(
+                    document, query["query"], query["highlight"]
+                )
+            hits.append(hit)
+        return {
+            "hits": {
+                "total": {"value": len(scores), "relation": "eq"},
+                "max_score": hits[0]["_score"] if hits else None,
+                "hits": hits,
+            }
+        }
+
+    def close(self):
+        self._documents.close()
@@ -0,0 +1,135 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A faiss based dense passage index.
+"""
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from composable_source.utils.document_store import DocumentStore
+
+__all__ = ["DenseIndex", "DenseIndexBuilder"]
+
+INDEX_FILE = "index.faiss"
+DOCUMENT_FILE = "documents.db"
+
+
+class DenseIndexBuilder:
+    r"""Collects the vectors and documents of a corpus and writes them as a
+    :class:`DenseIndex` into `index_dir`. Documents go to disk as they come,
+    the faiss index is trained and written by :meth:`build`.
+
+    Args:
+        index_dir: the directory of the index.
+        index_factory: faiss index factory string, e.g. "HNSW32" or
+            "IVF4096,Flat".
+    """
+
+    def __init__(self, index_dir: str, index_factory: str = "HNSW32"):
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_dir = index_dir
+        self.index_factory = index_factory
+        self._documents = DocumentStore(os.path.join(index_dir, DOCUMENT_FILE))
+        self._documents.clear()
+        self._vectors: List[np.ndarray] = []
+        self._num_docs = 0
+
+    def add(self, vectors: np.ndarray, documents: List[Dict[str, str]]):
+        """
+        Add documents and their vectors.
+        :param vectors: (len(documents), dim) array
+        :param documents: list of dicts with `doc_id`, `content` and
+            optionally `pack_info` values
+        :return:
+        """
+        self._documents.add(self._num_docs, documents)
+        self._num_docs += len(documents)
+        self._vectors.append(vectors)
+
+    def build(self):
+        """
+        Train the faiss index if needed, add all vectors and write it.
+        """
+        self._documents.close()
+        if not self._vectors:
+            return
+
+        vectors = np.ascontiguousarray(
+            np.concatenate(self._vectors), dtype=np.float32
+        )
+        index = faiss.index_factory(
+            vectors.shape[1], self.index_factory, faiss.METRIC_INNER_PRODUCT
+        )
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        faiss.write_index(index, os.path.join(self.index_dir, INDEX_FILE))
+
+
+class DenseIndex:
+    r"""A faiss index built by :class:`DenseIndexBuilder`. The index is
+    memory-mapped from disk, documents are read from SQLite on demand.
+
+    Args:
+        index_dir: the directory of the index.
+        search_params: faiss search parameters, e.g. "efSearch=128" for
+            HNSW or "nprobe=16" for IVF indexes.
+    """
+
+    def __init__(self, index_dir: str, search_params: Optional[str] = None):
+        self.index = faiss.read_index(
+            os.path.join(index_dir, INDEX_FILE), faiss.IO_FLAG_MMAP
+        )
+        if search_params:
+            faiss.ParameterSpace().set_index_parameters(
+                self.index, search_params
+            )
+        self._documents = DocumentStore(os.path.join(index_dir, DOCUMENT_FILE))
+
+    def search(
+        self, vector: np.ndarray, size: int
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the `size` documents closest to `vector`.
+        :param vector: a (1, dim) or (dim,) query vector
+        :param size: number of documents to return
+        :return: list of (document, score), best first
+        """
+        query = np.ascontiguousarray(vector, dtype=np.float32).reshape(1, -1)
+        scores, rows = self.index.search(query, size)
+
+        results = []
+        for score, row in zip(scores[0], rows[0]):
+            if row < 0:
+                continue
+            document = self._documents.get(row)
+            results.append((document, float(score)))
+        return results
+
+    def document(self, row: int) -> Dict[str, Any]:
+        """
+        Load the document of a row of the index.
+        :param row: the row, i.e. the order in which the document was added
+        :return: the document
+        """
+        return self._documents.get(row)
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    def close(self):
+        self._documents.close()
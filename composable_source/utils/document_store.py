@@ -0,0 +1,111 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Storage of the indexed documents of the local search back ends.
+"""
+import json
+import sqlite3
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+__all__ = ["DocumentStore"]
+
+
+class DocumentStore:
+    r"""A SQLite table of the indexed documents, addressed by their row
+    number in the index. Every document has the `doc_id`, `content` and
+    optionally `pack_info` fields written by the index processors, the other
+    fields of a document, e.g. the ones of the passages, are kept as JSON.
+
+    Args:
+        path: the store file, created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents (row INTEGER PRIMARY KEY, "
+            "doc_id TEXT NOT NULL, content TEXT, pack_info BLOB, fields TEXT)"
+        )
+
+    def clear(self):
+        self._conn.execute("DELETE FROM documents")
+
+    def add(self, start_row: int, documents: Iterable[Dict[str, Any]]):
+        """
+        Add documents, numbered from `start_row`.
+        :param start_row: row number of the first document
+        :param documents: dicts with `doc_id`, `content` and optionally
+            `pack_info` and other JSON serializable values
+        :return:
+        """
+        rows = []
+        for row, document in enumerate(documents, start_row):
+            pack_info: Optional[str] = document.get("pack_info")
+            fields = {
+                key: value
+                for key, value in document.items()
+                if key not in ("doc_id", "content", "pack_info")
+            }
+            rows.append(
+                (
+                    row,
+                    document["doc_id"],
+                    document["content"],
+                    (
+                        zlib.compress(pack_info.encode("utf-8"))
+                        if pack_info
+                        else None
+                    ),
+                    json.dumps(fields) if fields else None,
+                )
+            )
+        self._conn.executemany(
+            "INSERT INTO documents (row, doc_id, content, pack_info, fields) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def get(self, row: int) -> Dict[str, Any]:
+        """
+        Load the document at `row`.
+        :param row: row number of the document
+        :return: dict with `doc_id`, `content` and `pack_info` values, and
+            the other fields of the document
+        """
+        doc_id, content, pack_info, fields = self._conn.execute(
+            "SELECT doc_id, content, pack_info, fields FROM documents "
+            "WHERE row = ?",
+            (int(row),),
+        ).fetchone()
+        document = {
+            "doc_id": doc_id,
+            "content": content,
+            "pack_info": (
+                zlib.decompress(pack_info).decode("utf-8")
+                if pack_info
+                else None
+            ),
+        }
+        if fields:
+            document.update(json.loads(fields))
+        return document
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
@@ -0,0 +1,155 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+An on-disk key-value cache with least recently used eviction.
+"""
+import json
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+__all__ = ["SQLiteLRUCache"]
+
+
+class SQLiteLRUCache:
+    r"""A SQLite cache from string keys to JSON serializable values. It
+    keeps at most `max_entries` values and evicts the least recently used
+    ones. The batch methods :meth:`get_many` and :meth:`put_many` run in a
+    single transaction, which is much faster for many small values.
+
+    Args:
+        path: the cache file, created if it does not exist.
+        max_entries: maximum number of cached values.
+        table: name of the table, so that several caches can share a file.
+    """
+
+    def __init__(self, path: str, max_entries: int, table: str = "cache"):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self._conn = self._connect()
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_last_used "
+            f"ON {table} (last_used)"
+        )
+        self._clock = self._conn.execute(
+            f"SELECT COALESCE(MAX(last_used), 0) FROM {table}"
+        ).fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        # The pipeline may be initialized and run in different threads.
+        return sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False
+        )
+
+    def reopen(self):
+        """
+        Open a new connection to the cache file, which is needed in a forked
+        worker process. The inherited connection is left as it is, closing
+        it could release the file locks of the parent process.
+        :return:
+        """
+        self._conn = self._connect()
+
+    @contextmanager
+    def _transaction(self):
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a key.
+        :param key: the key
+        :return: the cached value, or None if the key is not cached
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Look up several keys at once.
+        :param keys: the keys
+        :return: the cached values of the keys that are found
+        """
+        values: Dict[str, Any] = {}
+        with self._transaction():
+            for key in keys:
+                row = self._conn.execute(
+                    f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute(
+                    f"UPDATE {self.table} SET last_used = ? WHERE key = ?",
+                    (self._tick(), key),
+                )
+                values[key] = json.loads(row[0])
+        return values
+
+    def put(self, key: str, value: Any):
+        """
+        Cache a value, evicting the least recently used values when the
+        cache is full.
+        :param key: the key
+        :param value: a JSON serializable value
+        :return:
+        """
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]):
+        """
+        Cache several values at once.
+        :param items: (key, value) pairs
+        :return:
+        """
+        with self._transaction():
+            for key, value in items:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} "
+                    "(key, value, last_used) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), self._tick()),
+                )
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM "
+                f"{self.table} ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __contains__(self, key: str) -> bool:
+        return (
+            self._conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM {self.table}"
+        ).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,83 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A local store of serialized DataPacks with random access by doc id.
+"""
+import sqlite3
+import zlib
+from typing import Optional
+
+from forte.data.data_pack import DataPack
+
+__all__ = ["PackStore"]
+
+
+class PackStore:
+    r"""A SQLite backed key-value store of DataPacks. Packs are kept as
+    zlib compressed serialized strings, so a single file can hold the
+    annotated version of a whole corpus.
+
+    Args:
+        path: the store file, created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS packs "
+            "(doc_id TEXT PRIMARY KEY, pack BLOB NOT NULL)"
+        )
+
+    def put(self, doc_id: str, pack: DataPack):
+        """
+        Store `pack` under `doc_id`, replacing any previous pack.
+        :param doc_id: the key of the pack
+        :param pack: DataPack
+        :return:
+        """
+        data = zlib.compress(pack.to_string(True).encode("utf-8"))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO packs (doc_id, pack) VALUES (?, ?)",
+            (doc_id, data),
+        )
+
+    def get(self, doc_id: str) -> Optional[DataPack]:
+        """
+        Load the pack stored under `doc_id`.
+        :param doc_id: the key of the pack
+        :return: the DataPack, or None if it is not in the store
+        """
+        row = self._conn.execute(
+            "SELECT pack FROM packs WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return DataPack.from_string(zlib.decompress(row[0]).decode("utf-8"))
+
+    def __contains__(self, doc_id: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM packs WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM packs").fetchone()[0]
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
@@ -0,0 +1,87 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+BERT encoder for the dense passage index.
+"""
+from typing import List
+
+import faiss
+import numpy as np
+import torch
+from texar.torch.data import BERTTokenizer
+from texar.torch.modules import BERTEncoder
+
+__all__ = ["PassageEncoder"]
+
+
+class PassageEncoder:
+    r"""Encodes texts into L2 normalized vectors with the `[CLS]` output of a
+    BERT encoder, so that inner product search ranks by cosine similarity.
+
+    Args:
+        model_name: name of the pretrained texar BERT model.
+        max_seq_length: texts are truncated to this number of word pieces.
+        batch_size: number of texts encoded together.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "bert-base-uncased",
+        max_seq_length: int = 256,
+        batch_size: int = 32,
+    ):
+        self.max_seq_length = max_seq_length
+        self.batch_size = batch_size
+        self.device = torch.device(
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+        self.tokenizer = BERTTokenizer(pretrained_model_name=model_name)
+        self.encoder = BERTEncoder(pretrained_model_name=model_name)
+        self.encoder.to(self.device)
+        self.encoder.eval()
+
+    @property
+    def dim(self) -> int:
+        return self.encoder.output_size
+
+    @torch.no_grad()
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode `texts` into a (len(texts), dim) float32 array.
+        :param texts: list of texts
+        :return: normalized vectors
+        """
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            input_ids, segment_ids = [], []
+            for text in texts[start:start + self.batch_size]:
+                ids, segments, _ = self.tokenizer.encode_text(
+                    text_a=text, max_seq_length=self.max_seq_length
+                )
+                input_ids.append(ids)
+                segment_ids.append(segments)
+
+            inputs = torch.LongTensor(input_ids).to(self.device)
+            output, _ = self.encoder(
+                inputs=inputs,
+                sequence_length=(inputs != 0).sum(dim=1),
+                segment_ids=torch.LongTensor(segment_ids).to(self.device),
+            )
+            vectors.append(output[:, 0, :].cpu().numpy())
+
+        if not vectors:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        result = np.ascontiguousarray(np.concatenate(vectors), dtype=np.float32)
+        faiss.normalize_L2(result)
+        return result
@@ -0,0 +1,173 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Sentence splitting, and the passages of a paper: the ones for the encoders
+that only read the beginning of a text, and the ones around the terms of a
+query, as the Elasticsearch highlighter returns them.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+__all__ = [
+    "split_sentences",
+    "split_passages",
+    "paper_title",
+    "highlight_fragments",
+    "hit_passages",
+]
+
+# A sentence ends with a punctuation followed by a capitalized word, or with
+# a paragraph break, so that abbreviations such as "e.g. the" are kept.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])|\n\s*\n")
+
+_WORD = re.compile(r"\w+")
+
+# The delimiter between the title, the abstract and the body of a paper,
+# see `CORDReader`.
+PART_DELIMITER = "\n\n"
+
+
+def split_sentences(text: str, begin: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split the text into sentences with a regular expression, which is much
+    cheaper than a sentence segmentation model.
+    :param text: the text to split
+    :param begin: offset where the splitting starts
+    :return: list of (begin, end) character offsets, without the
+        surrounding spaces
+    """
+    spans = []
+    for match in _SENTENCE_BREAK.finditer(text, begin):
+        spans.append((begin, match.start()))
+        begin = match.end()
+    spans.append((begin, len(text)))
+
+    sentences = []
+    for start, end in spans:
+        sentence = text[start:end]
+        stripped = sentence.strip()
+        if stripped:
+            start += len(sentence) - len(sentence.lstrip())
+            sentences.append((start, start + len(stripped)))
+    return sentences
+
+
+def split_passages(
+    text: str, begin: int = 0, passage_size: int = 1000
+) -> List[Tuple[int, int]]:
+    """
+    Group the sentences of a text into passages of at most `passage_size`
+    characters, a longer sentence being a passage of its own. A passage
+    does not span the blank line between two parts of a paper.
+    :param text: the text to split
+    :param begin: offset where the splitting starts
+    :param passage_size: the maximum length of a passage, in characters
+    :return: list of (begin, end) character offsets of the passages
+    """
+    passages: List[Tuple[int, int]] = []
+    for start, end in split_sentences(text, begin):
+        if passages:
+            first, last = passages[-1]
+            if (
+                end - first <= passage_size
+                and PART_DELIMITER not in text[last:start]
+            ):
+                passages[-1] = (first, end)
+                continue
+        passages.append((start, end))
+    return passages
+
+
+def paper_title(text: str) -> str:
+    """
+    Get the title of a paper from its indexed text.
+    :param text: the text of the paper, laid out by `CORDReader`
+    :return: the title, empty if the text has no title
+    """
+    end = text.find(PART_DELIMITER)
+    return text[:end] if end >= 0 else ""
+
+
+def highlight_fragments(
+    text: str,
+    terms: Iterable[str],
+    fragment_size: int = 300,
+    number_of_fragments: int = 5,
+) -> List[str]:
+    """
+    Find the best passages of a text for the terms of a query, close to the
+    `unified` highlighter of Elasticsearch with the `sentence` boundary
+    scanner: the sentences with the most distinct terms are grown with
+    their neighbouring sentences, alternately the next and the previous
+    one, while the passage is at most `fragment_size` characters long.
+    Passages do not overlap.
+    :param text: the text
+    :param terms: the lower cased terms of the query
+    :param fragment_size: the length goal of a passage, in characters
+    :param number_of_fragments: the maximum number of passages
+    :return: the passages, the best first
+    """
+    terms = set(terms)
+    sentences = split_sentences(text)
+    scored = []
+    for index, (begin, end) in enumerate(sentences):
+        matched = terms.intersection(_WORD.findall(text[begin:end].lower()))
+        if matched:
+            scored.append((-len(matched), index))
+    scored.sort()
+
+    covered: Set[int] = set()
+    fragments = []
+    for _, index in scored:
+        if len(fragments) == number_of_fragments:
+            break
+        if index in covered:
+            continue
+        first = last = index
+        grown = True
+        while grown:
+            grown = False
+            for neighbour in (last + 1, first - 1):
+                if not 0 <= neighbour < len(sentences) or neighbour in covered:
+                    continue
+                begin = sentences[min(first, neighbour)][0]
+                end = sentences[max(last, neighbour)][1]
+                if end - begin <= fragment_size:
+                    first, last = min(first, neighbour), max(last, neighbour)
+                    grown = True
+        covered.update(range(first, last + 1))
+        fragments.append(text[sentences[first][0]:sentences[last][1]])
+    return fragments
+
+
+def hit_passages(
+    hit: Dict[str, Any], field: str
+) -> Optional[Tuple[str, List[str]]]:
+    """
+    Get the title and the passages of a search hit made with the `highlight`
+    of `ElasticSearchQueryCreator`.
+    :param hit: the hit, in the format of the Elasticsearch search API
+    :param field: the highlighted field
+    :return: the title and the passages, or None if the hit has no
+        highlight, i.e. the query did not ask for passages
+    """
+    if "highlight" not in hit and "fields" not in hit:
+        return None
+    fragments = hit.get("highlight", {}).get(field, [])
+    titles = hit.get("fields", {}).get("title")
+    if titles:
+        title = titles[0]
+    else:
+        title = paper_title(hit["_source"].get(field) or "")
+    return title, fragments
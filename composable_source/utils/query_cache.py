@@ -0,0 +1,275 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A persistent cache of analyzed queries, so that repeated queries skip the
+query analysis models.
+"""
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.selector import Selector
+from ft.onto.base_ontology import Sentence
+from onto.cord19research import AnalyzedQuery
+from composable_source.utils.lru_cache import SQLiteLRUCache
+from composable_source.utils.query_templates import match_query_template
+from composable_source.utils.utils import query_preprocess
+
+__all__ = [
+    "normalize_query",
+    "QueryAnalysisCache",
+    "QUERY_CACHE_RESOURCE",
+    "acquire_query_cache",
+    "release_query_cache",
+    "analyzed_query",
+    "add_analyzed_query",
+    "cached_query_preprocess",
+    "QueryCacheMissSelector",
+]
+
+QueryAnalysis = Tuple[str, str, str, str, Optional[str], Optional[bool]]
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize the query text for the cache lookup: lower cased, with single
+    spaces and no trailing punctuation.
+    :param text: query text
+    :return: the cache key of the query
+    """
+    return _TRAILING_PUNCTUATION.sub("", " ".join(text.lower().split()))
+
+
+class QueryAnalysisCache(SQLiteLRUCache):
+    r"""A SQLite cache from the normalized query text to the output of
+    :func:`query_preprocess`. It keeps at most `max_entries` queries and
+    evicts the least recently used ones.
+
+    Args:
+        path: the cache file, created if it does not exist.
+        max_entries: maximum number of cached queries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        super().__init__(path, max_entries, table="queries")
+
+    def get(self, text: str) -> Optional[QueryAnalysis]:
+        """
+        Look up a query.
+        :param text: query text
+        :return: the cached analysis, or None if the query is not cached
+        """
+        analysis = super().get(normalize_query(text))
+        return tuple(analysis) if analysis is not None else None
+
+    def put(self, text: str, analysis: QueryAnalysis):
+        """
+        Cache the analysis of a query, evicting the least recently used
+        queries when the cache is full.
+        :param text: query text
+        :param analysis: output of `cached_query_preprocess`
+        :return:
+        """
+        super().put(normalize_query(text), analysis)
+
+    def __contains__(self, text: str) -> bool:
+        return super().__contains__(normalize_query(text))
+
+
+# Name of the cache in the pipeline resources, shared by all the components.
+QUERY_CACHE_RESOURCE = "query_analysis_cache"
+
+
+def acquire_query_cache(
+    resources: Resources, configs: Config
+) -> Tuple[Optional[QueryAnalysisCache], bool]:
+    """
+    Get the query analysis cache of a pipeline. All the components of the
+    pipeline share one cache in the resources, so that the recency of the
+    queries, and thus their eviction, is kept in one place. The cache is
+    created by the first component, the others ignore their configs.
+    :param resources: the pipeline resources
+    :param configs: the component configs, with `query_cache_path` and
+        `query_cache_size`
+    :return: the cache, or None if there is no cache, and whether the
+        component created it, in which case it closes it with
+        :func:`release_query_cache`
+    """
+    if resources.contains(QUERY_CACHE_RESOURCE):
+        return resources.get(QUERY_CACHE_RESOURCE), False
+    if not configs.query_cache_path:
+        return None, False
+    cache = QueryAnalysisCache(
+        configs.query_cache_path, configs.query_cache_size
+    )
+    resources.update(**{QUERY_CACHE_RESOURCE: cache})
+    return cache, True
+
+
+def release_query_cache(
+    resources: Resources, cache: Optional[QueryAnalysisCache], owned: bool
+):
+    """
+    Close the query analysis cache of a pipeline, if the component created
+    it with :func:`acquire_query_cache`.
+    :param resources: the pipeline resources
+    :param cache: the cache returned by :func:`acquire_query_cache`
+    :param owned: whether the component created the cache
+    :return:
+    """
+    if not owned:
+        return
+    cache.close()
+    if resources.get(QUERY_CACHE_RESOURCE) is cache:
+        resources.remove(QUERY_CACHE_RESOURCE)
+
+
+def analyzed_query(input_pack: DataPack) -> Optional[QueryAnalysis]:
+    """
+    Get the analysis stored in a query pack by `QueryAnalysisProcessor`.
+    :param input_pack: the query pack
+    :return: the analysis, as returned by `cached_query_preprocess`, or
+        None if the pack has no `AnalyzedQuery`
+    """
+    entry: Optional[AnalyzedQuery] = next(
+        iter(input_pack.get(AnalyzedQuery)), None
+    )
+    if entry is None:
+        return None
+    return (
+        entry.text,
+        entry.arg0,
+        entry.arg1,
+        entry.predicate,
+        entry.verb_lemma,
+        entry.is_answer_arg0,
+    )
+
+
+def add_analyzed_query(
+    input_pack: DataPack, analysis: QueryAnalysis
+) -> AnalyzedQuery:
+    """
+    Store the analysis of a query in its pack.
+    :param input_pack: the query pack
+    :param analysis: the output of `cached_query_preprocess`
+    :return: the `AnalyzedQuery`, which spans the query sentence, or the
+        whole query if the analysis comes from the cache entry of another
+        spelling of the query
+    """
+    sentence, arg0, arg1, predicate, verb_lemma, is_answer_arg0 = analysis
+    begin = input_pack.text.find(sentence)
+    if begin >= 0:
+        end = begin + len(sentence)
+    else:
+        stripped = input_pack.text.lstrip()
+        begin = len(input_pack.text) - len(stripped)
+        end = begin + len(stripped.rstrip())
+    entry = AnalyzedQuery(input_pack, begin, end)
+    entry.arg0 = arg0
+    entry.arg1 = arg1
+    entry.predicate = predicate
+    entry.verb_lemma = verb_lemma
+    entry.is_answer_arg0 = is_answer_arg0
+    return entry
+
+
+def cached_query_preprocess(
+    input_pack: DataPack, cache: Optional[QueryAnalysisCache] = None
+) -> QueryAnalysis:
+    """
+    Same as :func:`query_preprocess`, but reads the `AnalyzedQuery` of the
+    pack if it has one, then looks up the query in `cache` and stores the
+    analysis of new queries. Unlike :func:`query_preprocess` the first
+    value is the sentence text, so that cached queries need no annotations.
+    :param input_pack: the query pack
+    :param cache: the query analysis cache, if any
+    :return: sentence text, arg0, arg1, predicate, verb_lemma and
+        is_answer_arg0
+    """
+    analysis = analyzed_query(input_pack)
+    if analysis is not None:
+        return analysis
+
+    if cache is not None:
+        analysis = cache.get(input_pack.text)
+        if analysis is not None:
+            return analysis
+
+    sentence, arg0, arg1, predicate, verb_lemma, is_answer_arg0 = (
+        query_preprocess(input_pack)
+    )
+    analysis = (
+        sentence.text,
+        arg0,
+        arg1,
+        predicate,
+        verb_lemma,
+        is_answer_arg0,
+    )
+    if cache is not None:
+        cache.put(input_pack.text, analysis)
+    return analysis
+
+
+class QueryCacheMissSelector(Selector[DataPack, DataPack]):
+    r"""Selects the query pack only if it is not in the query analysis
+    cache, so that the query analysis processors skip cached queries. With
+    `skip_template_queries`, queries analyzed by the query templates are
+    skipped as well, which is meant for the SRL processor.
+
+    Args:
+        resources: the resources of the pipeline, whose query analysis
+            cache is used. Selectors are initialized after the processors,
+            which create the cache, and have no `finish` to close it, so
+            the selector never opens the cache itself. Every pack is
+            selected if the pipeline has no cache.
+    """
+
+    def __init__(self, resources: Resources):
+        super().__init__()
+        self.resources = resources
+        self.cache: Optional[QueryAnalysisCache] = None
+
+    def initialize(self, configs: Optional[Dict[str, Any]] = None):
+        super().initialize(configs)
+        if self.resources.contains(QUERY_CACHE_RESOURCE):
+            self.cache = self.resources.get(QUERY_CACHE_RESOURCE)
+
+    @classmethod
+    def default_configs(cls) -> Dict[str, Any]:
+        """
+        This defines a basic config structure for QueryCacheMissSelector.
+        :return: A dictionary with the default config for this selector.
+        Following are the keys for this dictionary:
+            - skip_template_queries: whether to skip the packs that match a
+                query template, they need to have the NLTK annotations
+        """
+        return {"skip_template_queries": False}
+
+    def select(self, pack: DataPack) -> Iterator[DataPack]:
+        if self.cache is not None and pack.text in self.cache:
+            return
+        if self.configs.skip_template_queries:
+            sentences = list(pack.get(Sentence))
+            if (
+                len(sentences) == 1
+                and match_query_template(pack, sentences[0]) is not None
+            ):
+                return
+        yield pack
@@ -0,0 +1,150 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Templates that analyze the common question shapes from the NLTK POS tags
+and lemmas, so that these queries need no SRL model.
+"""
+from typing import List, Optional, Tuple
+
+from forte.data.data_pack import DataPack
+from ft.onto.base_ontology import Sentence, Token
+
+__all__ = ["NLTK_TOKENIZER", "match_query_template"]
+
+NLTK_TOKENIZER = "fortex.nltk.nltk_processors.NLTKWordTokenizer"
+
+WH_TAGS = {"WP", "WDT"}
+PUNCTUATION_TAGS = {".", ",", ":", "``", "''", "(", ")"}
+# Verb forms that can follow the question word, e.g. "what caused".
+FINITE_VERB_TAGS = {"VBD", "VBZ", "VBP", "VBN"}
+AUXILIARY_LEMMAS = {"be", "do", "have"}
+# Tags of the subject of "what does covid-19 cause", a plain noun phrase.
+NOUN_PHRASE_TAGS = {
+    "DT",
+    "CD",
+    "JJ",
+    "JJR",
+    "JJS",
+    "NN",
+    "NNS",
+    "NNP",
+    "NNPS",
+    "POS",
+    "PRP",
+    "PRP$",
+}
+
+
+def _text(pack: DataPack, tokens: List[Token]) -> str:
+    return pack.text[tokens[0].begin:tokens[-1].end]
+
+
+def _lemma(token: Token) -> str:
+    return token.lemma or token.text.lower()
+
+
+def _is_modal_or_do(token: Token) -> bool:
+    return token.pos == "MD" or _lemma(token) == "do"
+
+
+def match_query_template(
+    input_pack: DataPack, sentence: Sentence
+) -> Optional[Tuple[str, str, str, str, bool]]:
+    """
+    Analyze the query with the question templates below, `WH` being "what",
+    "which" or "who", optionally followed by nouns as in "which drugs":
+        - WH do/modal X verb, e.g. "what does covid-19 cause": the answer
+            is the object of the verb, X is the subject, a noun phrase
+            directly followed by the verb that ends the query
+        - WH [modal] verb Y, e.g. "what caused liver injury": the answer is
+            the subject of the verb, Y is the object
+        - WH be verb by X, e.g. "what is caused by covid-19": the answer is
+            the object of the verb, X is the subject
+    :param input_pack: the query pack, with NLTK tokens, POS tags and
+        lemmas
+    :param sentence: the query sentence
+    :return: arg0, arg1, predicate, verb_lemma and is_answer_arg0 in the
+        same way as `query_preprocess`, or None if no template matches
+    """
+    tokens = [
+        token
+        for token in input_pack.get(
+            Token, sentence, components=[NLTK_TOKENIZER]
+        )
+        if token.pos not in PUNCTUATION_TAGS
+    ]
+    if len(tokens) < 3 or tokens[0].pos not in WH_TAGS:
+        return None
+
+    # The question word, with the nouns of "which drugs" or "what virus".
+    wh_end = 1
+    if tokens[0].pos == "WDT":
+        while wh_end < len(tokens) and tokens[wh_end].pos[:2] in (
+            "NN",
+            "JJ",
+        ):
+            wh_end += 1
+    wh, rest = tokens[:wh_end], tokens[wh_end:]
+    if len(rest) < 2:
+        return None
+
+    # WH be verb by X
+    if (
+        len(rest) >= 4
+        and _lemma(rest[0]) == "be"
+        and rest[1].pos in ("VBN", "VBD")
+        and rest[2].text.lower() == "by"
+    ):
+        verb = rest[1]
+        return (
+            _text(input_pack, rest[3:]),
+            _text(input_pack, wh),
+            verb.text,
+            _lemma(verb),
+            False,
+        )
+
+    # WH [modal] verb Y
+    verb_index = 1 if rest[0].pos == "MD" else 0
+    verb_tags = {"VB"} if verb_index else FINITE_VERB_TAGS
+    if (
+        len(rest) >= verb_index + 2
+        and rest[verb_index].pos in verb_tags
+        and _lemma(rest[verb_index]) not in AUXILIARY_LEMMAS
+    ):
+        verb = rest[verb_index]
+        return (
+            _text(input_pack, wh),
+            _text(input_pack, rest[verb_index + 1:]),
+            verb.text,
+            _lemma(verb),
+            True,
+        )
+
+    # WH do/modal X verb, the verb ends the query and X is a noun phrase,
+    # anything else such as "what does covid-19 cause in children" is left
+    # to the SRL model.
+    if _is_modal_or_do(rest[0]) and len(rest) >= 3:
+        subject, verb = rest[1:-1], rest[-1]
+        if verb.pos.startswith("VB") and all(
+            token.pos in NOUN_PHRASE_TAGS for token in subject
+        ):
+            return (
+                _text(input_pack, subject),
+                _text(input_pack, wh),
+                verb.text,
+                _lemma(verb),
+                False,
+            )
+    return None
@@ -0,0 +1,274 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A small asyncio HTTP service that answers queries with a long-lived search
+pipeline, so that the models are loaded once and stay warm.
+"""
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SearchService"]
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class SearchService:
+    r"""Serves `POST /search` with a JSON body `{"query": "..."}` (or
+    `GET /search?query=...`) and `GET /health`.
+
+    Queries wait in a bounded queue and are answered in micro-batches by
+    `handler`, which runs in a single worker thread so that the pipeline
+    is never used concurrently. A batch is every query that arrives within
+    `batch_window` seconds of the first one, up to `batch_size` queries,
+    so that the pipeline can process the papers of all of them together.
+    When the queue is full new queries are rejected right away with 503,
+    and queries that wait longer than `request_timeout` get 504.
+
+    Args:
+        handler: answers a list of queries with a list of JSON serializable
+            dicts, in the same order. The answer of a query that cannot be
+            answered, e.g. because it cannot be analyzed, has an `error`
+            key and is returned with 400, the other queries of the batch
+            are answered as usual.
+        host: the address to listen on.
+        port: the port to listen on, 0 picks a free port.
+        queue_size: maximum number of queries waiting to be answered.
+        request_timeout: seconds a query may wait and run.
+        max_body_size: maximum size of a request body in bytes.
+        batch_size: maximum number of queries answered together.
+        batch_window: seconds to wait for more queries to batch with the
+            first waiting one, 0 only batches queries that are already
+            waiting.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[str]], List[Dict[str, Any]]],
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        queue_size: int = 16,
+        request_timeout: float = 120.0,
+        max_body_size: int = 65536,
+        batch_size: int = 1,
+        batch_window: float = 0.0,
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.request_timeout = request_timeout
+        self.max_body_size = max_body_size
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def start(self):
+        """
+        Start listening and answering queries.
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker = asyncio.ensure_future(self._work())
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Search service listening on %s:%d", self.host, self.port)
+
+    async def stop(self):
+        """
+        Stop listening and drop the waiting queries.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    def serve_forever(self):
+        """
+        Run the service in a new event loop until interrupted.
+        """
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.start())
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        loop = asyncio.get_event_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except asyncio.TimeoutError:
+                break
+        # Skip the queries whose client has timed out or gone away.
+        return [(query, future) for query, future in batch if not future.done()]
+
+    async def _work(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                results = await loop.run_in_executor(
+                    self._executor,
+                    self.handler,
+                    [query for query, _ in batch],
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    async def search(self, query: str) -> Tuple[int, Dict[str, Any]]:
+        """
+        Queue a query and wait for the answer.
+        :param query: the query text
+        :return: HTTP status and the JSON response
+        """
+        future = asyncio.get_event_loop().create_future()
+        try:
+            self._queue.put_nowait((query, future))
+        except asyncio.QueueFull:
+            return 503, {"error": "Too many queries, try again later."}
+
+        try:
+            result = await asyncio.wait_for(future, self.request_timeout)
+        except asyncio.TimeoutError:
+            return 504, {"error": "The query timed out."}
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception("Failed to answer %r", query)
+            return 500, {"error": str(e)}
+        return (400 if "error" in result else 200), result
+
+    async def _route(
+        self, method: str, target: str, body: bytes
+    ) -> Tuple[int, Dict[str, Any]]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, {"status": "ok", "queued": self.queued}
+        if url.path != "/search":
+            return 404, {"error": f"Unknown path {url.path}"}
+
+        if method == "GET":
+            query = parse_qs(url.query).get("query", [""])[0]
+        elif method == "POST":
+            try:
+                query = json.loads(body.decode("utf-8")).get("query", "")
+            except (ValueError, AttributeError):
+                return 400, {"error": 'Expected a JSON body {"query": ...}'}
+        else:
+            return 405, {"error": f"Method {method} is not allowed"}
+
+        if not isinstance(query, str) or not query.strip():
+            return 400, {"error": "The query is empty."}
+        return await self.search(query.strip())
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            status, response = await self._read_and_route(reader)
+            payload = json.dumps(response).encode("utf-8")
+            headers = [
+                f"HTTP/1.1 {status} {REASONS[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(payload)}",
+                "Connection: close",
+            ]
+            if status == 503:
+                headers.append("Retry-After: 1")
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("ascii"))
+            writer.write(payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_and_route(
+        self, reader: asyncio.StreamReader
+    ) -> Tuple[int, Dict[str, Any]]:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            return 400, {"error": "Malformed request"}
+        method, target, _ = request_line
+
+        content_length = 0
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                try:
+                    content_length = int(value.strip())
+                except ValueError:
+                    content_length = -1
+                if content_length < 0:
+                    return 400, {"error": "Malformed Content-Length"}
+
+        if content_length > self.max_body_size:
+            return 413, {"error": "The request body is too large."}
+        body = (
+            await reader.readexactly(content_length) if content_length else b""
+        )
+        return await self._route(method, target, body)
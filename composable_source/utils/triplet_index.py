@@ -0,0 +1,229 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+An on-disk inverted index of (arg0, predicate, arg1) triplets.
+"""
+import json
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+__all__ = ["TripletIndex", "normalize_terms"]
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS triplets (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    title TEXT,
+    sentence TEXT NOT NULL,
+    sent_begin INTEGER,
+    sent_end INTEGER,
+    arg0 TEXT NOT NULL,
+    predicate TEXT NOT NULL,
+    arg1 TEXT NOT NULL,
+    verb_lemma TEXT,
+    concepts TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    triplet_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_lookup ON postings (field, term);
+"""
+
+
+def normalize_terms(text: str) -> List[str]:
+    """
+    Split a text into the lower-cased alphanumeric terms used as index keys.
+    :param text: argument or entity text
+    :return: list of unique terms, in order of appearance
+    """
+    terms: List[str] = []
+    for term in _TERM_PATTERN.findall(text.lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+class TripletIndex:
+    r"""A SQLite backed inverted index of the triplets extracted from a
+    corpus. Every triplet is posted under its verb lemma (field ``verb``) and
+    under the normalized terms of both arguments (fields ``arg0`` and
+    ``arg1``), and keeps pointers back to its sentence and paper.
+
+    Args:
+        path: the index file, created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def add(
+        self,
+        doc_id: str,
+        title: str,
+        sentence: str,
+        sent_span: Tuple[int, int],
+        triplet: Tuple[str, str, str],
+        verb_lemma: Optional[str],
+        concepts: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+    ) -> int:
+        """
+        Add one triplet to the index.
+        :param doc_id: id of the paper the triplet comes from
+        :param title: title of the paper
+        :param sentence: source sentence text
+        :param sent_span: (begin, end) offsets of the sentence in the paper
+        :param triplet: (arg0, predicate, arg1) text
+        :param verb_lemma: lemma of the predicate
+        :param concepts: UMLS concepts of the argument mentions, keyed by
+            mention text, as lists of (name, cui)
+        :return: id of the new triplet
+        """
+        arg0, predicate, arg1 = triplet
+        cursor = self._conn.execute(
+            "INSERT INTO triplets (doc_id, title, sentence, sent_begin, "
+            "sent_end, arg0, predicate, arg1, verb_lemma, concepts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                doc_id,
+                title,
+                sentence,
+                sent_span[0],
+                sent_span[1],
+                arg0,
+                predicate,
+                arg1,
+                verb_lemma,
+                json.dumps(concepts or {}),
+            ),
+        )
+        triplet_id = cursor.lastrowid
+
+        postings = [
+            ("arg0", term, triplet_id) for term in normalize_terms(arg0)
+        ]
+        postings += [
+            ("arg1", term, triplet_id) for term in normalize_terms(arg1)
+        ]
+        if verb_lemma:
+            postings.append(("verb", verb_lemma.lower(), triplet_id))
+        self._conn.executemany(
+            "INSERT INTO postings (field, term, triplet_id) VALUES (?, ?, ?)",
+            postings,
+        )
+        return triplet_id
+
+    def search(
+        self,
+        verb_lemma: str,
+        ent: str,
+        ent_field: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the triplets whose predicate has `verb_lemma` and whose
+        `ent_field` argument contains `ent`. The triplets stated by more
+        papers come first, and among those the ones with the shortest
+        answer argument, as the online response orders its relations.
+        :param verb_lemma: lemma of the query predicate
+        :param ent: entity text of the query
+        :param ent_field: "arg0" or "arg1", the argument that should
+            contain `ent`
+        :param limit: maximum number of triplets to return, the best
+            ranked ones are kept
+        :return: list of triplet records
+        """
+        if ent_field not in ("arg0", "arg1"):
+            raise ValueError(f"Unknown argument field {ent_field}.")
+
+        lookups = [("verb", verb_lemma.lower())]
+        lookups += [(ent_field, term) for term in normalize_terms(ent)]
+
+        sql = " INTERSECT ".join(
+            "SELECT triplet_id FROM postings WHERE field = ? AND term = ?"
+            for _ in lookups
+        )
+        params: List[Any] = [value for lookup in lookups for value in lookup]
+        sql = (
+            "SELECT id, doc_id, title, sentence, sent_begin, sent_end, arg0, "
+            "predicate, arg1, verb_lemma, concepts FROM triplets "
+            f"WHERE id IN ({sql}) ORDER BY id"
+        )
+
+        ent = ent.lower().strip()
+        records = []
+        support: Dict[Tuple[str, str, str], Set[str]] = {}
+        for row in self._conn.execute(sql, params):
+            record = self._to_record(row)
+            # Postings only match whole terms, make sure the entity really
+            # appears in the argument as the online matching does.
+            if ent not in record[ent_field].lower():
+                continue
+            records.append(record)
+            support.setdefault(self._triplet_key(record), set()).add(
+                record["doc_id"]
+            )
+
+        answer_field = "arg1" if ent_field == "arg0" else "arg0"
+        records.sort(
+            key=lambda r: (
+                -len(support[self._triplet_key(r)]),
+                len(r[answer_field]),
+                r["id"],
+            )
+        )
+        return records if limit is None else records[:limit]
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM triplets").fetchone()[0]
+
+    @staticmethod
+    def _triplet_key(record: Dict[str, Any]) -> Tuple[str, str, str]:
+        return (
+            record["arg0"].lower(),
+            record["verb_lemma"] or record["predicate"].lower(),
+            record["arg1"].lower(),
+        )
+
+    @staticmethod
+    def _to_record(row: Iterable[Any]) -> Dict[str, Any]:
+        keys = (
+            "id",
+            "doc_id",
+            "title",
+            "sentence",
+            "sent_begin",
+            "sent_end",
+            "arg0",
+            "predicate",
+            "arg1",
+            "verb_lemma",
+            "concepts",
+        )
+        record = dict(zip(keys, row))
+        record["concepts"] = json.loads(record["concepts"] or "{}")
+        return record
@@ -0,0 +1,178 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A cache of the UMLS candidates of entity mentions, so that the candidate
+search of the entity linker runs once per mention text.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from composable_source.utils.lru_cache import SQLiteLRUCache
+
+__all__ = [
+    "normalize_mention",
+    "UMLSLinkCache",
+    "LINK_CACHE_RESOURCE",
+    "acquire_link_cache",
+    "release_link_cache",
+]
+
+# [concept_id, aliases, similarities] of every candidate of a mention.
+Candidates = List[List[Any]]
+
+
+def normalize_mention(text: str, k: int) -> str:
+    """
+    Build the cache key of a mention. The candidate search works on lower
+    cased character n-grams, so the case and the spacing are dropped.
+    :param text: mention text
+    :param k: number of candidates searched for the mention
+    :return: the cache key
+    """
+    return f"{k}\t{' '.join(text.lower().split())}"
+
+
+class UMLSLinkCache:
+    r"""An in-memory LRU cache of the UMLS candidates of mentions, with an
+    optional on-disk :class:`SQLiteLRUCache` behind it that keeps them
+    across runs. Values missing from memory are looked up on disk.
+
+    Args:
+        path: the cache file, the candidates are only kept in memory if it
+            is None.
+        max_entries: maximum number of mentions kept on disk.
+        memory_size: maximum number of mentions kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1000000,
+        memory_size: int = 100000,
+    ):
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Candidates]" = OrderedDict()
+        self._disk = (
+            SQLiteLRUCache(path, max_entries, table="umls_candidates")
+            if path
+            else None
+        )
+
+    def _remember(self, key: str, candidates: Candidates):
+        self._memory[key] = candidates
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: Iterable[str], k: int) -> Dict[str, Candidates]:
+        """
+        Look up the candidates of several mentions.
+        :param texts: mention texts
+        :param k: number of candidates searched for every mention
+        :return: the cached candidates of the mentions that are found,
+            keyed by the mention text
+        """
+        found: Dict[str, Candidates] = {}
+        on_disk: Dict[str, List[str]] = {}
+        for text in texts:
+            key = normalize_mention(text, k)
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                found[text] = self._memory[key]
+            else:
+                on_disk.setdefault(key, []).append(text)
+
+        if self._disk is not None and on_disk:
+            for key, candidates in self._disk.get_many(on_disk).items():
+                self._remember(key, candidates)
+                for text in on_disk[key]:
+                    found[text] = candidates
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Candidates]], k: int):
+        """
+        Cache the candidates of several mentions.
+        :param items: (mention text, candidates) pairs
+        :param k: number of candidates searched for every mention
+        :return:
+        """
+        entries = [(normalize_mention(text, k), value) for text, value in items]
+        for key, candidates in entries:
+            self._remember(key, candidates)
+        if self._disk is not None:
+            self._disk.put_many(entries)
+
+    def reopen(self):
+        """
+        Reopen the on-disk cache in a forked worker process, see
+        :meth:`SQLiteLRUCache.reopen`.
+        :return:
+        """
+        if self._disk is not None:
+            self._disk.reopen()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+
+# Name of the cache in the pipeline resources, shared by all the components.
+LINK_CACHE_RESOURCE = "umls_link_cache"
+
+
+def acquire_link_cache(
+    resources: Resources, configs: Config
+) -> Tuple[UMLSLinkCache, bool]:
+    """
+    Get the UMLS link cache of a pipeline. All the components of the
+    pipeline that link mentions share one cache in the resources, so that
+    a mention linked by one of them is not searched again by another. The
+    cache is created by the first component, the others ignore their
+    configs.
+    :param resources: the pipeline resources
+    :param configs: the component configs, with `umls_cache_path`,
+        `umls_cache_size` and `umls_memory_size`
+    :return: the cache, and whether the component created it, in which
+        case it closes it with :func:`release_link_cache`
+    """
+    if resources.contains(LINK_CACHE_RESOURCE):
+        return resources.get(LINK_CACHE_RESOURCE), False
+    cache = UMLSLinkCache(
+        configs.umls_cache_path,
+        configs.umls_cache_size,
+        configs.umls_memory_size,
+    )
+    resources.update(**{LINK_CACHE_RESOURCE: cache})
+    return cache, True
+
+
+def release_link_cache(resources: Resources, cache: UMLSLinkCache, owned: bool):
+    """
+    Close the UMLS link cache of a pipeline, if the component created it
+    with :func:`acquire_link_cache`.
+    :param resources: the pipeline resources
+    :param cache: the cache returned by :func:`acquire_link_cache`
+    :param owned: whether the component created the cache
+    :return:
+    """
+    if not owned:
+        return
+    cache.close()
+    if resources.get(LINK_CACHE_RESOURCE) is cache:
+        resources.remove(LINK_CACHE_RESOURCE)
@@ -2,11 +2,23 @@ from collections import defaultdict
 from typing import Dict, DefaultDict
 from ft.onto.base_ontology import Token, Sentence, PredicateLink, Annotation
 from forte.data.data_pack import DataPack
+from composable_source.utils.query_templates import (
+    NLTK_TOKENIZER,
+    match_query_template,
+)
+
+
+class QueryAnalysisError(Exception):
+    r"""Raised when the arguments and the predicate of a query cannot be
+    found, e.g. when the SRL model finds no predicate with two arguments
+    in it. The query has to be rephrased."""
 
 
 def query_preprocess(input_pack: DataPack):
     """
-    Extract nouns and verb from user input query.
+    Extract nouns and verb from user input query. Common question shapes
+    are analyzed by `match_query_template`, other queries need the SRL
+    annotations.
     :param input_pack:
     :return:sentence: query text
         arg0: subject in query
@@ -18,6 +30,10 @@ def query_preprocess(input_pack: DataPack):
     """
     sentence = input_pack.get_single(Sentence)
 
+    template = match_query_template(input_pack, sentence)
+    if template is not None:
+        return (sentence, *template)
+
     relations: DefaultDict[str, Dict[str, Dict[str, str]]] = defaultdict(dict)
     text_mention_mapping = {}
 
@@ -40,15 +56,16 @@ def query_preprocess(input_pack: DataPack):
         if arg0 == "" and arg1 == "":
             continue
 
-    assert (
+    if not (
         isinstance(arg0, Annotation)
         and isinstance(arg1, Annotation)
         and isinstance(predicate, Annotation)
-    ), (
-        "AllenNLP SRL cannot extract the two arguments or the "
-        "predicate in your query, please check our examples "
-        "or rephrase your question"
-    )
+    ):
+        raise QueryAnalysisError(
+            "AllenNLP SRL cannot extract the two arguments or the "
+            "predicate in your query, please check our examples "
+            "or rephrase your question"
+        )
 
     verb_lemma, is_answer_arg0 = None, None
 
@@ -56,7 +73,7 @@ def query_preprocess(input_pack: DataPack):
     for token in input_pack.get(
         entry_type=Token,
         range_annotation=sentence,
-        components=["fortex.nltk.nltk_processors.NLTKWordTokenizer"],
+        components=[NLTK_TOKENIZER],
     ):
         # find WH words
         if token.pos in {"WP", "WP$", "WRB", "WDT"}:
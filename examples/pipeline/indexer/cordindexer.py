@@ -16,6 +16,7 @@ Example script to show how to use CORDReader.
 """
 import argparse
 import os
+from typing import Optional
 
 import yaml
 
@@ -24,18 +25,68 @@ from forte.data.data_pack import DataPack
 from forte.pipeline import Pipeline
 from fortex.elastic import ElasticSearchPackIndexProcessor
 from composable_source.readers import CORDReader
+from composable_source.processors.bm25_processors import (
+    BM25PackIndexProcessor,
+)
+from composable_source.processors.pack_store_processor import PackStoreWriter
+from composable_source.processors.passage_index_processor import (
+    BM25PassageIndexProcessor,
+    ElasticSearchPassageIndexProcessor,
+)
 
 
-def build_index_pipeline(dataset_dir: str, config: Config):
+def build_index_pipeline(
+    dataset_dir: str, config: Config, search_config: Optional[Config] = None
+):
     pipeline = Pipeline[DataPack]()
 
-    pipeline.set_reader(CORDReader())
-    pipeline.add(ElasticSearchPackIndexProcessor(), config=config.create_index)
+    pipeline.set_reader(CORDReader(), config=config.reader)
+    # Passages are indexed with their paper, section and offsets, and the
+    # parts of the papers as separate fields with section_fields.
+    if config.reader.passage_unit or config.section_fields:
+        index_config = {
+            **config.create_index.todict(),
+            "section_fields": config.section_fields,
+        }
+        if config.retrieval == "bm25":
+            pipeline.add(
+                BM25PassageIndexProcessor(),
+                config={**index_config, **config.bm25.todict()},
+            )
+        else:
+            pipeline.add(ElasticSearchPassageIndexProcessor(), index_config)
+    elif config.retrieval == "bm25":
+        pipeline.add(
+            BM25PackIndexProcessor(),
+            config={**config.create_index.todict(), **config.bm25.todict()},
+        )
+    else:
+        pipeline.add(
+            ElasticSearchPackIndexProcessor(), config=config.create_index
+        )
+
+    # Annotate every paper once with the models of the search pipeline, the
+    # search pipeline then loads the stored packs instead of re-running them.
+    if search_config is not None and search_config.pack_store.pack_store_path:
+        # Imported here, the models of the search pipeline are only needed
+        # to fill the pack store.
+        # pylint: disable=import-outside-toplevel
+        from examples.pipeline.inference.search_cord19 import (
+            add_hit_processors,
+        )
+
+        add_hit_processors(pipeline, search_config)
+        pipeline.add(
+            PackStoreWriter(),
+            config={
+                "pack_store_path": search_config.pack_store.pack_store_path
+            },
+        )
 
     pipeline.run(dataset_dir)
 
 
-def main(dataset_dir: str):
+def main(dataset_dir: str, pack_store: Optional[str] = None):
     """
     Build a pipeline to process CORD_NER dataset using
     CORDReader and build elastic indexer.
@@ -43,7 +94,16 @@ def main(dataset_dir: str):
     config_file = os.path.join(os.path.dirname(__file__), "config.yml")
     config = yaml.safe_load(open(config_file, "r"))
     config = Config(config, default_hparams=None)
-    build_index_pipeline(dataset_dir, config)
+
+    search_config = None
+    if pack_store:
+        search_config_file = os.path.join(
+            os.path.dirname(__file__), "..", "inference", "config.yml"
+        )
+        search_config = yaml.safe_load(open(search_config_file, "r"))
+        search_config["pack_store"]["pack_store_path"] = pack_store
+        search_config = Config(search_config, default_hparams=None)
+    build_index_pipeline(dataset_dir, config, search_config)
 
 
 if __name__ == "__main__":
@@ -54,6 +114,12 @@ if __name__ == "__main__":
         default="sample_data/cord_paper/",
         help="Data directory to read the text files from.",
     )
+    parser.add_argument(
+        "--pack-store",
+        type=str,
+        default=None,
+        help="If set, also annotate the papers and store them in this file.",
+    )
 
     args = parser.parse_args()
-    main(args.data_dir)
+    main(args.data_dir, args.pack_store)
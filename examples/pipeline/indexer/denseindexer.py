@@ -0,0 +1,62 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Example script that builds a faiss dense index of the CORD-19 papers, to be
+searched by `DenseSearchProcessor` without an Elasticsearch cluster.
+"""
+import argparse
+import os
+
+import yaml
+
+from forte.common.configuration import Config
+from forte.data.data_pack import DataPack
+from forte.pipeline import Pipeline
+from composable_source.readers import CORDReader
+from composable_source.processors.dense_retrieval import (
+    DensePackIndexProcessor,
+)
+
+
+def build_dense_index_pipeline(dataset_dir: str, config: Config):
+    pipeline = Pipeline[DataPack]()
+
+    pipeline.set_reader(CORDReader(), config=config.reader)
+    pipeline.add(DensePackIndexProcessor(), config=config.create_dense_index)
+
+    pipeline.run(dataset_dir)
+
+
+def main(dataset_dir: str):
+    """
+    Build a pipeline to process CORD-19 dataset using
+    CORDReader and build the dense index.
+    """
+    config_file = os.path.join(os.path.dirname(__file__), "config.yml")
+    config = yaml.safe_load(open(config_file, "r"))
+    config = Config(config, default_hparams=None)
+    build_dense_index_pipeline(dataset_dir, config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default="sample_data/cord_paper/",
+        help="Data directory to read the text files from.",
+    )
+
+    args = parser.parse_args()
+    main(args.data_dir)
@@ -0,0 +1,72 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Example script that runs the answer extraction models over the whole CORD-19
+corpus once and stores the triplets in an offline index.
+"""
+import argparse
+import os
+
+import yaml
+
+from forte.common.configuration import Config
+from forte.data.data_pack import DataPack
+from forte.pipeline import Pipeline
+from composable_source.readers import CORDReader
+from composable_source.processors.triplet_index_processor import (
+    TripletIndexProcessor,
+)
+from examples.pipeline.inference.search_cord19 import add_hit_processors
+
+
+def build_triplet_index_pipeline(dataset_dir: str, config: Config):
+    pipeline = Pipeline[DataPack]()
+
+    pipeline.set_reader(CORDReader())
+    add_hit_processors(pipeline, config)
+    pipeline.add(TripletIndexProcessor(), config=config.triplet_indexer)
+
+    pipeline.run(dataset_dir)
+
+
+def main(dataset_dir: str, config_file: str):
+    """
+    Build a pipeline to annotate CORD-19 papers with the same models as
+    the search pipeline and index the extracted triplets.
+    """
+    config = yaml.safe_load(open(config_file, "r"))
+    config = Config(config, default_hparams=None)
+    build_triplet_index_pipeline(dataset_dir, config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default="sample_data/cord_paper/",
+        help="Data directory to read the text files from.",
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default=os.path.join(
+            os.path.dirname(__file__), "..", "inference", "config.yml"
+        ),
+        help="Config of the search pipeline, the models and the "
+        "triplet_indexer section are taken from it.",
+    )
+
+    args = parser.parse_args()
+    main(args.data_dir, args.config)
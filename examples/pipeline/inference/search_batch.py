@@ -0,0 +1,146 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Example script that answers the queries of a file, one per line, and writes
+the answers as JSON Lines, e.g.
+
+    python examples/pipeline/inference/search_batch.py --queries queries.txt \
+        --output answers.jsonl
+
+The queries are processed `batch_search.batch_size` at a time: the papers of
+all the queries of a batch are retrieved first, and every paper retrieved by
+several queries is annotated once. A query that cannot be analyzed is
+written with its error instead of its answers.
+"""
+import argparse
+import json
+import logging
+import os
+from typing import Any, Dict, List
+
+import yaml
+from forte.common.configuration import Config
+from forte.pipeline import Pipeline
+from composable_source.processors.response_creator import (
+    RecordingResponseCreator,
+)
+from composable_source.utils.batch_search import (
+    annotate_batch,
+    process_all,
+    read_queries,
+)
+from examples.pipeline.inference.search_cord19 import (
+    build_annotation_pipeline,
+    build_response_pipeline,
+    build_retrieval_pipeline,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def answer_batch(
+    retrieval: Pipeline,
+    annotation: Pipeline,
+    response: Pipeline,
+    creator: RecordingResponseCreator,
+    hit_prefix: str,
+    queries: List[str],
+    query_pack_name: str,
+) -> List[Dict[str, Any]]:
+    """Answer a batch of queries, the shared papers being annotated once.
+    Returns the answers of every query, or the error of the queries that
+    cannot be analyzed, in the order of the queries."""
+    m_packs, errors = annotate_batch(retrieval, annotation, queries, hit_prefix)
+    m_pack_iter = iter(process_all(response, m_packs))
+    answers = []
+    for idx, query in enumerate(queries):
+        if idx in errors:
+            answers.append({"query": query, "error": errors[idx]})
+            continue
+        m_pack = next(m_pack_iter)
+        answers.append(
+            {
+                "query": query,
+                "num_papers": len(
+                    {
+                        pack.pack_name
+                        for name, pack in m_pack.iter_packs()
+                        if name != query_pack_name
+                    }
+                ),
+                "results": creator.pop_records(m_pack),
+            }
+        )
+    return answers
+
+
+def main(config_file: str, queries_file: str, output_file: str):
+    config = yaml.safe_load(open(config_file, "r"))
+    config = Config(config, default_hparams=None)
+    retrieval, hit_prefix = build_retrieval_pipeline(config)
+    annotation = build_annotation_pipeline(config, hit_prefix)
+    creator = RecordingResponseCreator()
+    response = build_response_pipeline(config, creator, retrieval)
+    for nlp in (retrieval, annotation, response):
+        nlp.initialize()
+
+    queries = list(read_queries(queries_file))
+    batch_size = config.batch_search.batch_size
+    with open(output_file, "w", encoding="utf8") as output:
+        for start in range(0, len(queries), batch_size):
+            for answer in answer_batch(
+                retrieval,
+                annotation,
+                response,
+                creator,
+                hit_prefix,
+                queries[start:start + batch_size],
+                config.response.query_pack_name,
+            ):
+                output.write(json.dumps(answer) + "\n")
+            output.flush()
+            logger.info(
+                "Answered %d of %d queries.",
+                min(start + batch_size, len(queries)),
+                len(queries),
+            )
+
+    for nlp in (retrieval, annotation, response):
+        nlp.finish()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--config",
+        type=str,
+        default=os.path.join(os.path.dirname(__file__), "config.yml"),
+        help="Config of the search pipeline.",
+    )
+    parser.add_argument(
+        "--queries",
+        type=str,
+        required=True,
+        help="File with one query per line.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="answers.jsonl",
+        help="JSON Lines file of the answers, one line per query.",
+    )
+
+    args = parser.parse_args()
+    main(args.config, args.queries, args.output)
@@ -13,16 +13,17 @@
 # limitations under the License.
 
 import os
+from typing import Any, Dict, Optional, Tuple
 
 import torch
 import yaml
 from forte.common.configuration import Config
 from forte.data.caster import MultiPackBoxer
 from forte.data.multi_pack import MultiPack
-from forte.data.readers import TerminalReader
+from forte.data.base_reader import PackReader
+from forte.data.readers import StringReader, TerminalReader
 from forte.pipeline import Pipeline
-from forte.data.selector import RegexNameMatchSelector
-from fortex.spacy.spacy_processors import SpacyProcessor
+from forte.data.selector import RegexNameMatchSelector, Selector
 from fortex.allennlp import AllenNLPProcessor
 from fortex.elastic import ElasticSearchProcessor
 from fortex.nltk import (
@@ -32,53 +33,372 @@ from fortex.nltk import (
     NLTKPOSTagger,
 )
 from ft.onto.base_ontology import Sentence, PredicateLink
+from composable_source.processors.biomedical_entity_processor import (
+    BioMedicalEntityProcessor,
+)
+from composable_source.processors.bm25_processors import BM25SearchProcessor
 from composable_source.processors.elasticsearch_query_creator import (
     ElasticSearchQueryCreator,
 )
 from ftx.onto.clinical import MedicalEntityMention
 from composable_source.processors.response_creator import ResponseCreator
+from composable_source.processors.rerank_processor import (
+    LexicalRerankProcessor,
+)
+from composable_source.processors.sentence_filter import (
+    SentenceFilterProcessor,
+)
+from composable_source.processors.srl_cache_processor import (
+    SRLCacheProcessor,
+)
+from composable_source.processors.pack_store_processor import (
+    PackStoreSearchProcessor,
+)
+from composable_source.processors.answer_budget import AnswerBudgetProcessor
+from composable_source.processors.batch_processor import BatchedProcessor
+from composable_source.processors.parallel_processor import (
+    ParallelProcessor,
+    ShardedProcessor,
+)
+from composable_source.processors.dense_retrieval import (
+    DenseQueryCreator,
+    DenseSearchProcessor,
+)
+from composable_source.processors.query_analysis_processor import (
+    QueryAnalysisProcessor,
+)
+from composable_source.readers.multi_pack_list_reader import (
+    MultiPackListReader,
+)
+from composable_source.utils.query_cache import QueryCacheMissSelector
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
-def build_search_pipeline(config: Config):
-    # Build pipeline and add the reader, which will read from terminal.
+def add_query_processors(nlp: Pipeline, config: Config):
+    """Add the processors that analyze the query pack. Queries found in the
+    query analysis cache skip them, and queries that match a query template
+    skip the SRL model. The analysis is then stored in the query pack for
+    the processors of the hits. The selectors use the query analysis cache
+    of the pipeline resources."""
+    cache_config = config.query_cache.todict()
+    for processor in (
+        NLTKSentenceSegmenter(),
+        NLTKWordTokenizer(),
+        NLTKPOSTagger(),
+        NLTKLemmatizer(),
+    ):
+        nlp.add(processor, selector=QueryCacheMissSelector(nlp.resource))
+    nlp.add(
+        AllenNLPProcessor(),
+        config=config.allennlp_query,
+        selector=QueryCacheMissSelector(nlp.resource),
+        selector_config={"skip_template_queries": True},
+    )
+    nlp.add(QueryAnalysisProcessor(), config=cache_config)
+
+
+def add_hit_processors(
+    nlp: Pipeline,
+    config: Config,
+    selector: Optional[Selector] = None,
+    parallel: bool = False,
+    pack_name_pattern: Optional[str] = None,
+):
+    """Add the processors that annotate the retrieved papers, the packs are
+    picked by `selector` when the pipeline works on multi-packs. The SRL
+    labels are cached when `config.srl_cache` has a path, the UMLS
+    candidates of the mentions are always cached. With `parallel`, the
+    entity linking and the SRL model run at the same time, the papers then
+    need to have their sentences already. With `pack_name_pattern`, the
+    packs whose names match it are annotated by the worker processes of
+    `config.sharded_hit_processors` or, together, by the batched models of
+    `config.batched_hit_processors` when either is enabled, and in score
+    order until the `config.answer_budget` is met when it is enabled."""
+    sharded = pack_name_pattern and config.sharded_hit_processors.enabled
+    batched = pack_name_pattern and config.batched_hit_processors.enabled
+    budgeted = pack_name_pattern and config.answer_budget.enabled
+    if sharded and (batched or budgeted):
+        raise ValueError(
+            "The sharded hit processors cannot be enabled together with the "
+            "batched hit processors or the answer budget."
+        )
+    batch_config = config.batched_hit_processors
+    spacy_config = {
+        **config.spacy.todict(),
+        **config.umls_cache.todict(),
+        "max_batch_tokens": batch_config.spacy_max_batch_tokens,
+    }
+    srl_config = {
+        **config.srl_cache.todict(),
+        "max_batch_tokens": batch_config.srl_max_batch_tokens,
+        "processor": config.allennlp.todict(),
+    }
+    if parallel:
+        processors = spacy_config["processors"]
+        if isinstance(processors, str):
+            processors = processors.split(",")
+        spacy_config["processors"] = [
+            p.strip() for p in processors if p.strip() != "sentence"
+        ]
+        hit_processors = [
+            ParallelProcessor(
+                [
+                    BioMedicalEntityProcessor(),
+                    SRLCacheProcessor(AllenNLPProcessor()),
+                ]
+            )
+        ]
+        hit_configs = [
+            {
+                "max_workers": config.parallel_hit_processors.max_workers,
+                "processors": [spacy_config, srl_config],
+            }
+        ]
+    elif sharded or batched or config.srl_cache.srl_cache_path:
+        hit_processors = [
+            BioMedicalEntityProcessor(),
+            SRLCacheProcessor(AllenNLPProcessor()),
+        ]
+        hit_configs = [spacy_config, srl_config]
+    else:
+        hit_processors = [BioMedicalEntityProcessor(), AllenNLPProcessor()]
+        hit_configs = [spacy_config, config.allennlp.todict()]
+
+    if budgeted:
+        # The answers are found from the lemmas of the papers.
+        budget_config = config.answer_budget.todict()
+        budget_config.pop("enabled")
+        nlp.add(
+            AnswerBudgetProcessor(
+                hit_processors + [NLTKPOSTagger(), NLTKLemmatizer()]
+            ),
+            config={
+                **budget_config,
+                **config.query_cache.todict(),
+                "query_pack_name": config.response.query_pack_name,
+                "pack_name_pattern": pack_name_pattern,
+                "processors": hit_configs + [{}, {}],
+            },
+        )
+        return
+    if sharded:
+        nlp.add(
+            ShardedProcessor(hit_processors),
+            config={
+                "num_workers": config.sharded_hit_processors.num_workers,
+                "threads_per_worker": (
+                    config.sharded_hit_processors.threads_per_worker
+                ),
+                "pack_name_pattern": pack_name_pattern,
+                "processors": hit_configs,
+            },
+        )
+    elif batched:
+        nlp.add(
+            BatchedProcessor(hit_processors),
+            config={
+                "pack_name_pattern": pack_name_pattern,
+                "processors": hit_configs,
+            },
+        )
+    else:
+        for processor, processor_config in zip(hit_processors, hit_configs):
+            nlp.add(processor, config=processor_config, selector=selector)
+    nlp.add(NLTKPOSTagger(), selector=selector)
+    nlp.add(NLTKLemmatizer(), selector=selector)
+
+
+def add_retrieval_processors(nlp: Pipeline, config: Config) -> str:
+    """Add the processors that create the query and retrieve the papers from
+    the back end chosen by `config.retrieval`. Pre-annotated hits are taken
+    from the pack store when one is configured. Returns the name prefix of
+    the hit packs to be annotated. With `query_creator.passages`, the hits
+    of the Elasticsearch and BM25 back ends only hold their passages."""
+    if config.retrieval == "dense":
+        nlp.add(
+            DenseQueryCreator(),
+            config={
+                **config.dense_query_creator.todict(),
+                **config.query_cache.todict(),
+            },
+        )
+        nlp.add(
+            DenseSearchProcessor(),
+            config={
+                **config.dense_indexer.todict(),
+                **config.pack_store.todict(),
+            },
+        )
+        return config.dense_indexer.response_pack_name_prefix
+
+    nlp.add(
+        ElasticSearchQueryCreator(),
+        config={
+            **config.query_creator.todict(),
+            **config.query_cache.todict(),
+        },
+    )
+    if config.retrieval == "bm25":
+        nlp.add(
+            BM25SearchProcessor(),
+            config={
+                **config.indexer.todict(),
+                **config.bm25.todict(),
+                **config.pack_store.todict(),
+            },
+        )
+    elif (
+        config.pack_store.pack_store_path
+        or config.query_creator.passages
+        or config.query_creator.tier_fields
+    ):
+        # This processor also builds the packs of the passages and searches
+        # the tiers of the query.
+        nlp.add(
+            PackStoreSearchProcessor(),
+            config={**config.indexer.todict(), **config.pack_store.todict()},
+        )
+    else:
+        nlp.add(ElasticSearchProcessor(), config=config.indexer)
+    return config.indexer.response_pack_name_prefix
+
+
+def add_hit_selection(nlp: Pipeline, config: Config, hit_prefix: str) -> str:
+    """Add the processors that rerank the retrieved papers and reduce them
+    to their candidate sentences, when `config.reranker` and
+    `config.sentence_filter` are enabled. Returns the name prefix of the
+    hit packs to be annotated."""
+    # Keep the papers that are the most likely to answer the query, by
+    # cheap lexical features.
+    rerank_config = config.reranker.todict()
+    if rerank_config.pop("enabled"):
+        nlp.add(
+            LexicalRerankProcessor(),
+            config={
+                **rerank_config,
+                **config.query_cache.todict(),
+                "response_pack_name_prefix": hit_prefix,
+            },
+        )
+        hit_prefix = rerank_config["ranked_pack_name_prefix"]
+
+    # Reduce the hits to the sentences that can answer the query, only the
+    # reduced packs are annotated then. The parallel hit processors take
+    # the sentences from the filter.
+    parallel = config.parallel_hit_processors.enabled
+    filter_config = config.sentence_filter.todict()
+    if filter_config.pop("enabled"):
+        nlp.add(
+            SentenceFilterProcessor(),
+            config={
+                **filter_config,
+                **config.query_cache.todict(),
+                "response_pack_name_prefix": hit_prefix,
+                "add_sentences": parallel,
+            },
+        )
+        hit_prefix = filter_config["candidate_pack_name_prefix"]
+    elif parallel:
+        raise ValueError(
+            "The parallel hit processors need the sentence filter to be "
+            "enabled."
+        )
+    return hit_prefix
+
+
+def response_configs(config: Config) -> Dict[str, Any]:
+    """The configs of the response creator. The answers are scored by the
+    order of the reranked papers when `config.reranker` is enabled."""
+    configs = {**config.response.todict(), **config.query_cache.todict()}
+    if config.reranker.enabled:
+        configs["ranked_pack_name_prefix"] = (
+            config.reranker.ranked_pack_name_prefix
+        )
+    return configs
+
+
+def build_search_pipeline(
+    config: Config,
+    reader: Optional[PackReader] = None,
+    response_creator: Optional[ResponseCreator] = None,
+):
+    # Build pipeline and add the reader, which will read from terminal
+    # unless another reader is given.
     nlp: Pipeline = Pipeline()
-    nlp.set_reader(reader=TerminalReader())
+    nlp.set_reader(reader=reader or TerminalReader())
 
     # Conduct query analysis.
-    nlp.add(NLTKSentenceSegmenter())
-    nlp.add(NLTKWordTokenizer())
-    nlp.add(NLTKPOSTagger())
-    nlp.add(NLTKLemmatizer())
-    nlp.add(AllenNLPProcessor(), config=config.allennlp_query)
+    add_query_processors(nlp, config)
 
     # Start to work on multi-packs in the rest of the pipeline, so we use a
     # boxer to change this.
     nlp.add(MultiPackBoxer(), config=config.boxer)
 
-    # Create query.
-    nlp.add(ElasticSearchQueryCreator(), config=config.query_creator)
+    # Create query and search the back end.
+    hit_prefix = add_retrieval_processors(nlp, config)
 
-    # Search the elastic back end.
-    nlp.add(ElasticSearchProcessor(), config=config.indexer)
+    # Keep the most promising papers, reduced to the sentences that can
+    # answer the query.
+    hit_prefix = add_hit_selection(nlp, config, hit_prefix)
+    parallel = config.parallel_hit_processors.enabled
 
     # process hits
-    pattern = rf"{config.indexer.response_pack_name_prefix}_\d"
+    pattern = rf"{hit_prefix}_\d"
     selector_hit = RegexNameMatchSelector(select_name=pattern)
+    add_hit_processors(nlp, config, selector_hit, parallel, pattern)
+
+    # generate outputs
     nlp.add(
-        component=SpacyProcessor(), config=config.spacy1, selector=selector_hit
+        response_creator or ResponseCreator(), config=response_configs(config)
     )
-    nlp.add(
-        component=SpacyProcessor(), config=config.spacy2, selector=selector_hit
+
+    return nlp
+
+
+def build_retrieval_pipeline(config: Config) -> Tuple[Pipeline, str]:
+    """Build the pipeline that analyzes the queries and retrieves their
+    papers, as the search pipeline does. Returns the pipeline and the name
+    prefix of the hit packs to be annotated."""
+    nlp: Pipeline = Pipeline()
+    nlp.set_reader(reader=StringReader())
+    add_query_processors(nlp, config)
+    nlp.add(MultiPackBoxer(), config=config.boxer)
+    hit_prefix = add_retrieval_processors(nlp, config)
+    return nlp, add_hit_selection(nlp, config, hit_prefix)
+
+
+def build_annotation_pipeline(config: Config, hit_prefix: str) -> Pipeline:
+    """Build the pipeline that annotates the unique papers of a batch of
+    queries, which are read as one MultiPack."""
+    if config.answer_budget.enabled:
+        raise ValueError(
+            "The answer budget works on the papers of a single query, it "
+            "cannot be enabled for a batch of queries."
+        )
+    nlp: Pipeline = Pipeline()
+    nlp.set_reader(reader=MultiPackListReader())
+    pattern = rf"{hit_prefix}_\d"
+    add_hit_processors(
+        nlp,
+        config,
+        RegexNameMatchSelector(select_name=pattern),
+        config.parallel_hit_processors.enabled,
+        pattern,
     )
-    nlp.add(AllenNLPProcessor(), config=config.allennlp, selector=selector_hit)
-    nlp.add(NLTKPOSTagger(), selector=selector_hit)
-    nlp.add(NLTKLemmatizer(), selector=selector_hit)
+    return nlp
 
-    # generate outputs
-    nlp.add(ResponseCreator(), config=config.response)
 
+def build_response_pipeline(
+    config: Config, response_creator: ResponseCreator, retrieval: Pipeline
+) -> Pipeline:
+    """Build the pipeline that answers the queries of a batch from their
+    annotated papers, the MultiPacks of the queries being read as they
+    are. It shares the resources, and thus the query analysis cache, of
+    the `retrieval` pipeline."""
+    nlp: Pipeline = Pipeline(resource=retrieval.resource)
+    nlp.set_reader(reader=MultiPackListReader())
+    nlp.add(response_creator, config=response_configs(config))
     return nlp
 
 
@@ -94,8 +414,19 @@ if __name__ == "__main__":
     for m_pack in nlp.process_dataset():
         print("The number of datapacks(including query) is", len(m_pack.packs))
 
-        data_pack = next(nlp.process_dataset()).get_pack_at(1)
-        sent = data_pack.get_single(Sentence)
+        if len(m_pack.packs) == 1:  # no paper found, only query
+            input("No result. Try another query: \n")
+            continue
+
+        # Only the hit packs picked by the selectors are annotated, e.g. the
+        # candidate packs of the sentence filter and not the full papers.
+        for data_pack in m_pack.packs[1:]:
+            sent = next(iter(data_pack.get(Sentence)), None)
+            if sent is not None:
+                break
+        else:
+            input("No annotated paper. Try another query: \n")
+            continue
 
         print(f"Sentence: {sent.text}")
         print("Entities created by SciSpacy:")
@@ -107,9 +438,5 @@ if __name__ == "__main__":
             verb = pred.get_parent()
             noun = pred.get_child()
             print(f"    verb: {data_pack.text[verb.begin:verb.end]}, noun: {data_pack.text[noun.begin:noun.end]}, noun_type: {pred.arg_type}")
-        
-        if len(m_pack.packs) == 1:  # no paper found, only query
-            input("No result. Try another query: \n")
-            continue
 
     print("Done")
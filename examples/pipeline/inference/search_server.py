@@ -0,0 +1,175 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Example script that serves the search pipeline over HTTP. The pipeline is
+built and initialized once, then answers every query with JSON, e.g.
+
+    curl -X POST localhost:8080/search -d '{"query": "What does covid-19 cause?"}'
+"""
+import argparse
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+import yaml
+from forte.common.configuration import Config
+from forte.data.multi_pack import MultiPack
+from forte.data.readers import StringReader
+from composable_source.processors.response_creator import (
+    RecordingResponseCreator,
+)
+from composable_source.utils.batch_search import (
+    annotate_batch,
+    process_all,
+    process_queries,
+)
+from composable_source.utils.search_service import SearchService
+from examples.pipeline.inference.search_cord19 import (
+    build_annotation_pipeline,
+    build_response_pipeline,
+    build_retrieval_pipeline,
+    build_search_pipeline,
+)
+
+Handler = Callable[[List[str]], List[Dict[str, Any]]]
+
+
+def build_answers(
+    config: Config,
+    creator: RecordingResponseCreator,
+    queries: List[str],
+    m_packs: List[MultiPack],
+    errors: Dict[int, str],
+    elapsed: float,
+) -> List[Dict[str, Any]]:
+    """
+    Take the answers of a batch of queries from the response creator, in
+    the order of the queries. The queries in `errors` are answered with
+    their error instead.
+    """
+    answers = []
+    m_pack_iter = iter(m_packs)
+    for idx, query in enumerate(queries):
+        if idx in errors:
+            answers.append({"query": query, "error": errors[idx]})
+            continue
+        m_pack = next(m_pack_iter)
+        status = creator.pop_status(m_pack)
+        answers.append(
+            {
+                "query": query,
+                # All packs other than the query are retrieved papers, or
+                # the candidate sentences of one.
+                "num_papers": len(
+                    {
+                        pack.pack_name
+                        for name, pack in m_pack.iter_packs()
+                        if name != config.response.query_pack_name
+                    }
+                ),
+                "results": creator.pop_records(m_pack),
+                # Whether the answer budget left some papers unannotated.
+                "partial": bool(status and status["partial"]),
+                "time": elapsed,
+                "batch_size": len(queries),
+            }
+        )
+    return answers
+
+
+def build_search_handler(config: Config) -> Handler:
+    """
+    Build and initialize the search pipelines, and return a function that
+    answers a batch of queries with them. The papers of all the queries of
+    a batch are retrieved first, then the unique papers of the batch are
+    annotated together, and the queries are answered from them. A query
+    that cannot be analyzed is answered with its error, and retrieves no
+    papers. The answer budget works on the papers of a single query, with
+    it the queries go through the whole search pipeline instead.
+    """
+    if config.answer_budget.enabled:
+        return build_pipeline_handler(config)
+
+    retrieval, hit_prefix = build_retrieval_pipeline(config)
+    annotation = build_annotation_pipeline(config, hit_prefix)
+    creator = RecordingResponseCreator()
+    response = build_response_pipeline(config, creator, retrieval)
+    for nlp in (retrieval, annotation, response):
+        nlp.initialize()
+
+    def handle(queries: List[str]) -> List[Dict[str, Any]]:
+        start = time.time()
+        # Every model runs once over the papers of the batch. The pipelines
+        # return the MultiPacks in the order of the queries.
+        m_packs, errors = annotate_batch(
+            retrieval, annotation, queries, hit_prefix
+        )
+        m_packs = process_all(response, m_packs)
+        elapsed = round(time.time() - start, 3)
+        return build_answers(config, creator, queries, m_packs, errors, elapsed)
+
+    return handle
+
+
+def build_pipeline_handler(config: Config) -> Handler:
+    """
+    Build and initialize the search pipeline, and return a function that
+    answers a batch of queries with it, one query after the other. A query
+    that cannot be analyzed is answered with its error.
+    """
+    creator = RecordingResponseCreator()
+    nlp = build_search_pipeline(
+        config, reader=StringReader(), response_creator=creator
+    )
+    nlp.initialize()
+
+    def handle(queries: List[str]) -> List[Dict[str, Any]]:
+        start = time.time()
+        # The pipeline returns the MultiPacks in the order of the queries.
+        m_packs, errors = process_queries(nlp, queries)
+        elapsed = round(time.time() - start, 3)
+        return build_answers(config, creator, queries, m_packs, errors, elapsed)
+
+    return handle
+
+
+def main(config_file: str):
+    config = yaml.safe_load(open(config_file, "r"))
+    config = Config(config, default_hparams=None)
+
+    service = SearchService(
+        build_search_handler(config),
+        host=config.service.host,
+        port=config.service.port,
+        queue_size=config.service.queue_size,
+        request_timeout=config.service.request_timeout,
+        batch_size=config.service.batch_size,
+        batch_window=config.service.batch_window,
+    )
+    service.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--config",
+        type=str,
+        default=os.path.join(os.path.dirname(__file__), "config.yml"),
+        help="Config of the search pipeline and the service.",
+    )
+
+    args = parser.parse_args()
+    main(args.config)
@@ -0,0 +1,59 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Example script that answers queries from the offline triplet index built by
+`examples/pipeline/indexer/triplet_indexer.py`.
+"""
+import os
+
+import yaml
+from forte.common.configuration import Config
+from forte.data.caster import MultiPackBoxer
+from forte.data.readers import TerminalReader
+from forte.pipeline import Pipeline
+from composable_source.processors.triplet_index_processor import (
+    TripletSearchResponseCreator,
+)
+from examples.pipeline.inference.search_cord19 import add_query_processors
+
+
+def build_triplet_search_pipeline(config: Config):
+    nlp: Pipeline = Pipeline()
+    nlp.set_reader(reader=TerminalReader())
+
+    # The query still goes through SRL, but the retrieved papers do not.
+    add_query_processors(nlp, config)
+    nlp.add(MultiPackBoxer(), config=config.boxer)
+    nlp.add(
+        TripletSearchResponseCreator(),
+        config={
+            **config.triplet_response.todict(),
+            **config.query_cache.todict(),
+        },
+    )
+
+    return nlp
+
+
+if __name__ == "__main__":
+    config_file = os.path.join(os.path.dirname(__file__), "config.yml")
+    config = yaml.safe_load(open(config_file, "r"))
+    config = Config(config, default_hparams=None)
+    nlp = build_triplet_search_pipeline(config)
+    nlp.initialize()
+
+    for _ in nlp.process_dataset():
+        pass
+
+    print("Done")
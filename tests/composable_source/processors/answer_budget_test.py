@@ -0,0 +1,250 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for AnswerBudgetProcessor.
+"""
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Title,
+    Token,
+)
+from composable_source.processors.answer_budget import (
+    AnswerBudgetProcessor,
+)
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+)
+from composable_source.processors.response_creator import ResponseCreator
+from composable_source.utils.query_cache import QueryAnalysisCache
+
+QUERY = "What does SARS-CoV-2 cause?"
+EFFECTS = ["fever", "cough", "renal injury", "fatigue", "anosmia"]
+
+
+class RelationTagger(ConcurrentPackProcessor):
+    r"""Labels the "X causes Y." sentence after the title of a pack, and
+    records the batches of packs it computes."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def compute_batch(self, input_packs):
+        self.batches.append(len(input_packs))
+        return super().compute_batch(input_packs)
+
+    def compute(self, input_pack: DataPack):
+        begin = input_pack.text.index("\n\n") + 2
+        sentence = input_pack.text[begin:].rstrip(".")
+        arg0, arg1 = sentence.split(" causes ")
+        verb = begin + len(arg0) + 1
+        return (
+            (begin, begin + len(sentence) + 1),
+            (begin, begin + len(arg0)),
+            (verb, verb + len("causes")),
+            (verb + len("causes "), begin + len(sentence)),
+        )
+
+    def write(self, input_pack: DataPack, result):
+        sentence, arg0, verb, arg1 = result
+        Sentence(input_pack, *sentence)
+        Token(input_pack, *verb).lemma = "cause"
+        predicate = PredicateMention(input_pack, *verb)
+        for arg_type, span in (("ARG0", arg0), ("ARG1", arg1)):
+            link = PredicateLink(
+                input_pack, predicate, PredicateArgument(input_pack, *span)
+            )
+            link.arg_type = arg_type
+
+
+class ExtractCounter(ResponseCreator):
+    r"""Records the papers whose relations it extracts."""
+
+    def initialize(self, resources, configs):
+        super().initialize(resources, configs)
+        self.extracted = []
+
+    def _process_datapack(self, p, pack, ent, verb_lemma, is_answer_arg0):
+        self.extracted.append(p)
+        return super()._process_datapack(
+            p, pack, ent, verb_lemma, is_answer_arg0
+        )
+
+
+class AnswerBudgetProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for AnswerBudgetProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "queries.db")
+        cache = QueryAnalysisCache(self.cache_path)
+        cache.put(QUERY, (QUERY, "SARS-CoV-2", "What", "cause", "cause", False))
+        cache.close()
+
+        self.m_pack = MultiPack()
+        query_pack = self.m_pack.add_pack("query")
+        query_pack.set_text(QUERY)
+        query_pack.pack_name = "query"
+        for idx, effect in enumerate(EFFECTS):
+            title = f"Paper {idx}"
+            pack = self.m_pack.add_pack(f"passage_{idx}")
+            pack.set_text(f"{title}\n\nSARS-CoV-2 causes {effect}.")
+            pack.pack_name = f"doc_{idx}"
+            Title(pack, 0, len(title))
+            pack.add_all_remaining_entries()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def process(self, configs):
+        resources = Resources()
+        tagger = RelationTagger()
+        processor = AnswerBudgetProcessor([tagger])
+        processor.initialize(
+            resources,
+            processor.make_configs(
+                {"query_cache_path": self.cache_path, **configs}
+            ),
+        )
+        processor.process(self.m_pack)
+        processor.finish(resources)
+        return resources, tagger.batches
+
+    def annotated(self):
+        return [
+            len(list(self.m_pack.get_pack(f"passage_{idx}").get(PredicateLink)))
+            > 0
+            for idx in range(len(EFFECTS))
+        ]
+
+    def test_max_answers(self):
+        resources, batches = self.process({"max_answers": 3, "chunk_size": 2})
+        # The papers are annotated in order, two at a time, until three
+        # answers are found.
+        self.assertEqual(batches, [2, 2])
+        self.assertEqual(self.annotated(), [True] * 4 + [False])
+
+        creator = ExtractCounter()
+        creator.initialize(
+            resources,
+            creator.make_configs({"query_cache_path": self.cache_path}),
+        )
+        output = io.StringIO()
+        with redirect_stdout(output):
+            creator.process(self.m_pack)
+        creator.finish(resources)
+        # The relations of the annotated papers are found once, by the
+        # budget processor.
+        self.assertEqual(creator.extracted, ["doc_4"])
+        self.assertIn("SARS-CoV-2\tcauses\trenal injury", output.getvalue())
+        self.assertNotIn("anosmia", output.getvalue())
+        self.assertIn(
+            "Partial results: the answers budget was reached after 4 of 5 "
+            "papers.",
+            output.getvalue(),
+        )
+
+    def test_no_budget(self):
+        resources, batches = self.process({})
+        self.assertEqual(batches, [4, 1])
+        self.assertEqual(self.annotated(), [True] * 5)
+        status = resources.get("answer_budget_status")[self.m_pack.pack_id]
+        relations = status.pop("relations")
+        self.assertEqual(
+            [
+                list(relations[pack.pack_id])
+                for name, pack in self.m_pack.iter_packs()
+                if name != "query"
+            ],
+            [[f"SARS-CoV-2\tcauses\t{effect}"] for effect in EFFECTS],
+        )
+        self.assertEqual(
+            status,
+            {
+                "partial": False,
+                "stop_reason": None,
+                "papers": 5,
+                "annotated_papers": 5,
+                "answers": 5,
+            },
+        )
+
+    def test_incremental(self):
+        resources = Resources()
+        tagger = RelationTagger()
+        streamed = []
+        creator = ResponseCreator(
+            sink=lambda m_pack, record: streamed.append(
+                (len(tagger.batches), record["arg1"], record["score"])
+            )
+        )
+        creator.initialize(
+            resources,
+            creator.make_configs(
+                {"query_cache_path": self.cache_path, "incremental": True}
+            ),
+        )
+        processor = AnswerBudgetProcessor([tagger])
+        processor.initialize(
+            resources,
+            processor.make_configs(
+                {"query_cache_path": self.cache_path, "chunk_size": 2}
+            ),
+        )
+        processor.process(self.m_pack)
+        # The answers of a chunk are streamed before the next chunk is
+        # annotated, the score is given by the retrieval rank.
+        self.assertEqual(
+            streamed,
+            [
+                (1, "fever", 1.0),
+                (1, "cough", 1 / 2),
+                (2, "renal injury", 1 / 3),
+                (2, "fatigue", 1 / 4),
+                (3, "anosmia", 1 / 5),
+            ],
+        )
+        output = io.StringIO()
+        with redirect_stdout(output):
+            creator.process(self.m_pack)
+        processor.finish(resources)
+        creator.finish(resources)
+        self.assertEqual(len(streamed), 5)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_deadline(self):
+        resources, batches = self.process({"deadline": 0})
+        self.assertEqual(batches, [])
+        self.assertEqual(self.annotated(), [False] * 5)
+        status = resources.get("answer_budget_status")[self.m_pack.pack_id]
+        self.assertTrue(status["partial"])
+        self.assertEqual(status["stop_reason"], "deadline")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for BatchedProcessor.
+"""
+import unittest
+
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import EntityMention, Sentence
+from composable_source.processors.batch_processor import (
+    BatchedProcessor,
+    token_batches,
+)
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+)
+
+
+class LineSplitter(ConcurrentPackProcessor):
+    r"""Adds a sentence for every line of the pack, and records the batches
+    of packs it computes."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def compute(self, input_pack: DataPack):
+        lines, begin = [], 0
+        for line in input_pack.text.split("\n"):
+            lines.append((begin, begin + len(line)))
+            begin += len(line) + 1
+        return lines
+
+    def compute_batch(self, input_packs):
+        self.batches.append(len(input_packs))
+        return super().compute_batch(input_packs)
+
+    def write(self, input_pack: DataPack, result):
+        for begin, end in result:
+            Sentence(input_pack, begin, end)
+
+
+class SentenceCounter(ConcurrentPackProcessor):
+    r"""Tags the first sentence of a pack with the number of sentences,
+    which the previous processor has to write before."""
+
+    def compute(self, input_pack: DataPack):
+        sentences = list(input_pack.get(Sentence))
+        return sentences[0].begin, sentences[0].end, len(sentences)
+
+    def write(self, input_pack: DataPack, result):
+        begin, end, count = result
+        EntityMention(input_pack, begin, end).ner_type = str(count)
+
+
+class BatchedProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for BatchedProcessor.
+    """
+
+    def test_token_batches(self):
+        texts = ["a b c", "d e", "f", "g h i j k", "l"]
+        self.assertEqual(token_batches(texts, 5), [[0, 1], [2], [3], [4]])
+        self.assertEqual(token_batches(texts, 6), [[0, 1, 2], [3, 4]])
+        self.assertEqual(token_batches(texts, None), [[0, 1, 2, 3, 4]])
+        self.assertEqual(token_batches([], 5), [])
+
+    def test_process(self):
+        splitter = LineSplitter()
+        processor = BatchedProcessor([splitter, SentenceCounter()])
+        processor.initialize(
+            Resources(),
+            processor.make_configs({"pack_name_pattern": r"passage_\d"}),
+        )
+        m_pack = MultiPack()
+        texts = {
+            "query": "Does the virus cause fever?",
+            "passage_0": "Fever\nThe virus causes fever.",
+            "passage_1": "Cough\nCough is common.\nIt is mild.",
+        }
+        for name, text in texts.items():
+            m_pack.add_pack(name).set_text(text)
+        processor.process(m_pack)
+        processor.finish(Resources())
+
+        # Both passages are computed in one batch.
+        self.assertEqual(splitter.batches, [2])
+        self.assertEqual(len(list(m_pack.get_pack("query").get(Sentence))), 0)
+        for name, count in (("passage_0", "2"), ("passage_1", "3")):
+            pack = m_pack.get_pack(name)
+            self.assertEqual(
+                [sentence.text for sentence in pack.get(Sentence)],
+                texts[name].split("\n"),
+            )
+            self.assertEqual(
+                [
+                    (mention.text, mention.ner_type)
+                    for mention in pack.get(EntityMention)
+                ],
+                [(texts[name].split("\n")[0], count)],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
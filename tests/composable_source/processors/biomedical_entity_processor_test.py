@@ -0,0 +1,239 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for BioMedicalEntityProcessor.
+"""
+import re
+import unittest
+from types import SimpleNamespace
+
+from spacy.tokens import Doc, Span
+from spacy.vocab import Vocab
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from ft.onto.base_ontology import Sentence, Token
+from ftx.onto.clinical import MedicalEntityMention
+from composable_source.processors.biomedical_entity_processor import (
+    BioMedicalEntityProcessor,
+)
+from composable_source.processors.umls_link_processor import (
+    CachedCandidateGenerator,
+)
+
+TEXT = "SARS-CoV-2 causes renal injury. Fever is common in COVID-19."
+
+# The mentions found by the first model and by the other ones.
+FIRST_MENTIONS = {"SARS-CoV-2": "ORGANISM", "renal injury": "PATHOLOGY"}
+HEAD_MENTIONS = {"renal injury": "DISEASE", "COVID-19": "DISEASE"}
+
+# The UMLS concepts linked to every (mention, ner_type).
+LINKS = {
+    ("SARS-CoV-2", "ORGANISM"): [("C5203676", 0.98)],
+    ("renal injury", "PATHOLOGY"): [("C0022660", 0.91)],
+    ("renal injury", "DISEASE"): [("C0022660", 0.91), ("C0041755", 0.74)],
+    ("COVID-19", "DISEASE"): [("C5203670", 1.0)],
+}
+CONCEPTS = {
+    cui: SimpleNamespace(
+        concept_id=cui,
+        canonical_name=f"name of {cui}",
+        definition=None,
+        types=["T047"],
+        aliases=[cui.lower()],
+    )
+    for links in LINKS.values()
+    for cui, _ in links
+}
+
+# The extensions set by the scispacy components when they are created.
+Doc.set_extension("abbreviations", default=[], force=True)
+Span.set_extension("long_form", default=None, force=True)
+Span.set_extension("kb_ents", default=[], force=True)
+
+
+class PhraseTagger:
+    r"""The NER component of a model, which tags `mentions` and records
+    the words of every document."""
+
+    def __init__(self, mentions):
+        self.mentions = mentions
+        self.words = []
+
+    def __call__(self, doc: Doc) -> Doc:
+        self.words.append([token.text for token in doc])
+        ents = []
+        for text, label in self.mentions.items():
+            begin = doc.text.find(text)
+            if begin >= 0:
+                ents.append(doc.char_span(begin, begin + len(text), label))
+        doc.ents = sorted(ents, key=lambda ent: ent.start)
+        return doc
+
+
+class Linker:
+    r"""The UMLS entity linker, which links the mentions of `LINKS` and
+    records the `ner_type` of the mentions of every document."""
+
+    def __init__(self):
+        self.kb = SimpleNamespace(cui_to_entity=CONCEPTS)
+        self.candidate_generator = None
+        self.linked = []
+
+    def __call__(self, doc: Doc) -> Doc:
+        self.linked.append([ent.label_ for ent in doc.ents])
+        for ent in doc.ents:
+            ent._.kb_ents = LINKS[(ent.text, ent.label_)]
+        return doc
+
+
+class FirstModel:
+    r"""The full pipeline of the first model, which tokenizes, splits the
+    sentences after every period, tags `FIRST_MENTIONS` and links them."""
+
+    def __init__(self, vocab: Vocab, linker):
+        self.vocab = vocab
+        self.tagger = PhraseTagger(FIRST_MENTIONS)
+        self.linker = linker
+        self.max_length = 1000
+
+    def pipe(self, texts, batch_size):
+        for text in texts:
+            matches = list(re.finditer(r"[\w-]+|[^\w\s]", text))
+            doc = Doc(
+                self.vocab,
+                words=[match.group() for match in matches],
+                spaces=[
+                    match.end() < len(text) and text[match.end()] == " "
+                    for match in matches
+                ],
+            )
+            for index, token in enumerate(doc):
+                token.is_sent_start = index == 0 or doc[index - 1].text == "."
+                token.tag_ = "NN"
+                token.lemma_ = token.text.lower().rstrip("s")
+            doc = self.tagger(doc)
+            yield self.linker(doc) if self.linker is not None else doc
+
+
+class StubEntityProcessor(BioMedicalEntityProcessor):
+    r"""Loads stand-ins of the scispacy models instead of the models."""
+
+    def load_models(self):
+        vocab = Vocab()
+        linker = Linker() if "umls_link" in self.processors else None
+        heads = [
+            SimpleNamespace(
+                vocab=vocab, pipeline=[("ner", PhraseTagger(HEAD_MENTIONS))]
+            )
+            for _ in self.configs.models[1:]
+        ]
+        return FirstModel(vocab, linker), heads, linker
+
+
+class BioMedicalEntityProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for BioMedicalEntityProcessor.
+    """
+
+    def process(self, processors, resources=None):
+        processor = StubEntityProcessor()
+        processor.initialize(
+            resources or Resources(),
+            processor.make_configs(
+                {"processors": processors, "models": ["first", "head"]}
+            ),
+        )
+        pack = DataPack()
+        pack.set_text(TEXT)
+        processor.process(pack)
+        pack.add_all_remaining_entries()
+        return processor, pack
+
+    def test_merge_mentions(self):
+        processor, pack = self.process("sentence, tokenize, lemma, umls_link")
+        processor.finish(Resources())
+
+        self.assertEqual(
+            [sentence.text for sentence in pack.get(Sentence)],
+            ["SARS-CoV-2 causes renal injury.", "Fever is common in COVID-19."],
+        )
+        tokens = list(pack.get(Token))
+        self.assertEqual(tokens[1].text, "causes")
+        self.assertEqual(tokens[1].lemma, "cause")
+        self.assertIsNone(tokens[1].pos)
+
+        # The span found by both models is one mention, with the ner_type of
+        # the first model and the concepts of both.
+        mentions = [
+            (
+                mention.text,
+                mention.ner_type,
+                [umls.cui for umls in mention.umls_entities],
+            )
+            for mention in pack.get(MedicalEntityMention)
+        ]
+        self.assertEqual(
+            mentions,
+            [
+                ("SARS-CoV-2", "ORGANISM", ["C5203676"]),
+                ("renal injury", "PATHOLOGY", ["C0022660", "C0041755"]),
+                ("COVID-19", "DISEASE", ["C5203670"]),
+            ],
+        )
+        umls = pack.get_single(MedicalEntityMention).umls_entities[0]
+        self.assertEqual(umls.score, "0.98")
+        self.assertEqual(umls.name, "name of C5203676")
+        self.assertEqual(umls.aliases, ["c5203676"])
+
+    def test_single_linker(self):
+        processor, _ = self.process("sentence, umls_link")
+        processor.finish(Resources())
+
+        # The other model tags the tokens of the first model.
+        first_words = processor.nlp.tagger.words
+        head_words = processor.heads[0].pipeline[0][1].words
+        self.assertEqual(head_words, first_words)
+        self.assertEqual(head_words[0][:3], ["SARS-CoV-2", "causes", "renal"])
+
+        # One linker links the mentions of both models, and looks up the
+        # candidates in the cache first.
+        self.assertEqual(
+            processor.linker.linked,
+            [["ORGANISM", "PATHOLOGY"], ["DISEASE", "DISEASE"]],
+        )
+        self.assertIsInstance(
+            processor.linker.candidate_generator, CachedCandidateGenerator
+        )
+
+    def test_shared_link_cache(self):
+        resources = Resources()
+        owner, _ = self.process("umls_link", resources)
+        other, _ = self.process("umls_link", resources)
+        self.assertIs(other.link_cache, owner.link_cache)
+        other.finish(resources)
+        owner.finish(resources)
+
+    def test_no_link(self):
+        processor, pack = self.process("sentence")
+        processor.finish(Resources())
+
+        self.assertIsNone(processor.linker)
+        self.assertEqual(len(list(pack.get(Sentence))), 2)
+        self.assertEqual(list(pack.get(MedicalEntityMention)), [])
+        # The other models only run to find mentions to link.
+        self.assertEqual(processor.heads[0].pipeline[0][1].words, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
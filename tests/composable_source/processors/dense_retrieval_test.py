@@ -0,0 +1,203 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for DensePackIndexProcessor and DenseSearchProcessor.
+"""
+import re
+import tempfile
+import unittest
+from typing import List
+
+import faiss
+import numpy as np
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.data.ontology.top import Query
+from ft.onto.base_ontology import Title
+from onto.cord19research import Passage
+from composable_source.processors.dense_retrieval import (
+    DensePackIndexProcessor,
+    DenseSearchProcessor,
+)
+from composable_source.utils.dense_index import DenseIndex
+
+VOCAB = ["masks", "transmission", "renal", "injury", "ace2", "receptors"]
+
+FILLER = "The cohort was followed for a year."
+
+
+class TermEncoder:
+    r"""Encodes texts into their normalized counts of the `VOCAB` terms,
+    with a constant dimension so that no vector is zero."""
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), len(VOCAB) + 1), dtype=np.float32)
+        vectors[:, -1] = 0.1
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                if word in VOCAB:
+                    vectors[row, VOCAB.index(word)] += 1
+        faiss.normalize_L2(vectors)
+        return vectors
+
+
+class TermIndexProcessor(DensePackIndexProcessor):
+    def _create_encoder(self):
+        return TermEncoder()
+
+
+def build_paper(title: str, body: str, name: str) -> DataPack:
+    pack = DataPack()
+    pack.set_text(f"{title}\n\n{body}")
+    pack.pack_name = name
+    Title(pack, 0, len(title))
+    pack.add_all_remaining_entries()
+    return pack
+
+
+def build_passage(title: str, passage: str, paper_id: str) -> DataPack:
+    pack = build_paper(title, passage, f"{paper_id}_0")
+    begin = len(title) + 2
+    annotation = Passage(pack, begin, len(pack.text))
+    annotation.paper_id = paper_id
+    annotation.section = "Results"
+    annotation.paper_begin = 500
+    annotation.paper_end = 500 + len(passage)
+    pack.add_all_remaining_entries()
+    return pack
+
+
+class DenseRetrievalTest(unittest.TestCase):
+    r"""
+    Unittest for the dense passage index and search.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # The ACE2 sentence of the first paper is far after the first 256
+        # word pieces of the paper.
+        self.papers = [
+            build_paper(
+                "Kidney findings",
+                " ".join(
+                    [FILLER] * 60
+                    + ["SARS-CoV-2 binds to ACE2 receptors."]
+                    + [FILLER] * 20
+                    + ["It causes renal injury."]
+                ),
+                "paper_kidney",
+            ),
+            build_paper("Masks", "Masks reduce transmission.", "paper_masks"),
+            build_passage(
+                "Lungs", "ACE2 is found in the lungs.", "paper_lungs"
+            ),
+        ]
+
+        indexer = TermIndexProcessor()
+        indexer.initialize(
+            Resources(),
+            indexer.make_configs(
+                {
+                    "index_dir": self.temp_dir.name,
+                    "index_factory": "Flat",
+                    "passage_size": 200,
+                }
+            ),
+        )
+        for pack in self.papers:
+            indexer.process(pack)
+        indexer.flush()
+        indexer.finish(Resources())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def search(self, query: str, configs=None) -> MultiPack:
+        m_pack = MultiPack()
+        query_pack = m_pack.add_pack("query")
+        query_pack.set_text(query)
+        Query(query_pack).value = TermEncoder().encode([query])
+        query_pack.add_all_remaining_entries()
+
+        searcher = DenseSearchProcessor()
+        searcher.initialize(
+            Resources(),
+            Config(
+                {"index_dir": self.temp_dir.name, "size": 2, **(configs or {})},
+                searcher.default_configs(),
+            ),
+        )
+        searcher.process(m_pack)
+        searcher.finish(Resources())
+        return m_pack
+
+    def test_index_passages(self):
+        index = DenseIndex(self.temp_dir.name)
+        documents = [index.document(row) for row in range(len(index))]
+        index.close()
+
+        kidney = [d for d in documents if d["paper_id"] == "paper_kidney"]
+        self.assertGreater(len(kidney), 1)
+        self.assertTrue(all(len(d["content"]) <= 200 for d in kidney))
+        self.assertTrue(all(d["title"] == "Kidney findings" for d in kidney))
+        # Only the first passage of a pack keeps the pack.
+        self.assertIsNotNone(kidney[0]["pack_info"])
+        self.assertTrue(all(d["pack_info"] is None for d in kidney[1:]))
+        self.assertTrue(all(d["paper_row"] == 0 for d in kidney))
+        text = self.papers[0].text
+        for document in kidney:
+            self.assertEqual(
+                text.index(document["content"], document["begin"]),
+                document["begin"],
+            )
+
+        # A passage pack is a passage of its own, with its paper offsets.
+        lungs = documents[-1]
+        self.assertEqual(lungs["paper_id"], "paper_lungs")
+        self.assertEqual(lungs["content"], "ACE2 is found in the lungs.")
+        self.assertEqual(lungs["begin"], 500)
+
+    def test_search_passages(self):
+        m_pack = self.search("ACE2 receptors renal injury", {"num_passages": 3})
+        hits = [pack for name, pack in m_pack.iter_packs() if name != "query"]
+        # The papers are ranked by their best passage, which is not at the
+        # beginning of the first paper.
+        self.assertEqual(
+            [pack.pack_name for pack in hits],
+            [str(self.papers[0].pack_id), str(self.papers[2].pack_id)],
+        )
+        # The pack of a paper holds its title and the passages found.
+        kidney = hits[0].text
+        self.assertTrue(kidney.startswith("Kidney findings\n\n"))
+        self.assertIn("SARS-CoV-2 binds to ACE2 receptors.", kidney)
+        self.assertIn("It causes renal injury.", kidney)
+        self.assertLess(len(kidney), len(self.papers[0].text))
+        self.assertEqual(
+            set(m_pack.get_pack("query").get_single(Query).results),
+            {pack.pack_name for pack in hits},
+        )
+
+    def test_search_packs(self):
+        m_pack = self.search(
+            "renal injury", {"size": 1, "indexed_text_only": False}
+        )
+        hit = m_pack.get_pack("passage_0")
+        self.assertEqual(hit.text, self.papers[0].text)
+        self.assertEqual(hit.pack_name, str(self.papers[0].pack_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
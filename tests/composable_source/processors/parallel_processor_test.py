@@ -0,0 +1,190 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for ParallelProcessor and ShardedProcessor.
+"""
+import os
+import threading
+import unittest
+
+from forte.common.exception import ProcessorConfigError
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import EntityMention, Sentence
+from composable_source.processors.parallel_processor import (
+    ConcurrentPackProcessor,
+    ParallelProcessor,
+    ShardedProcessor,
+)
+
+
+class WordTagger(ConcurrentPackProcessor):
+    r"""Tags the occurrences of a word, after waiting for the other
+    processors at a barrier."""
+
+    def __init__(self, barrier: threading.Barrier, written: list):
+        super().__init__()
+        self.barrier = barrier
+        self.written = written
+
+    @classmethod
+    def default_configs(cls):
+        return {"word": None}
+
+    def compute(self, input_pack: DataPack):
+        # Times out unless every processor computes at the same time.
+        self.barrier.wait(timeout=5)
+        begin = input_pack.text.find(self.configs.word)
+        return begin, begin + len(self.configs.word)
+
+    def write(self, input_pack: DataPack, result):
+        mention = EntityMention(input_pack, *result)
+        mention.ner_type = self.configs.word
+        self.written.append(self.configs.word)
+
+
+class SentenceTagger(ConcurrentPackProcessor):
+    r"""Adds a sentence for every line of the pack, and records the process
+    where it is computed."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def after_fork(self):
+        self.forked = True
+
+    def compute(self, input_pack: DataPack):
+        lines, begin = [], 0
+        for line in input_pack.text.split("\n"):
+            lines.append((begin, begin + len(line)))
+            begin += len(line) + 1
+        return os.getpid(), getattr(self, "forked", False), lines
+
+    def write(self, input_pack: DataPack, result):
+        self.written.append(result)
+        _, _, lines = result
+        for begin, end in lines:
+            Sentence(input_pack, begin, end)
+
+
+class SentenceLengthTagger(ConcurrentPackProcessor):
+    r"""Tags the sentences added by the previous processor, which have to
+    be written before it computes."""
+
+    def compute(self, input_pack: DataPack):
+        return [
+            (sentence.begin, sentence.end)
+            for sentence in input_pack.get(Sentence)
+        ]
+
+    def write(self, input_pack: DataPack, result):
+        for begin, end in result:
+            mention = EntityMention(input_pack, begin, end)
+            mention.ner_type = str(end - begin)
+
+
+class ParallelProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for ParallelProcessor.
+    """
+
+    def setUp(self):
+        self.written = []
+
+    def test_process(self):
+        barrier = threading.Barrier(2)
+        processor = ParallelProcessor(
+            [WordTagger(barrier, self.written) for _ in range(2)]
+        )
+        processor.initialize(
+            Resources(),
+            processor.make_configs(
+                {"processors": [{"word": "fever"}, {"word": "virus"}]}
+            ),
+        )
+        pack = DataPack()
+        pack.set_text("The virus causes fever.")
+        processor.process(pack)
+        pack.add_all_remaining_entries()
+        processor.finish(Resources())
+
+        self.assertEqual(
+            [mention.text for mention in pack.get(EntityMention)],
+            ["virus", "fever"],
+        )
+        # The results are written in the order of the processors.
+        self.assertEqual(self.written, ["fever", "virus"])
+
+    def test_configs(self):
+        barrier = threading.Barrier(1)
+        processor = ParallelProcessor([WordTagger(barrier, self.written)])
+        with self.assertRaises(ProcessorConfigError):
+            processor.initialize(
+                Resources(),
+                processor.make_configs({"processors": [{}, {}]}),
+            )
+
+
+class ShardedProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for ShardedProcessor.
+    """
+
+    def test_process(self):
+        sentence_tagger = SentenceTagger()
+        processor = ShardedProcessor([sentence_tagger, SentenceLengthTagger()])
+        processor.initialize(
+            Resources(),
+            processor.make_configs(
+                {"num_workers": 2, "pack_name_pattern": r"passage_\d"}
+            ),
+        )
+        m_pack = MultiPack()
+        texts = {
+            "query": "Does the virus cause fever?",
+            "passage_0": "Fever\nThe virus causes fever.",
+            "passage_1": "Cough\nCough is common.",
+        }
+        for name, text in texts.items():
+            m_pack.add_pack(name).set_text(text)
+        processor.process(m_pack)
+        processor.finish(Resources())
+
+        self.assertEqual(len(list(m_pack.get_pack("query").get(Sentence))), 0)
+        for name, lengths in (
+            ("passage_0", ["5", "23"]),
+            ("passage_1", ["5", "16"]),
+        ):
+            pack = m_pack.get_pack(name)
+            self.assertEqual(
+                [sentence.text for sentence in pack.get(Sentence)],
+                texts[name].split("\n"),
+            )
+            self.assertEqual(
+                [mention.ner_type for mention in pack.get(EntityMention)],
+                lengths,
+            )
+
+        # The results are computed by forked workers, then written into the
+        # packs of the main process.
+        self.assertEqual(len(sentence_tagger.written), 2)
+        for pid, forked, _ in sentence_tagger.written:
+            self.assertNotEqual(pid, os.getpid())
+            self.assertTrue(forked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the passage and section index processors.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.data.data_pack import DataPack
+from forte.pipeline import Pipeline
+from composable_source.readers import CORDReader
+from composable_source.processors.passage_index_processor import (
+    SECTION_FIELDS,
+    BM25PassageIndexProcessor,
+    passage_fields,
+    section_fields,
+)
+from composable_source.utils.bm25_index import BM25Index
+
+DATASET = "sample_data/tests/cord19research"
+
+
+class BM25PassageIndexProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for BM25PassageIndexProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_index_passages(self):
+        pipeline = Pipeline[DataPack]()
+        pipeline.set_reader(CORDReader(), config={"passage_unit": "paragraph"})
+        pipeline.add(
+            BM25PassageIndexProcessor(),
+            config={
+                "index_dir": self.temp_dir.name,
+                "indexer": {"hparams": {"index_name": "test"}},
+            },
+        )
+        pipeline.initialize()
+        packs = list(pipeline.process_dataset(DATASET))
+        pipeline.finish()
+
+        index = BM25Index(os.path.join(self.temp_dir.name, "test"))
+        self.assertEqual(len(index), 3)
+        hits = index.search(
+            {
+                "query": {
+                    "match_phrase": {"content": "multiple factors"},
+                }
+            }
+        )["hits"]["hits"]
+        self.assertEqual(len(hits), 1)
+        document = hits[0]["_source"]
+        self.assertEqual(document["doc_id"], str(packs[2].pack_id))
+        self.assertEqual(document["paper_id"], "cord_sample_paper")
+        self.assertEqual(document["section"], "")
+        self.assertEqual(
+            [document["begin"], document["end"]],
+            passage_fields(packs[2])[2:],
+        )
+        index.close()
+
+    def test_section_fields(self):
+        pipeline = Pipeline[DataPack]()
+        pipeline.set_reader(CORDReader())
+        pipeline.add(
+            BM25PassageIndexProcessor(),
+            config={
+                "index_dir": self.temp_dir.name,
+                "indexer": {"hparams": {"index_name": "test"}},
+                "section_fields": True,
+            },
+        )
+        pipeline.initialize()
+        (paper,) = pipeline.process_dataset(DATASET)
+        pipeline.finish()
+
+        title, abstract, body, title_abstract = section_fields(paper)
+        self.assertEqual(paper.text, f"{title_abstract}\n\n{body}")
+        self.assertTrue(abstract.startswith("Background: SARS-CoV-2"))
+
+        index = BM25Index(os.path.join(self.temp_dir.name, "test"))
+        self.assertEqual(index.fields, ["content"] + SECTION_FIELDS)
+        # The phrase is in the body only.
+        for field, expected in (("title_abstract", 0), ("body", 1)):
+            query = {"query": {"match_phrase": {field: "multiple factors"}}}
+            hits = index.search(query)["hits"]["hits"]
+            self.assertEqual(len(hits), expected)
+        index.close()
+
+    def test_paper_fields(self):
+        pipeline = Pipeline[DataPack]()
+        pipeline.set_reader(CORDReader())
+        pipeline.initialize()
+        paper = pipeline.process_one(DATASET)
+        # A whole paper is a passage of itself.
+        self.assertEqual(
+            passage_fields(paper),
+            [paper.pack_name, "", 0, len(paper.text)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
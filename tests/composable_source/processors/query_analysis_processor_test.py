@@ -0,0 +1,111 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for QueryAnalysisProcessor.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from onto.cord19research import AnalyzedQuery
+from composable_source.processors.query_analysis_processor import (
+    QueryAnalysisProcessor,
+)
+from composable_source.utils.query_cache import (
+    QueryAnalysisCache,
+    cached_query_preprocess,
+)
+from tests.composable_source.utils.query_cache_test import (
+    ANALYSIS,
+    QUERY,
+    build_query_pack,
+)
+
+
+class QueryAnalysisProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for QueryAnalysisProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "queries.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def process(self, pack: DataPack, configs=None) -> DataPack:
+        resources = Resources()
+        processor = QueryAnalysisProcessor()
+        processor.initialize(resources, processor.make_configs(configs))
+        processor.process(pack)
+        pack.add_all_remaining_entries()
+        processor.finish(resources)
+        return pack
+
+    def test_analyze(self):
+        pack = self.process(build_query_pack(QUERY))
+        entry = pack.get_single(AnalyzedQuery)
+        self.assertEqual(
+            (
+                entry.text,
+                entry.arg0,
+                entry.arg1,
+                entry.predicate,
+                entry.verb_lemma,
+                entry.is_answer_arg0,
+            ),
+            ANALYSIS,
+        )
+        self.assertEqual(cached_query_preprocess(pack), ANALYSIS)
+
+    def test_read_entry(self):
+        # The entry is read without the annotations of the query.
+        pack = build_query_pack(QUERY)
+        self.process(pack)
+        copy = build_query_pack(QUERY, annotated=False)
+        entry = AnalyzedQuery(copy, 0, len(QUERY))
+        for name, value in zip(
+            ("arg0", "arg1", "predicate", "verb_lemma", "is_answer_arg0"),
+            ANALYSIS[1:],
+        ):
+            setattr(entry, name, value)
+        copy.add_all_remaining_entries()
+        self.assertEqual(cached_query_preprocess(copy), ANALYSIS)
+
+        # A pack is only analyzed once.
+        self.process(pack)
+        self.assertEqual(len(list(pack.get(AnalyzedQuery))), 1)
+
+    def test_cache(self):
+        configs = {"query_cache_path": self.cache_path}
+        self.process(build_query_pack(QUERY), configs)
+        cache = QueryAnalysisCache(self.cache_path)
+        self.assertEqual(cache.get(QUERY), ANALYSIS)
+        cache.close()
+
+        # Another spelling of a cached query needs no annotations, the
+        # entry then spans the whole query.
+        text = " what does COVID-19 cause \n"
+        pack = self.process(build_query_pack(text, annotated=False), configs)
+        entry = pack.get_single(AnalyzedQuery)
+        self.assertEqual(entry.text, "what does COVID-19 cause")
+        self.assertEqual(entry.arg0, "covid-19")
+        self.assertFalse(entry.is_answer_arg0)
+
+
+if __name__ == "__main__":
+    unittest.main()
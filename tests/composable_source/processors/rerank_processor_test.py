@@ -0,0 +1,116 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for LexicalRerankProcessor.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.common.resources import Resources
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import Title
+from onto.cord19research import Abstract
+from composable_source.processors.rerank_processor import (
+    LexicalRerankProcessor,
+    lexical_features,
+)
+from composable_source.processors.response_creator import paper_ranks
+from composable_source.utils.query_cache import QueryAnalysisCache
+
+QUERY = "What does SARS-CoV-2 cause?"
+PAPERS = [
+    ("Hospital capacity", "Beds were scarce. Staff worked long shifts."),
+    (
+        "Kidney outcomes",
+        "SARS-CoV-2 was detected. Renal injury was frequent in patients.",
+    ),
+    (
+        "SARS-CoV-2 causes renal injury",
+        "SARS-CoV-2 causes renal injury. SARS-CoV-2 also causes fever.",
+    ),
+]
+
+
+class LexicalRerankProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for LexicalRerankProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "queries.db")
+        cache = QueryAnalysisCache(self.cache_path)
+        cache.put(QUERY, (QUERY, "SARS-CoV-2", "What", "cause", "cause", False))
+        cache.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_features(self):
+        features = lexical_features(
+            "Title. SARS-CoV-2 often causes fever. Fever is caused by "
+            "SARS-CoV-2 infection.",
+            "SARS-CoV-2",
+            "cause",
+            title="A SARS-CoV-2 study",
+        )
+        self.assertEqual(
+            features,
+            {"sentence": 0.2, "proximity": 0.5, "title": 0.5, "abstract": 0.0},
+        )
+        self.assertEqual(
+            lexical_features("Nothing relevant.", "SARS-CoV-2", "cause"),
+            {"sentence": 0.0, "proximity": 0.0, "title": 0.0, "abstract": 0.0},
+        )
+
+    def test_process(self):
+        m_pack = MultiPack()
+        query_pack = m_pack.add_pack("query")
+        query_pack.set_text(QUERY)
+        query_pack.pack_name = "query"
+        for idx, (title, abstract) in enumerate(PAPERS):
+            pack = m_pack.add_pack(f"passage_{idx}")
+            pack.set_text(f"{title}\n\n{abstract}")
+            pack.pack_name = f"doc_{idx}"
+            Title(pack, 0, len(title))
+            Abstract(pack, len(title) + 2, len(pack.text))
+            pack.add_all_remaining_entries()
+
+        retrieved = [pack for _, pack in m_pack.iter_packs()][1:]
+
+        processor = LexicalRerankProcessor()
+        processor.initialize(
+            Resources(),
+            processor.make_configs(
+                {"query_cache_path": self.cache_path, "top_n": 2}
+            ),
+        )
+        processor.process(m_pack)
+        processor.finish(Resources())
+
+        # The kept packs are renamed in place, the others keep their names.
+        self.assertEqual(
+            m_pack.pack_names, ["query", "passage_0", "ranked_1", "ranked_0"]
+        )
+        self.assertIs(m_pack.get_pack("ranked_0"), retrieved[2])
+        self.assertIs(m_pack.get_pack("ranked_1"), retrieved[1])
+        self.assertEqual(
+            paper_ranks(m_pack, "query", "ranked"),
+            {"doc_2": 0, "doc_1": 1, "doc_0": 2},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for PackMatchIndex and extract_relations.
+"""
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Title,
+    Token,
+)
+from ftx.onto.clinical import MedicalEntityMention, UMLSConceptLink
+from composable_source.processors.response_creator import (
+    PackMatchIndex,
+    ResponseCreator,
+    extract_relations,
+    format_umls_concept,
+)
+from composable_source.utils.query_cache import QueryAnalysisCache
+
+QUERY = "What does COVID-19 cause?"
+
+TITLE = "Symptoms of COVID-19"
+# (sentence, verb, verb lemma, arg0, arg1), the first sentence is split in
+# two in the middle of the entity.
+SENTENCES = [
+    ("Reports on COVID", None, None, None, None),
+    ("-19 list fever.", None, None, None, None),
+    (
+        "COVID-19 causes fever and cough.",
+        "causes",
+        "cause",
+        "COVID-19",
+        "fever and cough",
+    ),
+    ("Influenza causes fever.", "causes", "cause", "Influenza", "fever"),
+    ("Covid-19 induces anosmia.", "induces", "induce", "Covid-19", "anosmia"),
+    (
+        "Fatigue is caused by COVID-19.",
+        "caused",
+        "cause",
+        "COVID-19",
+        "Fatigue",
+    ),
+]
+# (text, sentence, concepts as (name, cui))
+MENTIONS = [
+    ("COVID-19", 2, [("COVID-19", "C5203670")]),
+    ("fever", 2, [("Fever", "C0015967")]),
+    ("cough", 2, []),
+    ("COVID-19", 5, [("COVID-19", "C5203670")]),
+]
+
+
+def build_pack() -> DataPack:
+    text = f"{TITLE}\n\n{SENTENCES[0][0]}" + " ".join(
+        sentence for sentence, *_ in SENTENCES[1:]
+    )
+    pack = DataPack()
+    pack.set_text(text)
+    pack.pack_name = "paper_0"
+    Title(pack, 0, len(TITLE))
+
+    begin = len(TITLE) + 2
+    sentences = []
+    for sentence, verb, lemma, arg0, arg1 in SENTENCES:
+        begin = text.index(sentence, begin)
+        sentences.append(Sentence(pack, begin, begin + len(sentence)))
+
+        def span(part, start=begin):
+            part_begin = text.index(part, start)
+            return part_begin, part_begin + len(part)
+
+        begin += len(sentence)
+        if verb is None:
+            continue
+        for word in sentence.rstrip(".").split():
+            token = Token(pack, *span(word))
+            token.lemma = lemma if word == verb else word.lower()
+        predicate = PredicateMention(pack, *span(verb))
+        for arg_type, argument in (("ARG0", arg0), ("ARG1", arg1)):
+            link = PredicateLink(
+                pack, predicate, PredicateArgument(pack, *span(argument))
+            )
+            link.arg_type = arg_type
+
+    for mention_text, index, concepts in MENTIONS:
+        begin = text.index(mention_text, sentences[index].begin)
+        mention = MedicalEntityMention(pack, begin, begin + len(mention_text))
+        for name, cui in concepts:
+            umls = UMLSConceptLink(pack)
+            umls.name = name
+            umls.cui = cui
+            mention.umls_entities.append(umls)
+    pack.add_all_remaining_entries()
+    return pack
+
+
+class PackMatchIndexTest(unittest.TestCase):
+    r"""
+    Unittest for PackMatchIndex.
+    """
+
+    def setUp(self):
+        self.index = PackMatchIndex(build_pack())
+
+    def test_sentences_with(self):
+        # The entity split by a sentence boundary is not found.
+        self.assertEqual(self.index.sentences_with("covid-19"), [2, 4, 5])
+        self.assertEqual(self.index.sentences_with("fever"), [1, 2, 3])
+        self.assertEqual(self.index.sentences_with("measles"), [])
+        self.assertEqual(
+            self.index.sentences_with(""), list(range(len(SENTENCES)))
+        )
+
+    def test_relations(self):
+        self.assertEqual(
+            self.index.relations(2, "cause"),
+            {"causes": {"ARG0": "COVID-19", "ARG1": "fever and cough"}},
+        )
+        self.assertEqual(self.index.relations(4, "cause"), {})
+        self.assertEqual(self.index.relations(0, "cause"), {})
+
+    def test_mentions(self):
+        self.assertEqual(
+            self.index.mentions[2],
+            [
+                ("covid-19", [format_umls_concept("COVID-19", "C5203670")]),
+                ("fever", [format_umls_concept("Fever", "C0015967")]),
+                ("cough", []),
+            ],
+        )
+        self.assertEqual(self.index.mentions[3], [])
+
+
+class ExtractRelationsTest(unittest.TestCase):
+    r"""
+    Unittest for extract_relations.
+    """
+
+    def test_extract_relations(self):
+        result = extract_relations(
+            "doc_0", build_pack(), "covid-19", "cause", False
+        )
+        concept = format_umls_concept("COVID-19", "C5203670")
+        self.assertEqual(
+            dict(result),
+            {
+                "COVID-19\tcauses\tfever and cough": [
+                    [("COVID-19", "causes", "fever and cough", 8, 15), "doc_0"],
+                    ("COVID-19 causes fever and cough.", TITLE),
+                    {"covid-19": {concept}},
+                ],
+                "COVID-19\tcaused\tFatigue": [
+                    [("COVID-19", "caused", "Fatigue", 8, 7), "doc_0"],
+                    ("Fatigue is caused by COVID-19.", TITLE),
+                    {"covid-19": {concept}},
+                ],
+            },
+        )
+
+    def test_answer_arg0(self):
+        result = extract_relations(
+            "doc_0", build_pack(), "fever", "cause", True
+        )
+        self.assertEqual(
+            dict(result),
+            {
+                "COVID-19\tcauses\tfever and cough": [
+                    [("COVID-19", "causes", "fever and cough", 15, 8), "doc_0"],
+                    ("COVID-19 causes fever and cough.", TITLE),
+                    {"covid-19": {format_umls_concept("COVID-19", "C5203670")}},
+                ],
+                "Influenza\tcauses\tfever": [
+                    [("Influenza", "causes", "fever", 5, 9), "doc_0"],
+                    ("Influenza causes fever.", TITLE),
+                    {},
+                ],
+            },
+        )
+
+
+class ResponseCreatorTest(unittest.TestCase):
+    r"""
+    Unittest for the record sink, the incremental mode and the reranked
+    papers of ResponseCreator.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "queries.db")
+        cache = QueryAnalysisCache(self.cache_path)
+        cache.put(QUERY, (QUERY, "COVID-19", "What", "cause", "cause", False))
+        cache.close()
+
+        self.m_pack = MultiPack()
+        query_pack = self.m_pack.add_pack("query")
+        query_pack.set_text(QUERY)
+        query_pack.pack_name = "query"
+        for idx in range(2):
+            pack = build_pack()
+            pack.pack_name = f"paper_{idx}"
+            self.m_pack.add_pack_(pack, f"passage_{idx}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def process(self, incremental, **configs):
+        records = []
+        creator = ResponseCreator(
+            sink=lambda m_pack, record: records.append(
+                (record["arg1"], record["doc_id"], record["score"])
+            )
+        )
+        resources = Resources()
+        creator.initialize(
+            resources,
+            creator.make_configs(
+                {
+                    "query_cache_path": self.cache_path,
+                    "incremental": incremental,
+                    **configs,
+                }
+            ),
+        )
+        output = io.StringIO()
+        with redirect_stdout(output):
+            creator.process(self.m_pack)
+        creator.finish(resources)
+        self.assertEqual(output.getvalue(), "")
+        return records
+
+    def test_sink(self):
+        # The answers are kept from the last paper that has them.
+        self.assertEqual(
+            self.process(False),
+            [
+                ("Fatigue", "paper_1", 1 / 2),
+                ("fever and cough", "paper_1", 1 / 2),
+            ],
+        )
+
+    def test_ranked_packs(self):
+        # The second paper is reranked first.
+        self.m_pack.rename_pack("passage_1", "ranked_0")
+        self.assertEqual(
+            self.process(False, ranked_pack_name_prefix="ranked"),
+            [
+                ("Fatigue", "paper_1", 1.0),
+                ("fever and cough", "paper_1", 1.0),
+            ],
+        )
+
+    def test_incremental(self):
+        # The answers are streamed from the first paper that has them.
+        self.assertEqual(
+            self.process(True),
+            [
+                ("Fatigue", "paper_0", 1.0),
+                ("fever and cough", "paper_0", 1.0),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for SentenceFilterProcessor.
+"""
+import os
+import tempfile
+import unittest
+
+from ddt import ddt, data, unpack
+from nltk import data as nltk_data
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import Sentence, Title
+from composable_source.processors.sentence_filter import (
+    SentenceFilterProcessor,
+    candidate_sentences,
+    split_sentences,
+    verb_lemmatizer,
+)
+from composable_source.utils.query_cache import QueryAnalysisCache
+
+QUERY = "What does covid-19 cause?"
+TITLE = "Kidney involvement of COVID-19"
+PAPER = (
+    f"{TITLE}\n\nCOVID-19 causes renal injury, e.g. in older patients. "
+    "Masks reduce transmission.\n\nWe report that COVID-19 can affect the "
+    "liver. Fever is caused by COVID-19 in 3 cases"
+)
+BIND_PAPER = (
+    "The spike protein of SARS-CoV-2 bound ACE2. The spike protein binds "
+    "ACE2. The spike protein of SARS-CoV-2 was found in the lungs."
+)
+
+
+def has_wordnet() -> bool:
+    try:
+        nltk_data.find("corpora/wordnet")
+    except LookupError:
+        return False
+    return True
+
+
+# The processor downloads the WordNet data, which cannot be reached without
+# network access.
+HAS_WORDNET = has_wordnet()
+
+
+def build_multi_pack() -> MultiPack:
+    multi_pack = MultiPack()
+    multi_pack.add_pack("query").set_text(QUERY)
+    for idx, text in enumerate((PAPER, "Masks\n\nMasks reduce transmission")):
+        pack = multi_pack.add_pack(f"passage_{idx}")
+        pack.set_text(text)
+        pack.pack_name = f"paper_{idx}"
+        Title(pack, 0, text.index("\n"))
+        pack.add_all_remaining_entries()
+    return multi_pack
+
+
+@ddt
+class SentenceFilterProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for SentenceFilterProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "queries.db")
+        cache = QueryAnalysisCache(self.cache_path)
+        cache.put(QUERY, (QUERY, "covid-19", "What", "cause", "cause", False))
+        cache.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_split_sentences(self):
+        self.assertEqual(
+            [PAPER[begin:end] for begin, end in split_sentences(PAPER)],
+            [
+                TITLE,
+                "COVID-19 causes renal injury, e.g. in older patients.",
+                "Masks reduce transmission.",
+                "We report that COVID-19 can affect the liver.",
+                "Fever is caused by COVID-19 in 3 cases",
+            ],
+        )
+
+    @data(
+        (
+            "cause",
+            [
+                "COVID-19 causes renal injury, e.g. in older patients.",
+                "Fever is caused by COVID-19 in 3 cases",
+            ],
+        ),
+        ("affect", ["We report that COVID-19 can affect the liver."]),
+        ("bind", []),
+    )
+    @unpack
+    def test_candidate_sentences(self, verb_lemma, expected):
+        candidates = candidate_sentences(
+            PAPER, "covid-19", verb_lemma, len(TITLE)
+        )
+        self.assertEqual(
+            [PAPER[begin:end] for begin, end in candidates], expected
+        )
+        self.assertEqual(
+            len(candidate_sentences(PAPER, "COVID-19", None, len(TITLE))), 3
+        )
+
+    def test_irregular_verb(self):
+        lemmas = {"bound": "bind", "found": "find"}
+
+        def lemmatize(word):
+            return lemmas.get(word, word)
+
+        candidates = candidate_sentences(BIND_PAPER, "protein", "bind")
+        self.assertEqual(
+            [BIND_PAPER[begin:end] for begin, end in candidates],
+            ["The spike protein binds ACE2."],
+        )
+        candidates = candidate_sentences(
+            BIND_PAPER, "protein", "bind", lemmatize=lemmatize
+        )
+        self.assertEqual(
+            [BIND_PAPER[begin:end] for begin, end in candidates],
+            [
+                "The spike protein of SARS-CoV-2 bound ACE2.",
+                "The spike protein binds ACE2.",
+            ],
+        )
+
+    @unittest.skipUnless(HAS_WORDNET, "The WordNet data is not downloaded.")
+    def test_verb_lemmatizer(self):
+        lemmatize = verb_lemmatizer()
+        self.assertEqual(lemmatize("bound"), "bind")
+        self.assertEqual(lemmatize("caused"), "cause")
+        self.assertEqual(lemmatize("protein"), "protein")
+
+    @data(True, False)
+    def test_process(self, match_verb):
+        processor = SentenceFilterProcessor()
+        processor.initialize(
+            Resources(),
+            Config(
+                {
+                    "query_cache_path": self.cache_path,
+                    "match_verb": match_verb,
+                    "lemmatize_verb": HAS_WORDNET,
+                },
+                processor.default_configs(),
+            ),
+        )
+        multi_pack = build_multi_pack()
+        processor.process(multi_pack)
+        processor.finish(Resources())
+
+        # No pack is added for the paper without candidate sentences.
+        self.assertEqual(
+            multi_pack.pack_names,
+            ["query", "passage_0", "passage_1", "candidate_0"],
+        )
+        pack = multi_pack.get_pack("candidate_0")
+        self.assertEqual(pack.pack_name, "paper_0")
+        self.assertEqual(pack.get_single(Title).text, TITLE)
+
+        sentences = pack.text.split("\n\n")[1:]
+        self.assertEqual(len(sentences), 2 if match_verb else 3)
+        self.assertNotIn("Masks reduce transmission.", pack.text)
+        self.assertEqual(list(pack.get(Sentence)), [])
+
+    def test_add_sentences(self):
+        processor = SentenceFilterProcessor()
+        processor.initialize(
+            Resources(),
+            Config(
+                {
+                    "query_cache_path": self.cache_path,
+                    "add_sentences": True,
+                    "lemmatize_verb": HAS_WORDNET,
+                },
+                processor.default_configs(),
+            ),
+        )
+        multi_pack = build_multi_pack()
+        processor.process(multi_pack)
+        processor.finish(Resources())
+
+        pack = multi_pack.get_pack("candidate_0")
+        self.assertEqual(
+            [sentence.text for sentence in pack.get(Sentence)],
+            [
+                TITLE,
+                "COVID-19 causes renal injury, e.g. in older patients.",
+                "Fever is caused by COVID-19 in 3 cases",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
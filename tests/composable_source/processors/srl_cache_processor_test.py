@@ -0,0 +1,181 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for SRLCacheProcessor.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.processors.base import PackProcessor
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Token,
+)
+from composable_source.processors.srl_cache_processor import (
+    SRLCacheProcessor,
+)
+
+SENTENCES = [
+    "Fever is rare.",
+    "SARS-CoV-2 causes renal injury.",
+    "Fever is rare.",
+]
+
+
+class VerbLabeler(PackProcessor):
+    r"""Labels every "X <verb>s Y" sentence, and records the sentences and
+    the size of every batch."""
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.labeled = []
+        self.batches = []
+
+    @classmethod
+    def default_configs(cls):
+        return {"srl_url": "model.tar.gz", "cuda_devices": []}
+
+    def _process(self, input_pack: DataPack):
+        self.batches.append(len(list(input_pack.get(Sentence))))
+        for sentence in input_pack.get(Sentence):
+            self.labeled.append(sentence.text)
+            words = sentence.text.rstrip(".").split(" ")
+            begin = sentence.begin
+            spans = []
+            for word in words:
+                Token(input_pack, begin, begin + len(word))
+                spans.append((begin, begin + len(word)))
+                begin += len(word) + 1
+            if not words[1].endswith("s") or words[1] == "is":
+                continue
+            predicate = PredicateMention(input_pack, *spans[1])
+            for arg_type, (begin, end) in (
+                ("ARG0", spans[0]),
+                ("ARG1", (spans[2][0], spans[-1][1])),
+            ):
+                link = PredicateLink(
+                    input_pack,
+                    predicate,
+                    PredicateArgument(input_pack, begin, end),
+                )
+                link.arg_type = arg_type
+
+
+def build_pack() -> DataPack:
+    pack = DataPack()
+    pack.set_text("Title\n\n" + " ".join(SENTENCES))
+    begin = len("Title\n\n")
+    for text in SENTENCES:
+        Sentence(pack, begin, begin + len(text))
+        begin += len(text) + 1
+    pack.add_all_remaining_entries()
+    return pack
+
+
+class SRLCacheProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for SRLCacheProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "srl.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def process(self, processor_configs):
+        labeler = VerbLabeler()
+        processor = SRLCacheProcessor(labeler)
+        processor.initialize(
+            Resources(),
+            processor.make_configs(
+                {
+                    "srl_cache_path": self.cache_path,
+                    "processor": processor_configs,
+                }
+            ),
+        )
+        pack = build_pack()
+        processor.process(pack)
+        pack.add_all_remaining_entries()
+        processor.finish(Resources())
+        return pack, labeler.labeled
+
+    def assert_labels(self, pack):
+        links = sorted(
+            (link.get_parent().text, link.arg_type, link.get_child().text)
+            for link in pack.get(PredicateLink)
+        )
+        self.assertEqual(
+            links,
+            [
+                ("causes", "ARG0", "SARS-CoV-2"),
+                ("causes", "ARG1", "renal injury"),
+            ],
+        )
+        self.assertEqual(len(list(pack.get(PredicateMention))), 1)
+        self.assertEqual(
+            [token.text for token in pack.get(Token)][:3],
+            ["Fever", "is", "rare"],
+        )
+        self.assertEqual(len(list(pack.get(Token))), 10)
+
+    def test_cache(self):
+        pack, labeled = self.process({})
+        # The repeated sentence is labeled once.
+        self.assertEqual(labeled, SENTENCES[:2])
+        self.assert_labels(pack)
+
+        # Runtime configs do not change the cache key, the model does.
+        pack, labeled = self.process({"cuda_devices": [0]})
+        self.assertEqual(labeled, [])
+        self.assert_labels(pack)
+
+        pack, labeled = self.process({"srl_url": "other.tar.gz"})
+        self.assertEqual(labeled, SENTENCES[:2])
+        self.assert_labels(pack)
+
+    def test_compute_batch(self):
+        labeler = VerbLabeler()
+        processor = SRLCacheProcessor(labeler)
+        processor.initialize(
+            Resources(),
+            processor.make_configs(
+                {"srl_cache_path": None, "max_batch_tokens": 5}
+            ),
+        )
+        packs = [build_pack(), build_pack()]
+        for pack, result in zip(packs, processor.compute_batch(packs)):
+            processor.write(pack, result)
+            pack.add_all_remaining_entries()
+        processor.finish(Resources())
+
+        # The sentences repeated across the packs are labeled once, in
+        # batches of at most 5 tokens.
+        self.assertEqual(labeler.labeled, SENTENCES[:2])
+        self.assertEqual(labeler.batches, [1, 1])
+        for pack in packs:
+            self.assert_labels(pack)
+
+
+if __name__ == "__main__":
+    unittest.main()
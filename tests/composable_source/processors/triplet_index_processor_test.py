@@ -0,0 +1,179 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for TripletIndexProcessor and TripletSearchResponseCreator.
+"""
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Title,
+    Token,
+)
+from ftx.onto.clinical import MedicalEntityMention, UMLSConceptLink
+from composable_source.processors.triplet_index_processor import (
+    TripletIndexProcessor,
+    TripletSearchResponseCreator,
+)
+from composable_source.utils.triplet_index import TripletIndex
+
+
+def build_annotated_pack() -> DataPack:
+    title = "Renal injury by SARS-CoV-2"
+    sentence = "SARS-CoV-2 causes renal injury."
+    pack = DataPack()
+    pack.set_text(f"{title}\n\n{sentence}")
+    pack.pack_name = "paper_0"
+    Title(pack, 0, len(title))
+
+    offset = len(title) + 2
+    Sentence(pack, offset, offset + len(sentence))
+    lemmas = {"causes": "cause", "injury": "injury"}
+    begin = offset
+    for word in ("SARS-CoV-2", "causes", "renal", "injury"):
+        begin = pack.text.index(word, begin)
+        token = Token(pack, begin, begin + len(word))
+        token.lemma = lemmas.get(word, word.lower())
+        begin += len(word)
+
+    def span(text):
+        begin = pack.text.index(text, offset)
+        return begin, begin + len(text)
+
+    predicate = PredicateMention(pack, *span("causes"))
+    for arg_type, text in (("ARG0", "SARS-CoV-2"), ("ARG1", "renal injury")):
+        link = PredicateLink(
+            pack, predicate, PredicateArgument(pack, *span(text))
+        )
+        link.arg_type = arg_type
+
+    mention = MedicalEntityMention(pack, *span("SARS-CoV-2"))
+    umls = UMLSConceptLink(pack)
+    umls.name = "SARS-CoV-2"
+    umls.cui = "C5203676"
+    mention.umls_entities.append(umls)
+    pack.add_all_remaining_entries()
+    return pack
+
+
+class TripletIndexProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for the offline triplet index.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.temp_dir.name, "triplets.db")
+
+        indexer = TripletIndexProcessor()
+        indexer.initialize(
+            Resources(),
+            Config({"index_path": self.index_path}, indexer.default_configs()),
+        )
+        indexer.process(build_annotated_pack())
+        indexer.finish(Resources())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_index_lookup(self):
+        index = TripletIndex(self.index_path)
+        self.assertEqual(len(index), 1)
+
+        records = index.search("cause", "sars-cov-2", "arg0")
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(
+            (record["arg0"], record["predicate"], record["arg1"]),
+            ("SARS-CoV-2", "causes", "renal injury"),
+        )
+        self.assertEqual(record["doc_id"], "paper_0")
+        self.assertEqual(record["title"], "Renal injury by SARS-CoV-2")
+        self.assertEqual(
+            record["concepts"], {"sars-cov-2": [["SARS-CoV-2", "C5203676"]]}
+        )
+
+        self.assertEqual(index.search("affect", "sars-cov-2", "arg0"), [])
+        self.assertEqual(index.search("cause", "sars-cov-2", "arg1"), [])
+        self.assertEqual(len(index.search("cause", "renal", "arg1")), 1)
+        # Terms match, but the entity does not appear in the argument.
+        self.assertEqual(index.search("cause", "injury renal", "arg1"), [])
+        index.close()
+
+    def test_ranking(self):
+        index = TripletIndex(self.index_path)
+        for doc_id, arg1 in (
+            ("paper_1", "acute respiratory distress syndrome"),
+            ("paper_2", "fever"),
+            ("paper_3", "acute respiratory distress syndrome"),
+            ("paper_4", "acute respiratory distress syndrome"),
+        ):
+            index.add(
+                doc_id,
+                "",
+                f"SARS-CoV-2 causes {arg1}.",
+                (0, 0),
+                ("SARS-CoV-2", "causes", arg1),
+                "cause",
+            )
+        index.commit()
+
+        # The triplet of three papers comes first, then the shortest
+        # answers, whatever the order the papers were indexed in.
+        records = index.search("cause", "sars-cov-2", "arg0", limit=4)
+        self.assertEqual(
+            [(r["doc_id"], r["arg1"]) for r in records],
+            [
+                ("paper_1", "acute respiratory distress syndrome"),
+                ("paper_3", "acute respiratory distress syndrome"),
+                ("paper_4", "acute respiratory distress syndrome"),
+                ("paper_2", "fever"),
+            ],
+        )
+        records = index.search("cause", "sars-cov-2", "arg0", limit=2)
+        self.assertEqual([r["doc_id"] for r in records], ["paper_1", "paper_3"])
+        index.close()
+
+    def test_response(self):
+        creator = TripletSearchResponseCreator()
+        creator.initialize(
+            Resources(),
+            Config({"index_path": self.index_path}, creator.default_configs()),
+        )
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            creator._process_results(MultiPack(), "SARS-CoV-2", "cause", False)
+        creator.finish(Resources())
+
+        self.assertIn("SARS-CoV-2\tcauses\trenal injury", output.getvalue())
+        self.assertIn("CUI: C5203676", output.getvalue())
+        self.assertIn(
+            "(From Paper: , Renal injury by SARS-CoV-2)", output.getvalue()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for CachedCandidateGenerator.
+"""
+import unittest
+
+from scispacy.candidate_generation import MentionCandidate
+from composable_source.processors.umls_link_processor import (
+    CachedCandidateGenerator,
+)
+from composable_source.utils.umls_link_cache import UMLSLinkCache
+
+CANDIDATES = {
+    "sars-cov-2": MentionCandidate("C5203676", ["SARS-CoV-2"], [0.98]),
+    "fever": MentionCandidate("C0015967", ["Fever", "Pyrexia"], [1.0, 0.71]),
+}
+
+
+class CandidateSearch:
+    r"""Finds the candidates of `CANDIDATES` by the lower cased mention
+    text, as the candidate generator of the linker does, and records the
+    mention texts of every search."""
+
+    def __init__(self):
+        self.searched = []
+
+    def __call__(self, mention_texts, k):
+        self.searched.append(list(mention_texts))
+        return [
+            [CANDIDATES[text.lower()]] if text.lower() in CANDIDATES else []
+            for text in mention_texts
+        ]
+
+
+class CachedCandidateGeneratorTest(unittest.TestCase):
+    r"""
+    Unittest for CachedCandidateGenerator.
+    """
+
+    def setUp(self):
+        self.search = CandidateSearch()
+        self.cache = UMLSLinkCache()
+        self.generator = CachedCandidateGenerator(self.search, self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_repeated_mention(self):
+        candidates = self.generator(["Fever", "cough", "fever"], 30)
+        self.assertEqual(self.search.searched, [["Fever", "cough", "fever"]])
+        self.assertEqual(
+            [[c.concept_id for c in mention] for mention in candidates],
+            [["C0015967"], [], ["C0015967"]],
+        )
+
+        # The cached mentions are not searched again, whatever their case.
+        candidates = self.generator(["FEVER", "SARS-CoV-2", "cough"], 30)
+        self.assertEqual(self.search.searched[1:], [["SARS-CoV-2"]])
+        self.assertEqual(
+            [[c.concept_id for c in mention] for mention in candidates],
+            [["C0015967"], ["C5203676"], []],
+        )
+        self.assertEqual(candidates[0][0].aliases, ["Fever", "Pyrexia"])
+        self.assertEqual(candidates[0][0].similarities, [1.0, 0.71])
+
+        # The number of candidates is part of the key.
+        self.generator(["fever"], 10)
+        self.assertEqual(self.search.searched[2:], [["fever"]])
+
+    def test_shared_cache(self):
+        self.generator(["SARS-CoV-2"], 30)
+        # The generator of another linker finds the candidates in the cache.
+        other_search = CandidateSearch()
+        other = CachedCandidateGenerator(other_search, self.cache)
+        candidates = other(["sars-cov-2"], 30)
+        self.assertEqual(other_search.searched, [])
+        self.assertEqual(candidates[0][0].concept_id, "C5203676")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,7 +18,7 @@ import unittest
 
 from composable_source.readers import CORDReader
 from ft.onto.base_ontology import Document, Title
-from onto.cord19research import Abstract, Body
+from onto.cord19research import Abstract, Body, Passage
 from forte.data.data_pack import DataPack
 from forte.pipeline import Pipeline
 
@@ -99,6 +99,49 @@ class CORDReaderTest(unittest.TestCase):
         body = body_entries[0]
         self.assertEqual(body.text, expected_body)
 
+    def test_passages(self):
+        """
+        Test CORDReader with the paragraphs and the sections as passages
+        """
+        paper = self.pipeline.process_one(self.dataset_path)
+        title = paper.get_single(Title).text
+
+        for unit, expected in (
+            ("paragraph", [Abstract, Body, Body]),
+            ("section", [Abstract, Body]),
+        ):
+            pipeline = Pipeline[DataPack]()
+            pipeline.set_reader(CORDReader(), config={"passage_unit": unit})
+            pipeline.initialize()
+            packs = list(pipeline.process_dataset(self.dataset_path))
+            self.assertEqual(len(packs), len(expected))
+
+            for index, (pack, part) in enumerate(zip(packs, expected)):
+                passage = pack.get_single(Passage)
+                self.assertEqual(pack.pack_name, f"{paper.pack_name}_{index}")
+                self.assertEqual(passage.paper_id, paper.pack_name)
+                self.assertEqual(
+                    passage.section, "Abstract" if part is Abstract else ""
+                )
+                # The passage is at its offsets in the whole paper.
+                self.assertEqual(
+                    paper.text[passage.paper_begin:passage.paper_end],
+                    passage.text,
+                )
+                self.assertEqual(pack.get_single(part).text, passage.text)
+                self.assertEqual(pack.get_single(Title).text, title)
+                self.assertEqual(pack.text, f"{title}\n\n{passage.text}")
+
+            # The passages of the body cover it.
+            self.assertEqual(
+                "".join(
+                    pack.get_single(Passage).text
+                    for pack, part in zip(packs, expected)
+                    if part is Body
+                ),
+                paper.get_single(Body).text,
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,242 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for read_queries, SharedPapers, annotate_batch and
+MultiPackListReader.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from forte.data.caster import MultiPackBoxer
+from forte.data.data_pack import DataPack
+from forte.data.multi_pack import MultiPack
+from forte.data.readers import StringReader
+from forte.data.selector import RegexNameMatchSelector
+from forte.pipeline import Pipeline
+from forte.processors.base import MultiPackProcessor, PackProcessor
+from ft.onto.base_ontology import Sentence, Title
+from composable_source.readers.multi_pack_list_reader import (
+    MultiPackListReader,
+)
+from composable_source.utils.batch_search import (
+    SharedPapers,
+    annotate_batch,
+    read_queries,
+)
+from composable_source.utils.utils import QueryAnalysisError
+
+# The effects in the papers retrieved by every query.
+QUERY_PAPERS = {
+    "What does SARS-CoV-2 cause?": ["fever", "anosmia"],
+    "What does COVID-19 cause?": ["anosmia", "renal injury"],
+}
+
+
+def add_papers(m_pack: MultiPack, effects):
+    for idx, effect in enumerate(effects):
+        title = f"Paper on {effect}"
+        pack = m_pack.add_pack(f"passage_{idx}")
+        pack.set_text(f"{title}\n\nSARS-CoV-2 causes {effect}.")
+        pack.pack_name = f"doc_{effect}"
+        Title(pack, 0, len(title))
+        pack.add_all_remaining_entries()
+
+
+def build_query_pack(query: str) -> MultiPack:
+    m_pack = MultiPack()
+    query_pack = m_pack.add_pack("query")
+    query_pack.set_text(query)
+    query_pack.pack_name = "query"
+    add_papers(m_pack, QUERY_PAPERS[query])
+    return m_pack
+
+
+class PaperRetriever(MultiPackProcessor):
+    r"""Adds the papers of `QUERY_PAPERS` to the MultiPack of a query."""
+
+    def _process(self, input_pack: MultiPack):
+        query = input_pack.get_pack("query").text
+        add_papers(input_pack, QUERY_PAPERS[query])
+
+
+class QueryChecker(PackProcessor):
+    r"""Fails to analyze the queries that start with "bad", as the query
+    analysis does with a query it cannot parse, and counts how many times
+    it is initialized."""
+
+    def __init__(self):
+        super().__init__()
+        self.initialized = 0
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.initialized += 1
+
+    def _process(self, input_pack: DataPack):
+        if input_pack.text.startswith("bad"):
+            raise QueryAnalysisError(f"Cannot analyze {input_pack.text}")
+
+
+class SentenceTagger(PackProcessor):
+    r"""Labels the sentence after the title of a pack, records the names
+    of the packs it annotates and counts how many times it is
+    initialized."""
+
+    def __init__(self):
+        super().__init__()
+        self.annotated = []
+        self.initialized = 0
+
+    def initialize(self, resources: Resources, configs: Config):
+        super().initialize(resources, configs)
+        self.initialized += 1
+
+    def _process(self, input_pack: DataPack):
+        self.annotated.append(input_pack.pack_name)
+        begin = input_pack.text.index("\n\n") + 2
+        Sentence(input_pack, begin, len(input_pack.text))
+
+
+def build_annotation_pipeline(tagger: SentenceTagger) -> Pipeline:
+    nlp = Pipeline()
+    nlp.set_reader(MultiPackListReader())
+    nlp.add(tagger, selector=RegexNameMatchSelector(select_name=r"passage_\d"))
+    nlp.initialize()
+    return nlp
+
+
+class SharedPapersTest(unittest.TestCase):
+    r"""
+    Unittest for SharedPapers.
+    """
+
+    def setUp(self):
+        self.m_packs = [build_query_pack(query) for query in QUERY_PAPERS]
+        self.papers = SharedPapers(r"passage_\d")
+        for m_pack in self.m_packs:
+            self.papers.add(m_pack)
+
+    def test_read_queries(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "queries.txt")
+            with open(path, "w", encoding="utf8") as file:
+                file.write("What does covid-19 cause?\n\n  What binds ACE2?\n")
+            self.assertEqual(
+                list(read_queries(path)),
+                ["What does covid-19 cause?", "What binds ACE2?"],
+            )
+
+    def test_unique_papers(self):
+        self.assertEqual(len(self.papers), 3)
+        self.assertEqual(self.papers.num_hits, 4)
+        # The paper retrieved by both queries is the hit of the first one.
+        shared = self.papers.query_multi_pack(self.m_packs[1])
+        self.assertEqual(shared.pack_names, ["query", "passage_0", "passage_1"])
+        self.assertIs(
+            shared.get_pack("passage_0"), self.m_packs[0].get_pack("passage_1")
+        )
+        self.assertIs(
+            shared.get_pack("passage_1"), self.m_packs[1].get_pack("passage_1")
+        )
+
+    def test_annotate_once(self):
+        tagger = SentenceTagger()
+        nlp = build_annotation_pipeline(tagger)
+        for _ in nlp.process_dataset([self.papers.multi_pack("passage")]):
+            pass
+        nlp.finish()
+        self.assertEqual(
+            tagger.annotated, ["doc_fever", "doc_anosmia", "doc_renal injury"]
+        )
+        for m_pack in self.m_packs:
+            shared = self.papers.query_multi_pack(m_pack)
+            for name in ("passage_0", "passage_1"):
+                self.assertEqual(
+                    len(list(shared.get_pack(name).get(Sentence))), 1
+                )
+
+
+class AnnotateBatchTest(unittest.TestCase):
+    r"""
+    Unittest for annotate_batch.
+    """
+
+    def setUp(self):
+        self.checker = QueryChecker()
+        self.retrieval = Pipeline()
+        self.retrieval.set_reader(StringReader())
+        self.retrieval.add(self.checker)
+        self.retrieval.add(MultiPackBoxer(), config={"pack_name": "query"})
+        self.retrieval.add(PaperRetriever())
+        self.retrieval.initialize()
+        self.tagger = SentenceTagger()
+        self.annotation = build_annotation_pipeline(self.tagger)
+
+    def tearDown(self):
+        self.retrieval.finish()
+        self.annotation.finish()
+
+    def test_annotate_batch(self):
+        queries = list(QUERY_PAPERS)
+        m_packs, errors = annotate_batch(
+            self.retrieval, self.annotation, queries, "passage"
+        )
+
+        self.assertEqual(errors, {})
+        self.assertEqual(
+            self.tagger.annotated,
+            ["doc_fever", "doc_anosmia", "doc_renal injury"],
+        )
+        self.assertEqual(
+            [m_pack.get_pack("query").text for m_pack in m_packs], queries
+        )
+        for m_pack, effects in zip(m_packs, QUERY_PAPERS.values()):
+            self.assertEqual(
+                [
+                    pack.get_single(Sentence).text
+                    for name, pack in m_pack.iter_packs()
+                    if name != "query"
+                ],
+                [f"SARS-CoV-2 causes {effect}." for effect in effects],
+            )
+
+    def test_unparsable_query(self):
+        first, second = QUERY_PAPERS
+        m_packs, errors = annotate_batch(
+            self.retrieval, self.annotation, [first, "bad query"], "passage"
+        )
+        self.assertEqual(errors, {1: "Cannot analyze bad query"})
+        self.assertEqual(
+            [m_pack.get_pack("query").text for m_pack in m_packs], [first]
+        )
+        self.assertEqual(self.tagger.annotated, ["doc_fever", "doc_anosmia"])
+
+        # Only the job of the failed query is dropped, the next batch is
+        # answered without initializing the models again.
+        m_packs, errors = annotate_batch(
+            self.retrieval, self.annotation, [second], "passage"
+        )
+        self.assertEqual(errors, {})
+        self.assertEqual(
+            [m_pack.get_pack("query").text for m_pack in m_packs], [second]
+        )
+        self.assertEqual(self.checker.initialized, 1)
+        self.assertEqual(self.tagger.initialized, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,306 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for BM25Index and BM25PackIndexProcessor.
+"""
+import os
+import tempfile
+import unittest
+
+from ddt import ddt, data, unpack
+from forte.data.data_pack import DataPack
+from forte.pipeline import Pipeline
+from composable_source.readers import CORDReader
+from composable_source.processors.bm25_processors import (
+    BM25PackIndexProcessor,
+)
+from composable_source.processors.pack_store_processor import tiered_search
+from composable_source.utils.bm25_index import BM25Index, BM25IndexBuilder
+
+DOCUMENTS = [
+    "The virus binds to the ACE2 receptor of the host cell.",
+    "ACE2 is a receptor. The spike protein of the virus then binds to it.",
+    "Masks reduce the transmission of the virus.",
+    "Receptor binding is studied, the virus is not.",
+]
+
+
+def phrase_query(text, slop, size=10):
+    return {
+        "query": {"match_phrase": {"content": {"query": text, "slop": slop}}},
+        "size": size,
+    }
+
+
+@ddt
+class BM25IndexTest(unittest.TestCase):
+    r"""
+    Unittest for BM25Index.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        builder = BM25IndexBuilder(self.temp_dir.name)
+        builder.add(
+            [
+                {"doc_id": str(i), "content": text, "pack_info": None}
+                for i, text in enumerate(DOCUMENTS)
+            ]
+        )
+        builder.build()
+        self.index = BM25Index(self.temp_dir.name)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def doc_ids(self, query):
+        return [hit["_id"] for hit in self.index.search(query)["hits"]["hits"]]
+
+    @data(
+        ("virus binds", 0, ["0"]),
+        ("virus binds", 3, ["0", "1"]),
+        ("binds virus", 0, []),
+        ("binds virus", 2, ["0"]),
+        ("binds virus", 3, ["0", "1"]),
+        ("ACE2 receptor", 0, ["0"]),
+        ("ACE2 receptor", 2, ["0", "1"]),
+        ("unknown virus", 10, []),
+    )
+    @unpack
+    def test_match_phrase(self, text, slop, expected):
+        self.assertEqual(len(self.index), len(DOCUMENTS))
+        self.assertEqual(
+            sorted(self.doc_ids(phrase_query(text, slop))), expected
+        )
+
+    def test_ranking(self):
+        hits = self.index.search(phrase_query("the virus", 10))["hits"]
+        self.assertEqual(hits["total"]["value"], 4)
+        scores = [hit["_score"] for hit in hits["hits"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(hits["max_score"], scores[0])
+
+        # The exact phrase scores higher than a sloppy match.
+        ranked = self.doc_ids(phrase_query("virus binds", 3))
+        self.assertEqual(ranked, ["0", "1"])
+
+        self.assertEqual(len(self.doc_ids(phrase_query("virus", 0, 2))), 2)
+
+    def test_match(self):
+        query = {"query": {"match": {"content": "masks receptor"}}}
+        self.assertEqual(self.doc_ids(query), ["2", "3", "0", "1"])
+
+        document = self.index.search(query)["hits"]["hits"][0]["_source"]
+        self.assertEqual(document["content"], DOCUMENTS[2])
+
+    @data(
+        ("virus receptor spike", None, ["0", "1", "2", "3"]),
+        ("virus receptor spike", 2, ["0", "1", "3"]),
+        ("virus receptor spike", "-1", ["0", "1", "3"]),
+        ("virus receptor spike", "100%", ["1"]),
+        ("virus receptor spike", "50%", ["0", "1", "2", "3"]),
+    )
+    @unpack
+    def test_minimum_should_match(self, text, minimum, expected):
+        options = {"query": text}
+        if minimum is not None:
+            options["minimum_should_match"] = minimum
+        query = {"query": {"match": {"content": options}}}
+        self.assertEqual(sorted(self.doc_ids(query)), expected)
+
+    def test_rescore(self):
+        match = {"match": {"content": "virus binds"}}
+
+        def query(window_size):
+            return {
+                "query": match,
+                "rescore": {
+                    "window_size": window_size,
+                    "query": {
+                        "rescore_query": phrase_query("spike protein", 0)[
+                            "query"
+                        ],
+                        "query_weight": 0.0,
+                        "rescore_query_weight": 1.0,
+                    },
+                },
+            }
+
+        self.assertEqual(self.doc_ids({"query": match}), ["0", "1", "2", "3"])
+        # Only document 1 has the phrase, the other documents of the window
+        # get no score.
+        self.assertEqual(self.doc_ids(query(4)), ["1", "0", "2", "3"])
+        hits = self.index.search(query(4))["hits"]["hits"]
+        self.assertEqual([hit["_score"] for hit in hits][1:], [0.0] * 3)
+        # Documents out of the window keep their ranking.
+        self.assertEqual(self.doc_ids(query(1)), ["0", "1", "2", "3"])
+
+    def test_highlight(self):
+        query = phrase_query("spike protein", 0)
+        query["highlight"] = {
+            "fragment_size": 20,
+            "fields": {"content": {"number_of_fragments": 1}},
+        }
+        hits = self.index.search(query)["hits"]["hits"]
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(
+            hits[0]["highlight"],
+            {"content": ["The spike protein of the virus then binds to it."]},
+        )
+
+        # Documents without the terms get no passages.
+        query["query"] = {"match": {"content": "masks spike"}}
+        hits = self.index.search(query)["hits"]["hits"]
+        self.assertEqual(
+            [hit["highlight"] for hit in hits],
+            [
+                {"content": ["Masks reduce the transmission of the virus."]},
+                {
+                    "content": [
+                        "The spike protein of the virus then binds to it."
+                    ]
+                },
+            ],
+        )
+        query["highlight"] = {"fields": {"title": {}}}
+        hits = self.index.search(query)["hits"]["hits"]
+        self.assertEqual(hits[0]["highlight"], {})
+
+    def test_unsupported_query(self):
+        with self.assertRaises(ValueError):
+            self.index.search({"query": {"term": {"content": "virus"}}})
+        with self.assertRaises(ValueError):
+            self.index.search({"query": {"match": {"title": "virus"}}})
+
+
+class BM25FieldsTest(unittest.TestCase):
+    r"""
+    Unittest for the BM25Index of several fields and its tiered search.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        builder = BM25IndexBuilder(self.temp_dir.name, extra_fields=["title"])
+        builder.add(
+            [
+                {"doc_id": "0", "title": "Spike", "content": DOCUMENTS[0]},
+                {"doc_id": "1", "title": "ACE2", "content": DOCUMENTS[1]},
+                {"doc_id": "2", "title": "Masks", "content": DOCUMENTS[2]},
+            ]
+        )
+        builder.build()
+        self.index = BM25Index(self.temp_dir.name)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_fields(self):
+        self.assertEqual(self.index.fields, ["content", "title"])
+        hits = self.index.search({"query": {"match": {"title": "spike"}}})
+        hits = hits["hits"]["hits"]
+        self.assertEqual([hit["_id"] for hit in hits], ["0"])
+        # The extra fields are not stored.
+        self.assertNotIn("title", hits[0]["_source"])
+
+        # Only the stored fields can be highlighted, with the terms of a
+        # query of another field if require_field_match is False.
+        query = {
+            "query": {"match": {"title": "ace2"}},
+            "highlight": {"fields": {"content": {}, "title": {}}},
+        }
+        self.assertEqual(
+            self.index.search(query)["hits"]["hits"][0]["highlight"], {}
+        )
+        query["highlight"]["require_field_match"] = False
+        self.assertEqual(
+            self.index.search(query)["hits"]["hits"][0]["highlight"],
+            {"content": [DOCUMENTS[1]]},
+        )
+
+    def test_tiered_search(self):
+        def tiers(size):
+            return {
+                "tiers": [
+                    {"query": {"match": {"title": "ace2 masks"}}},
+                    {"query": {"match": {"content": "virus ace2"}}},
+                ],
+                "size": size,
+            }
+
+        def doc_ids(query):
+            results = tiered_search(self.index.search, query)
+            return [hit["_id"] for hit in results["hits"]["hits"]]
+
+        searched = []
+
+        def search(query):
+            searched.append(query)
+            return self.index.search(query)
+
+        # The hits of the titles come first, then the new hits of the body.
+        self.assertEqual(doc_ids(tiers(3)), ["1", "2", "0"])
+        self.assertEqual(doc_ids(tiers(1)), ["1"])
+        # The body is not searched when the titles find enough hits.
+        tiered_search(search, tiers(2))
+        self.assertEqual(len(searched), 1)
+
+        # Queries without tiers are searched as they are.
+        query = tiers(3)["tiers"][1]
+        self.assertEqual(
+            tiered_search(self.index.search, query),
+            self.index.search(query),
+        )
+
+
+class BM25PackIndexProcessorTest(unittest.TestCase):
+    r"""
+    Unittest for BM25PackIndexProcessor.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_index_packs(self):
+        pipeline = Pipeline[DataPack]()
+        pipeline.set_reader(CORDReader())
+        pipeline.add(
+            BM25PackIndexProcessor(),
+            config={
+                "index_dir": self.temp_dir.name,
+                "indexer": {"hparams": {"index_name": "test"}},
+            },
+        )
+        pipeline.initialize()
+        packs = list(
+            pipeline.process_dataset("sample_data/tests/cord19research")
+        )
+        pipeline.finish()
+
+        index = BM25Index(os.path.join(self.temp_dir.name, "test"))
+        title = packs[0].text.split("\n")[0]
+        hits = index.search(phrase_query(title, 0))["hits"]["hits"]
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0]["_id"], str(packs[0].pack_id))
+        pack = DataPack.from_string(hits[0]["_source"]["pack_info"])
+        self.assertEqual(pack.text, packs[0].text)
+        index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for DenseIndex.
+"""
+import tempfile
+import unittest
+
+import faiss
+import numpy as np
+from ddt import ddt, data
+
+from composable_source.utils.dense_index import DenseIndex, DenseIndexBuilder
+
+
+@ddt
+class DenseIndexTest(unittest.TestCase):
+    r"""
+    Unittest for DenseIndexBuilder and DenseIndex.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.vectors = np.random.RandomState(0).rand(300, 16).astype("float32")
+        faiss.normalize_L2(self.vectors)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @data("HNSW32", "IVF4,Flat")
+    def test_build_and_search(self, index_factory):
+        builder = DenseIndexBuilder(self.temp_dir.name, index_factory)
+        for start in range(0, len(self.vectors), 128):
+            batch = range(start, min(start + 128, len(self.vectors)))
+            builder.add(
+                self.vectors[start:start + 128],
+                [{"doc_id": f"doc_{i}", "content": f"text {i}"} for i in batch],
+            )
+        builder.build()
+
+        index = DenseIndex(
+            self.temp_dir.name,
+            "nprobe=4" if index_factory.startswith("IVF") else None,
+        )
+        self.assertEqual(len(index), len(self.vectors))
+
+        hits = index.search(self.vectors[42], 5)
+        self.assertEqual(len(hits), 5)
+        document, score = hits[0]
+        self.assertEqual(document["doc_id"], "doc_42")
+        self.assertEqual(document["content"], "text 42")
+        self.assertIsNone(document["pack_info"])
+        self.assertAlmostEqual(score, 1.0, places=4)
+        index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for SQLiteLRUCache.
+"""
+import os
+import tempfile
+import unittest
+
+from composable_source.utils.lru_cache import SQLiteLRUCache
+
+
+class SQLiteLRUCacheTest(unittest.TestCase):
+    r"""
+    Unittest for SQLiteLRUCache.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_batches_and_eviction(self):
+        cache = SQLiteLRUCache(self.path, max_entries=3)
+        cache.put_many([("a", [1]), ("b", {"x": 2}), ("c", None)])
+        self.assertEqual(
+            cache.get_many(["a", "b", "missing"]), {"a": [1], "b": {"x": 2}}
+        )
+        # "c" is the least recently used value.
+        cache.put("d", 4)
+        self.assertNotIn("c", cache)
+        cache.close()
+
+        # The recency survives reopening the cache.
+        cache = SQLiteLRUCache(self.path, max_entries=3)
+        cache.get("a")
+        cache.put("e", 5)
+        self.assertEqual(
+            cache.get_many(["a", "b", "d", "e"]).keys(), {"a", "d", "e"}
+        )
+        cache.close()
+
+    def test_tables(self):
+        first = SQLiteLRUCache(self.path, max_entries=10, table="first")
+        second = SQLiteLRUCache(self.path, max_entries=10, table="second")
+        first.put("key", 1)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 0)
+        self.assertIsNone(second.get("key"))
+        first.close()
+        second.close()
+
+    def test_rollback(self):
+        cache = SQLiteLRUCache(self.path, max_entries=10)
+        with self.assertRaises(TypeError):
+            cache.put_many([("a", 1), ("b", object())])
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
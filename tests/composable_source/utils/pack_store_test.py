@@ -0,0 +1,74 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for PackStore and PackStoreWriter.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.data.data_pack import DataPack
+from forte.pipeline import Pipeline
+from ft.onto.base_ontology import Title
+from onto.cord19research import Abstract
+from composable_source.readers import CORDReader
+from composable_source.processors.pack_store_processor import PackStoreWriter
+from composable_source.utils.pack_store import PackStore
+
+
+class PackStoreTest(unittest.TestCase):
+    r"""
+    Unittest for PackStore.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.temp_dir.name, "packs.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_and_load(self):
+        pipeline = Pipeline[DataPack]()
+        pipeline.set_reader(CORDReader())
+        pipeline.add(
+            PackStoreWriter(), config={"pack_store_path": self.store_path}
+        )
+        pipeline.initialize()
+
+        packs = list(
+            pipeline.process_dataset("sample_data/tests/cord19research")
+        )
+        pipeline.finish()
+        self.assertEqual(len(packs), 1)
+        doc_id = str(packs[0].pack_id)
+
+        store = PackStore(self.store_path)
+        self.assertEqual(len(store), 1)
+        self.assertIn(doc_id, store)
+        self.assertNotIn("unknown", store)
+        self.assertIsNone(store.get("unknown"))
+
+        pack = store.get(doc_id)
+        self.assertEqual(pack.pack_id, packs[0].pack_id)
+        self.assertEqual(pack.text, packs[0].text)
+        self.assertEqual(
+            pack.get_single(Title).text, packs[0].get_single(Title).text
+        )
+        self.assertEqual(len(list(pack.get(Abstract))), 1)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the passages of the papers.
+"""
+import unittest
+
+from ddt import ddt, data, unpack
+from ft.onto.base_ontology import Document, Title
+from composable_source.processors.pack_store_processor import passage_pack
+from composable_source.utils.passages import (
+    highlight_fragments,
+    hit_passages,
+    paper_title,
+    split_passages,
+)
+
+TITLE = "Renal injury in COVID-19"
+SENTENCES = [
+    "Masks reduce transmission.",
+    "COVID-19 causes renal injury.",
+    "It is severe.",
+    "The virus binds to ACE2 receptors.",
+    "Renal failure is rare.",
+]
+PAPER = TITLE + "\n\n" + " ".join(SENTENCES)
+
+
+@ddt
+class PassagesTest(unittest.TestCase):
+    r"""
+    Unittest for the passages of the papers.
+    """
+
+    @data(
+        (1000, [" ".join(SENTENCES)]),
+        (60, [" ".join(SENTENCES[:2]), " ".join(SENTENCES[2:4]), SENTENCES[4]]),
+        # A sentence longer than the passage size is a passage of its own.
+        (10, SENTENCES),
+    )
+    @unpack
+    def test_split_passages(self, passage_size, passages):
+        spans = split_passages(PAPER, len(TITLE), passage_size)
+        self.assertEqual([PAPER[begin:end] for begin, end in spans], passages)
+
+    def test_split_parts(self):
+        text = f"{TITLE}\n\nAbstract.\n\nBody."
+        spans = split_passages(text, len(TITLE))
+        self.assertEqual(
+            [text[begin:end] for begin, end in spans], ["Abstract.", "Body."]
+        )
+
+    def test_paper_title(self):
+        self.assertEqual(paper_title(PAPER), TITLE)
+        self.assertEqual(paper_title("No title"), "")
+
+    @data(
+        # The sentences with the most terms come first.
+        (["covid", "19", "renal"], 10, 5, [TITLE, SENTENCES[1], SENTENCES[4]]),
+        (["covid", "19", "renal"], 10, 1, [TITLE]),
+        # Passages grow with the next, then the previous sentence.
+        (["causes"], 60, 5, [" ".join(SENTENCES[1:3])]),
+        (["causes"], 90, 5, [" ".join(SENTENCES[:3])]),
+        (["causes"], 100, 5, [PAPER[:PAPER.index(" The virus")]]),
+        # Passages do not overlap.
+        (
+            ["masks", "ace2"],
+            60,
+            5,
+            [" ".join(SENTENCES[:2]), " ".join(SENTENCES[3:])],
+        ),
+        (
+            ["masks", "ace2"],
+            70,
+            5,
+            [" ".join(SENTENCES[:3]), " ".join(SENTENCES[3:])],
+        ),
+        (["influenza"], 100, 5, []),
+    )
+    @unpack
+    def test_highlight_fragments(self, terms, size, number, expected):
+        self.assertEqual(
+            highlight_fragments(PAPER, terms, size, number), expected
+        )
+
+    def test_hit_passages(self):
+        self.assertIsNone(hit_passages({"_source": {"content": PAPER}}, "x"))
+        self.assertEqual(
+            hit_passages(
+                {
+                    "_source": {"doc_id": "0"},
+                    "fields": {"title": [TITLE]},
+                    "highlight": {"content": SENTENCES[:2]},
+                },
+                "content",
+            ),
+            (TITLE, SENTENCES[:2]),
+        )
+        # Without the title script field, the title comes from the text.
+        self.assertEqual(
+            hit_passages(
+                {"_source": {"content": PAPER}, "highlight": {}}, "content"
+            ),
+            (TITLE, []),
+        )
+
+    def test_passage_pack(self):
+        pack = passage_pack(TITLE, SENTENCES[1:3])
+        self.assertEqual(pack.text, "\n\n".join([TITLE] + SENTENCES[1:3]))
+        self.assertEqual(pack.get_single(Title).text, TITLE)
+        self.assertEqual(pack.get_single(Document).text, pack.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for QueryAnalysisCache.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Token,
+)
+from composable_source.processors.elasticsearch_query_creator import (
+    ElasticSearchQueryCreator,
+)
+from composable_source.processors.response_creator import ResponseCreator
+from composable_source.utils.query_cache import (
+    QUERY_CACHE_RESOURCE,
+    QueryAnalysisCache,
+    QueryCacheMissSelector,
+    cached_query_preprocess,
+    normalize_query,
+)
+
+QUERY = "What does covid-19 cause?"
+ANALYSIS = (QUERY, "covid-19", "What", "cause", "cause", False)
+
+
+def build_query_pack(text: str, annotated: bool = True) -> DataPack:
+    pack = DataPack()
+    pack.set_text(text)
+    if not annotated:
+        return pack
+
+    Sentence(pack, 0, len(text))
+    pack.set_control_component("fortex.nltk.nltk_processors.NLTKWordTokenizer")
+    begin = 0
+    for word, pos, lemma in (
+        ("What", "WP", "what"),
+        ("does", "VBZ", "do"),
+        ("covid-19", "NN", "covid-19"),
+        ("cause", "VB", "cause"),
+    ):
+        begin = text.index(word, begin)
+        token = Token(pack, begin, begin + len(word))
+        token.pos = pos
+        token.lemma = lemma
+        begin += len(word)
+    pack.add_all_remaining_entries()
+
+    def span(word):
+        begin = text.index(word)
+        return begin, begin + len(word)
+
+    predicate = PredicateMention(pack, *span("cause"))
+    for arg_type, word in (("ARG0", "covid-19"), ("ARG1", "What")):
+        link = PredicateLink(
+            pack, predicate, PredicateArgument(pack, *span(word))
+        )
+        link.arg_type = arg_type
+    pack.add_all_remaining_entries()
+    return pack
+
+
+class QueryAnalysisCacheTest(unittest.TestCase):
+    r"""
+    Unittest for QueryAnalysisCache.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "queries.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_normalize(self):
+        self.assertEqual(
+            normalize_query("  What does  COVID-19 cause ?! "),
+            "what does covid-19 cause",
+        )
+
+    def test_persistence_and_eviction(self):
+        cache = QueryAnalysisCache(self.cache_path, max_entries=2)
+        cache.put(QUERY, ANALYSIS)
+        cache.put("what does covid-19 affect", ANALYSIS)
+        # Using the first query makes the second the least recently used.
+        self.assertEqual(cache.get("what does COVID-19 cause"), ANALYSIS)
+        cache.put("what caused liver injury", ANALYSIS)
+        cache.close()
+
+        cache = QueryAnalysisCache(self.cache_path, max_entries=2)
+        self.assertEqual(len(cache), 2)
+        self.assertIn(QUERY, cache)
+        self.assertIn("what caused liver injury", cache)
+        self.assertNotIn("what does covid-19 affect", cache)
+        self.assertIsNone(cache.get("what does covid-19 affect"))
+        cache.close()
+
+    def test_cached_query_preprocess(self):
+        cache = QueryAnalysisCache(self.cache_path)
+        self.assertEqual(
+            cached_query_preprocess(build_query_pack(QUERY), cache), ANALYSIS
+        )
+        self.assertIn(QUERY, cache)
+
+        # A cached query needs no annotations.
+        self.assertEqual(
+            cached_query_preprocess(
+                build_query_pack("what does covid-19 cause", False), cache
+            ),
+            ANALYSIS,
+        )
+        self.assertEqual(
+            cached_query_preprocess(build_query_pack(QUERY)), ANALYSIS
+        )
+        cache.close()
+
+    def test_selector(self):
+        cache = QueryAnalysisCache(self.cache_path)
+        cache.put(QUERY, ANALYSIS)
+        resources = Resources()
+        resources.update(**{QUERY_CACHE_RESOURCE: cache})
+
+        selector = QueryCacheMissSelector(resources)
+        selector.initialize({})
+        self.assertIs(selector.cache, cache)
+        self.assertEqual(list(selector.select(build_query_pack(QUERY))), [])
+        pack = build_query_pack("what caused renal involvement", False)
+        self.assertEqual(list(selector.select(pack)), [pack])
+        cache.close()
+
+        # Without a cache in the resources, every pack is selected.
+        selector = QueryCacheMissSelector(Resources())
+        selector.initialize({})
+        self.assertIsNone(selector.cache)
+        pack = build_query_pack(QUERY, False)
+        self.assertEqual(list(selector.select(pack)), [pack])
+
+    def test_shared_cache(self):
+        resources = Resources()
+        configs = {"query_cache_path": self.cache_path}
+        owner = ElasticSearchQueryCreator()
+        owner.initialize(resources, owner.make_configs(configs))
+        other = ResponseCreator()
+        other.initialize(resources, other.make_configs(configs))
+        selector = QueryCacheMissSelector(resources)
+        selector.initialize({})
+        self.assertIs(other.query_cache, owner.query_cache)
+        self.assertIs(selector.cache, owner.query_cache)
+
+        # A query analyzed by one component is known to the others.
+        owner.query_cache.put(QUERY, ANALYSIS)
+        self.assertIn(QUERY, other.query_cache)
+        self.assertEqual(list(selector.select(build_query_pack(QUERY))), [])
+
+        # Only the component that opened the cache closes it.
+        other.finish(resources)
+        self.assertTrue(resources.contains(QUERY_CACHE_RESOURCE))
+        owner.finish(resources)
+        self.assertFalse(resources.contains(QUERY_CACHE_RESOURCE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the query templates.
+"""
+import unittest
+
+from ddt import ddt, data, unpack
+from forte.common.resources import Resources
+from forte.data.data_pack import DataPack
+from ft.onto.base_ontology import (
+    PredicateArgument,
+    PredicateLink,
+    PredicateMention,
+    Sentence,
+    Token,
+)
+from composable_source.utils.query_cache import QueryCacheMissSelector
+from composable_source.utils.query_templates import (
+    NLTK_TOKENIZER,
+    match_query_template,
+)
+from composable_source.utils.utils import query_preprocess
+
+
+def build_query_pack(tagged):
+    """Build a query pack from (word, pos, lemma) triples."""
+    text = " ".join(word for word, _, _ in tagged)
+    pack = DataPack()
+    pack.set_text(text)
+    sentence = Sentence(pack, 0, len(text))
+    pack.set_control_component(NLTK_TOKENIZER)
+    begin = 0
+    for word, pos, lemma in tagged:
+        token = Token(pack, begin, begin + len(word))
+        token.pos = pos
+        token.lemma = lemma
+        begin += len(word) + 1
+    pack.add_all_remaining_entries()
+    return pack, sentence
+
+
+@ddt
+class QueryTemplatesTest(unittest.TestCase):
+    r"""
+    Unittest for match_query_template.
+    """
+
+    @data(
+        (
+            [
+                ("what", "WP", "what"),
+                ("does", "VBZ", "do"),
+                ("covid-19", "JJ", "covid-19"),
+                ("cause", "VB", "cause"),
+                ("?", ".", "?"),
+            ],
+            ("covid-19", "what", "cause", "cause", False),
+        ),
+        (
+            [
+                ("What", "WP", "What"),
+                ("can", "MD", "can"),
+                ("SARS-CoV-2", "NNP", "SARS-CoV-2"),
+                ("affect", "VB", "affect"),
+            ],
+            ("SARS-CoV-2", "What", "affect", "affect", False),
+        ),
+        (
+            [
+                ("what", "WP", "what"),
+                ("caused", "VBD", "cause"),
+                ("liver", "NN", "liver"),
+                ("injury", "NN", "injury"),
+            ],
+            ("what", "liver injury", "caused", "cause", True),
+        ),
+        (
+            [
+                ("which", "WDT", "which"),
+                ("drugs", "NNS", "drug"),
+                ("may", "MD", "may"),
+                ("treat", "VB", "treat"),
+                ("covid-19", "NN", "covid-19"),
+            ],
+            ("which drugs", "covid-19", "treat", "treat", True),
+        ),
+        (
+            [
+                ("what", "WP", "what"),
+                ("is", "VBZ", "be"),
+                ("caused", "VBN", "cause"),
+                ("by", "IN", "by"),
+                ("covid-19", "NN", "covid-19"),
+            ],
+            ("covid-19", "what", "caused", "cause", False),
+        ),
+    )
+    @unpack
+    def test_match(self, tagged, expected):
+        pack, sentence = build_query_pack(tagged)
+        self.assertEqual(match_query_template(pack, sentence), expected)
+        self.assertEqual(query_preprocess(pack)[1:], expected)
+
+        selector = QueryCacheMissSelector(Resources())
+        selector.initialize({"skip_template_queries": True})
+        self.assertEqual(list(selector.select(pack)), [])
+
+    @data(
+        [("what", "WP", "what"), ("is", "VBZ", "be"), ("covid-19", "NN", "")],
+        [("how", "WRB", "how"), ("does", "VBZ", "do"), ("it", "PRP", "it")],
+        [("covid-19", "NN", "covid-19"), ("causes", "VBZ", "cause")],
+        [("what", "WP", "what"), ("does", "VBZ", "do")],
+        [
+            ("What", "WP", "What"),
+            ("does", "VBZ", "do"),
+            ("covid-19", "JJ", "covid-19"),
+            ("cause", "VB", "cause"),
+            ("in", "IN", "in"),
+            ("children", "NNS", "child"),
+        ],
+        [
+            ("What", "WP", "What"),
+            ("does", "VBZ", "do"),
+            ("SARS-CoV-2", "NNP", "SARS-CoV-2"),
+            ("do", "VB", "do"),
+            ("to", "TO", "to"),
+            ("lungs", "NNS", "lung"),
+        ],
+        # The last word is not tagged as a verb.
+        [
+            ("What", "WP", "What"),
+            ("can", "MD", "can"),
+            ("SARS-CoV-2", "NNP", "SARS-CoV-2"),
+            ("affect", "NN", "affect"),
+        ],
+        # The tagger takes "lungs" for a verb, the words before are not a
+        # noun phrase.
+        [
+            ("What", "WP", "What"),
+            ("does", "VBZ", "do"),
+            ("SARS-CoV-2", "NNP", "SARS-CoV-2"),
+            ("do", "VB", "do"),
+            ("to", "TO", "to"),
+            ("lungs", "VBZ", "lung"),
+        ],
+    )
+    def test_no_match(self, tagged):
+        pack, sentence = build_query_pack(tagged)
+        self.assertIsNone(match_query_template(pack, sentence))
+
+        selector = QueryCacheMissSelector(Resources())
+        selector.initialize({"skip_template_queries": True})
+        self.assertEqual(list(selector.select(pack)), [pack])
+
+    def test_srl_fallback(self):
+        pack, _ = build_query_pack(
+            [
+                ("covid-19", "NN", "covid-19"),
+                ("causes", "VBZ", "cause"),
+                ("what", "WP", "what"),
+            ]
+        )
+        predicate = PredicateMention(pack, 9, 15)
+        for arg_type, begin, end in (("ARG0", 0, 8), ("ARG1", 16, 20)):
+            link = PredicateLink(
+                pack, predicate, PredicateArgument(pack, begin, end)
+            )
+            link.arg_type = arg_type
+        pack.add_all_remaining_entries()
+
+        self.assertEqual(
+            query_preprocess(pack)[1:],
+            ("covid-19", "what", "causes", "cause", False),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for SearchService.
+"""
+import asyncio
+import json
+import threading
+import unittest
+
+from composable_source.utils.search_service import SearchService
+
+
+async def request(port, method, target, body=None, content_length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    if content_length is None:
+        content_length = len(payload)
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {content_length}\r\n\r\n".encode("ascii") + payload
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content.decode("utf-8"))
+
+
+class SearchServiceTest(unittest.TestCase):
+    r"""
+    Unittest for SearchService.
+    """
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.release = threading.Event()
+        self.release.set()
+        self.handled = []
+        self.batches = []
+
+    def tearDown(self):
+        self.release.set()
+        self.loop.close()
+
+    def handler(self, queries):
+        self.release.wait()
+        if "fail" in queries:
+            raise RuntimeError("failed")
+        self.handled.extend(queries)
+        self.batches.append(len(queries))
+        return [
+            (
+                {"query": query, "error": "Cannot analyze the query."}
+                if query.startswith("bad")
+                else {"query": query, "results": []}
+            )
+            for query in queries
+        ]
+
+    def run_service(self, scenario, **kwargs):
+        service = SearchService(self.handler, port=0, **kwargs)
+
+        async def run():
+            await service.start()
+            try:
+                return await scenario(service.port)
+            finally:
+                self.release.set()
+                await service.stop()
+
+        return self.loop.run_until_complete(run())
+
+    def test_search(self):
+        async def scenario(port):
+            return await asyncio.gather(
+                request(port, "POST", "/search", {"query": " covid "}),
+                request(port, "GET", "/search?query=masks"),
+                request(port, "GET", "/health"),
+                request(port, "POST", "/search", {"query": ""}),
+                request(port, "POST", "/search", ["covid"]),
+                request(port, "GET", "/unknown"),
+                request(port, "POST", "/search", {"query": "fail"}),
+            )
+
+        responses = self.run_service(scenario)
+        self.assertEqual(responses[0], (200, {"query": "covid", "results": []}))
+        self.assertEqual(responses[1][1]["query"], "masks")
+        self.assertEqual(responses[2][0], 200)
+        self.assertEqual(responses[2][1]["status"], "ok")
+        self.assertEqual(
+            [status for status, _ in responses[3:]], [400, 400, 404, 500]
+        )
+
+    def test_malformed_content_length(self):
+        async def scenario(port):
+            return await asyncio.gather(
+                *(
+                    request(port, "POST", "/search", {"query": "covid"}, length)
+                    for length in ("-1", "abc")
+                )
+            )
+
+        responses = self.run_service(scenario)
+        self.assertEqual(
+            responses, [(400, {"error": "Malformed Content-Length"})] * 2
+        )
+        self.assertEqual(self.handled, [])
+
+    def test_admission_control(self):
+        self.release.clear()
+
+        async def scenario(port):
+            # The first query blocks the worker, the second one waits in
+            # the queue and the third one is rejected.
+            first = asyncio.ensure_future(
+                request(port, "GET", "/search?query=a")
+            )
+            await asyncio.sleep(0.2)
+            second = asyncio.ensure_future(
+                request(port, "GET", "/search?query=b")
+            )
+            await asyncio.sleep(0.2)
+            rejected = await request(port, "GET", "/search?query=c")
+            self.release.set()
+            return await first, await second, rejected
+
+        first, second, rejected = self.run_service(scenario, queue_size=1)
+        self.assertEqual(first[0], 200)
+        self.assertEqual(second[0], 200)
+        self.assertEqual(rejected[0], 503)
+        self.assertEqual(self.handled, ["a", "b"])
+
+    def test_batching(self):
+        self.release.clear()
+
+        async def scenario(port):
+            # "b" arrives within the window of "a", "c" to "e" wait in the
+            # queue while the worker is busy and are answered in batches.
+            first = [
+                asyncio.ensure_future(
+                    request(port, "GET", f"/search?query={query}")
+                )
+                for query in "ab"
+            ]
+            await asyncio.sleep(0.2)
+            waiting = [
+                asyncio.ensure_future(
+                    request(port, "GET", f"/search?query={query}")
+                )
+                for query in "cde"
+            ]
+            await asyncio.sleep(0.2)
+            self.release.set()
+            return await asyncio.gather(*first, *waiting)
+
+        responses = self.run_service(scenario, batch_size=2, batch_window=0.1)
+        self.assertEqual(
+            [response["query"] for _, response in responses],
+            ["a", "b", "c", "d", "e"],
+        )
+        self.assertEqual(self.batches, [2, 2, 1])
+
+    def test_query_error(self):
+        self.release.clear()
+
+        async def scenario(port):
+            # The query that cannot be answered gets its error, the other
+            # query of its batch is answered.
+            batch = [
+                asyncio.ensure_future(
+                    request(port, "GET", f"/search?query={query}")
+                )
+                for query in ("bad", "good")
+            ]
+            await asyncio.sleep(0.2)
+            self.release.set()
+            return await asyncio.gather(*batch)
+
+        bad, good = self.run_service(scenario, batch_size=2, batch_window=0.1)
+        self.assertEqual(
+            bad, (400, {"query": "bad", "error": "Cannot analyze the query."})
+        )
+        self.assertEqual(good, (200, {"query": "good", "results": []}))
+        self.assertEqual(self.batches, [2])
+
+    def test_timeout(self):
+        self.release.clear()
+
+        async def scenario(port):
+            return await request(port, "GET", "/search?query=slow")
+
+        status, _ = self.run_service(scenario, request_timeout=0.2)
+        self.assertEqual(status, 504)
+
+
+if __name__ == "__main__":
+    unittest.main()
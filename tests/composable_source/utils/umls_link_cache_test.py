@@ -0,0 +1,111 @@
+# Copyright 2021 The Forte Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for UMLSLinkCache.
+"""
+import os
+import tempfile
+import unittest
+
+from forte.common.configuration import Config
+from forte.common.resources import Resources
+from composable_source.utils.umls_link_cache import (
+    LINK_CACHE_RESOURCE,
+    UMLSLinkCache,
+    acquire_link_cache,
+    normalize_mention,
+    release_link_cache,
+)
+
+SARS = [["C5203676", ["SARS-CoV-2"], [0.98]]]
+FEVER = [["C0015967", ["Fever", "Pyrexia"], [1.0, 0.71]]]
+
+
+class UMLSLinkCacheTest(unittest.TestCase):
+    r"""
+    Unittest for UMLSLinkCache.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "umls.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_normalize(self):
+        self.assertEqual(
+            normalize_mention(" SARS-CoV-2  Infection", 30),
+            "30\tsars-cov-2 infection",
+        )
+
+    def test_memory(self):
+        cache = UMLSLinkCache(memory_size=2)
+        cache.put_many([("SARS-CoV-2", SARS), ("fever", FEVER)], 30)
+        self.assertEqual(
+            cache.get_many(["sars-cov-2", "SARS-CoV-2", "Fever"], 30),
+            {"sars-cov-2": SARS, "SARS-CoV-2": SARS, "Fever": FEVER},
+        )
+        # The number of candidates is part of the key.
+        self.assertEqual(cache.get_many(["fever"], 10), {})
+
+        # "SARS-CoV-2" is the least recently used mention.
+        cache.put_many([("cough", [])], 30)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(
+            cache.get_many(["SARS-CoV-2", "cough"], 30).keys(), {"cough"}
+        )
+        cache.close()
+
+    def test_disk(self):
+        cache = UMLSLinkCache(self.path, memory_size=1)
+        cache.put_many([("SARS-CoV-2", SARS), ("fever", FEVER)], 30)
+        # Mentions dropped from memory are found on disk.
+        self.assertEqual(
+            cache.get_many(["SARS-CoV-2"], 30), {"SARS-CoV-2": SARS}
+        )
+        cache.close()
+
+        cache = UMLSLinkCache(self.path)
+        self.assertEqual(
+            cache.get_many(["Fever", "FEVER", "cough"], 30),
+            {"Fever": FEVER, "FEVER": FEVER},
+        )
+        cache.close()
+
+    def test_shared_cache(self):
+        resources = Resources()
+        configs = Config(
+            {
+                "umls_cache_path": self.path,
+                "umls_cache_size": 10,
+                "umls_memory_size": 10,
+            },
+            None,
+        )
+        owner, owned = acquire_link_cache(resources, configs)
+        other, other_owned = acquire_link_cache(resources, configs)
+        self.assertTrue(owned)
+        self.assertFalse(other_owned)
+        self.assertIs(other, owner)
+
+        # Only the component that opened the cache closes it.
+        release_link_cache(resources, other, other_owned)
+        self.assertTrue(resources.contains(LINK_CACHE_RESOURCE))
+        release_link_cache(resources, owner, owned)
+        self.assertFalse(resources.contains(LINK_CACHE_RESOURCE))
+
+
+if __name__ == "__main__":
+    unittest.main()